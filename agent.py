@@ -1,10 +1,13 @@
 from rlbot.agents.base_agent import BaseAgent, GameTickPacket, SimpleControllerState
 
+from rlutilities import NATIVE
 from rlutilities.simulation import Input
 from rlutilities.linear_algebra import norm
 
 from tools.drawing import DrawingTool
 from tools.quick_chats import QuickChatTool
+from tools.packet_recorder import PacketRecorder
+from tools.render_sink import UdpRenderSink
 from rlbot.matchcomms.common_uses.set_attributes_message import handle_set_attributes_message
 from rlbot.matchcomms.common_uses.reply import reply_to
 
@@ -12,18 +15,32 @@ from maneuvers.kit import Maneuver
 from maneuvers.kickoffs.kickoff import Kickoff
 from maneuvers.kickoffs.diagonal import DiagonalKickoff
 from maneuvers.shadow_defense import ShadowDefense
+from maneuvers.refuel import Refuel
 
 from strategy.soccar_strategy import SoccarStrategy
+from strategy.candidate_engine import CandidateEngine
 from strategy.training import get_maneuver_by_name
 
 from utils.vector_math import distance
 from utils.game_info import GameInfo
+from utils import kernels
+from utils.arena_sdf import arena_sdf
 
+import os
 import time
+from pathlib import Path
 
 class BotimusPrime(BaseAgent):
     
     RENDERING = True
+    RECORDING = False
+    # (host, port) of a tools.render_viewer process to render into instead of the game
+    RENDER_SINK = None
+    # or strategy.rollout.RolloutStrategy, which checks the rules' choices with simulated rollouts
+    STRATEGY = SoccarStrategy
+    # worker processes evaluating shot candidates while the bot's thread goes on, 0 evaluates them all in the
+    # bot's thread. They only pay off with cores of their own, so one core is left for the bot
+    PARALLEL_WORKERS = min(2, (os.cpu_count() or 1) - 1)
 
     PREDICTION_RATE = 120
     PREDITION_DURATION = 8
@@ -37,6 +54,11 @@ class BotimusPrime(BaseAgent):
         self.maneuver: Maneuver = None
 
         self.info.set_mode("soccar")
+        if kernels.HAS_NUMBA:
+            kernels.warmup()
+        # only the fallback's recovery reads the SDF, the native one collides with the arena mesh
+        if not NATIVE:
+            arena_sdf()
 
         self.time = 0
         self.prev_time = 0
@@ -44,9 +66,17 @@ class BotimusPrime(BaseAgent):
         self.reset_time = 0
         self.ticks = 0
 
-        self.draw: DrawingTool = DrawingTool(self.renderer)
+        self.render_sink: UdpRenderSink = None
+        if self.RENDER_SINK is not None:
+            self.render_sink = UdpRenderSink(self.index, self.RENDER_SINK)
+        self.draw: DrawingTool = DrawingTool(self.render_sink or self.renderer)
 
-        self.strategy = SoccarStrategy(self.info, self.draw)
+        self.strategy = self.STRATEGY(self.info, self.draw)
+
+        self.candidate_engine: CandidateEngine = None
+        if self.PARALLEL_WORKERS > 0:
+            self.candidate_engine = CandidateEngine(self.PARALLEL_WORKERS)
+            self.strategy.offense.engine = self.candidate_engine
 
         # variables related to quick chats
         self.chat = QuickChatTool(self)
@@ -58,6 +88,20 @@ class BotimusPrime(BaseAgent):
 
         self.matchcomms_message = ""
 
+        self.recorder: PacketRecorder = None
+        if self.RECORDING:
+            log_name = time.strftime("%Y%m%d-%H%M%S") + f"-{self.index}.bin"
+            log_path = Path(__file__).absolute().parent / "recordings" / log_name
+            self.recorder = PacketRecorder(log_path, self.index, self.team, self.get_field_info)
+
+    def retire(self):
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.render_sink is not None:
+            self.render_sink.close()
+        if self.candidate_engine is not None:
+            self.candidate_engine.close()
+
     def handle_training_matchcomms(self) -> bool:
         try:
             msg = self.matchcomms.incoming_broadcast.get_nowait()
@@ -69,6 +113,14 @@ class BotimusPrime(BaseAgent):
         return False
 
     def get_output(self, packet: GameTickPacket):
+        controls = self.tick(packet)
+        if self.recorder is not None:
+            self.recorder.record(packet, controls)
+        return controls
+
+    def tick(self, packet: GameTickPacket):
+        if self.candidate_engine is not None:
+            self.candidate_engine.start_tick()
         self.time = packet.game_info.seconds_elapsed
         dt = self.time - self.prev_time
         if packet.game_info.is_kickoff_pause and not isinstance(self.maneuver, Kickoff):
@@ -88,12 +140,13 @@ class BotimusPrime(BaseAgent):
             and touch.player_name != packet.game_cars[self.index].name
         ) or (
             touch.player_name == '' and # if latest touch info is missing
-            any([distance(self.info.ball, car) < 300 for car in self.info.opponents + self.info.teammates])
+            len(self.info.cars_near(self.info.ball.position, 300, self.info.other_car_indices)) > 0
         )):
             self.last_touch_time = touch.time_seconds
             if (
                 self.info.my_car.on_ground and not self.controls.jump
                 and (not isinstance(self.maneuver, ShadowDefense) or self.maneuver.travel.driving)
+                and not (isinstance(self.maneuver, (ShadowDefense, Refuel)) and self.strategy.anticipated_touch(self.time))
             ):
                 self.maneuver = None
                 #self.reset_time = self.time
@@ -118,6 +171,8 @@ class BotimusPrime(BaseAgent):
             print(name)
 
             self.last_ball_vel = norm(self.info.ball.velocity)
+        else:
+            self.maneuver = self.strategy.reconsider(self.maneuver)
 
         
         # execute maneuver
@@ -126,17 +181,21 @@ class BotimusPrime(BaseAgent):
             self.controls = self.maneuver.controls
 
             if self.RENDERING:
+                self.draw.focus = self.info.my_car.position
                 self.draw.group("maneuver")
                 self.maneuver.render(self.draw)
 
             if self.maneuver.finished:
                 self.maneuver = None
 
-        for pad in self.info.large_boost_pads:
-            self.draw.string(pad.position, str(pad.is_full_boost))
-
+        # our jumps are known as they are sent, the packets only show them a tick later
+        self.info.history.record_jump_input(self.index, self.time, self.controls.jump)
 
         if self.RENDERING:
+            self.draw.group("pads")
+            for pad in self.info.large_boost_pads:
+                self.draw.string(pad.position, str(pad.is_full_boost))
+
             self.draw.execute()
 
         self.maybe_chat(packet)
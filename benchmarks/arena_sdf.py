@@ -0,0 +1,85 @@
+'''
+Accuracy and speed of utils.arena_sdf.ArenaSDF against the analytic arena model it is sampled from
+(utils.arena.arena_distance_many) and against Field.collide, and of the landing predictions built on it.
+
+Run from the repository root:
+    python -m benchmarks.arena_sdf
+'''
+import random
+import time
+import timeit
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3, norm
+from rlutilities.simulation import Field, sphere
+
+from maneuvers.air.recovery import Recovery
+from utils.arena import arena_distance_many
+from utils.arena_sdf import ArenaSDF, arena_sdf
+from utils.vector_math import to_array, to_vec3
+
+from benchmarks.kernels import random_car, legacy_landing, kernel_landing
+
+
+def sdf_landing(car, num_points=200, dt=0.0333) -> vec3:
+    '''The ballistic path of legacy_landing, checked against the SDF'''
+    i, positions = arena_sdf().falling_contact(to_array(car.position), to_array(car.velocity), 40,
+                                               num_points, dt, skip=11)
+    return car.position if i < 0 else to_vec3(positions[i])
+
+
+def timed(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main(seed=0, num_points=100000):
+    start = time.perf_counter()
+    ArenaSDF.build()
+    print(f"building the grid: {time.perf_counter() - start:.2f} s, {ArenaSDF.grid_shape()} points")
+    start = time.perf_counter()
+    field = ArenaSDF.load()
+    print(f"loading the cached grid: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    rng = np.random.default_rng(seed)
+    points = np.stack([
+        rng.uniform(-4200, 4200, num_points), rng.uniform(-6100, 6100, num_points), rng.uniform(-50, 2100, num_points)
+    ], axis=1)
+    expected, expected_normals = arena_distance_many(points)
+    dist, normals = field.query(points)
+    near = (expected > -50) & (expected < 200)
+    error = np.abs(dist - expected)[near]
+    angle = np.degrees(np.arccos(np.clip(np.einsum('ij,ij->i', normals, expected_normals), -1, 1)))[near]
+    print(f"distance error within 200 uu of a surface: median {np.median(error):.2f}, "
+          f"99% {np.percentile(error, 99):.1f}, max {error.max():.0f} uu")
+    print(f"normal error within 200 uu of a surface: 99% {np.percentile(angle, 99):.1f} degrees")
+    print(f"inside / outside disagreements: {np.mean((dist > 0) != (expected > 0)) * 100:.3f} %")
+
+    car_rng = random.Random(seed)
+    airborne = [random_car(car_rng, airborne=True) for _ in range(50)]
+    simulated = [legacy_landing(car) for car in airborne]
+    for name, landing in (("plane kernel", kernel_landing), ("SDF", sdf_landing)):
+        errors = [norm(landing(car) - expected) for car, expected in zip(airborne, simulated)]
+        print(f"landing position vs simulated fall, {name}: median {np.median(errors):.0f} uu, "
+              f"max {np.max(errors):.0f} uu")
+
+    point = vec3(3900, -2000, 300)
+    batch = points[:200]
+    recovery = Recovery(airborne[0])
+    print(f"{'case':<40}{'time [us]':>12}")
+    cases = {
+        "Field.collide(sphere)": (lambda: Field.collide(sphere(point, 40)), 2000),
+        "ArenaSDF.query, one point": (lambda: field.query(point), 2000),
+        "arena_distance_many, 200 points": (lambda: arena_distance_many(batch), 200),
+        "ArenaSDF.query, 200 points": (lambda: field.query(batch), 200),
+        "Recovery landing, simulated": (lambda: legacy_landing(airborne[0], 200, 0.01633), 10),
+        "Recovery landing, SDF": (lambda: recovery.find_landing_orientation(200), 200),
+    }
+    for name, (function, number) in cases.items():
+        print(f"{name:<40}{timed(function, number):>12.1f}")
+
+    assert arena_sdf() is arena_sdf()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+'''
+Accuracy and throughput of utils.ball_batch.BallBatch against GameInfo.predict_ball, and against the
+native RLUtilities ball when it can be loaded. With the pure-Python fallback loaded, predict_ball runs the
+same bounce model, so there the comparison only checks the vectorization; tests/test_ball_batch.py checks
+BallBatch against analytic trajectories.
+
+Run from the repository root:
+    python -m benchmarks.ball_batch
+'''
+import importlib
+import random
+import time
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Ball
+
+from utils.ball_batch import BallBatch
+from utils.game_info import GameInfo
+
+
+def random_ball(rng: random.Random) -> Ball:
+    ball = Ball()
+    ball.position = vec3(rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), rng.uniform(100, 1800))
+    ball.velocity = vec3(rng.uniform(-2500, 2500), rng.uniform(-2500, 2500), rng.uniform(-1500, 1500))
+    ball.angular_velocity = vec3(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5))
+    return ball
+
+
+def accuracy(num_balls=200, duration=4.0, rate=120, seed=0):
+    rng = random.Random(seed)
+    num_steps = int(duration * rate)
+    checkpoints = [int(t * rate) - 1 for t in (0.5, 1, 2, 4) if t <= duration]
+
+    balls = [random_ball(rng) for _ in range(num_balls)]
+    info = GameInfo(0, 0)
+    reference = np.zeros((num_steps, num_balls, 3))
+    scored_on = 0
+    for i, ball in enumerate(balls):
+        info.ball = ball
+        info.predict_ball(num_steps, 1 / rate)
+        reference[:, i] = [list(prediction.position) for prediction in info.ball_predictions]
+        scored_on += info.about_to_be_scored_on
+
+    batch = BallBatch.from_balls(balls)
+    _, positions, _ = batch.simulate(num_steps, 1 / rate)
+
+    references = {'predict_ball': reference}
+    try:
+        native = importlib.import_module('rlutilities.rlutilities')
+    except ImportError:
+        print("native rlutilities unavailable, comparing against predict_ball only")
+    else:
+        native_balls = []
+        for ball in balls:
+            native_ball = native.simulation.Ball()
+            native_ball.position = native.linear_algebra.vec3(*ball.position)
+            native_ball.velocity = native.linear_algebra.vec3(*ball.velocity)
+            native_ball.angular_velocity = native.linear_algebra.vec3(*ball.angular_velocity)
+            native_balls.append(native_ball)
+        native_reference = np.zeros((num_steps, num_balls, 3))
+        for step in range(num_steps):
+            for i, native_ball in enumerate(native_balls):
+                native_ball.step(1 / rate)
+                native_reference[step, i] = list(native_ball.position)
+        references['native Ball.step'] = native_reference
+
+    for name, reference in references.items():
+        errors = np.linalg.norm(positions - reference, axis=2)
+        print(f"position error vs {name} over {num_balls} balls:")
+        for step in checkpoints:
+            print(f"  t={(step + 1) / rate:4.1f}s  median {np.median(errors[step]):8.2f}  "
+                  f"p90 {np.percentile(errors[step], 90):8.2f}  max {errors[step].max():8.2f}")
+    print(f"blue goal detected: predict_ball {scored_on}, batch {int(np.sum(batch.goal == -1))}")
+
+
+def throughput(num_balls=5000, num_steps=240):
+    rng = random.Random(1)
+    batch = BallBatch.from_balls([random_ball(rng) for _ in range(num_balls)])
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        batch.step(1 / 120)
+    elapsed = time.perf_counter() - start
+    print(f"{num_balls} balls x {num_steps} steps: {elapsed * 1000:.1f} ms "
+          f"({num_balls * num_steps / elapsed / 1e6:.2f} M ball-steps/s)")
+
+
+if __name__ == '__main__':
+    accuracy()
+    throughput()
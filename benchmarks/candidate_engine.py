@@ -0,0 +1,65 @@
+'''
+Offense.direct_shot and Offense.high_shot with a CandidateEngine against evaluating every candidate in the bot's
+thread, on random car / ball configurations: the decisions have to stay the same with any budget, and how long
+they take. The engine only pays off with a core per worker on top of the bot's.
+
+Run from the repository root:
+    python -m benchmarks.candidate_engine [workers]
+'''
+import os
+import random
+import sys
+import time
+
+from rlutilities.linear_algebra import vec3
+
+from benchmarks.offense import same_strike
+from strategy.candidate_engine import CandidateEngine
+from strategy.offense import Offense
+from tools.shot_database import PREDICTION_TIME, DT
+from tools.simulation import random_configuration, predicted_info
+
+TARGET = vec3(0, 5120, 320)
+
+
+def main(workers=2, num_configurations=100, seed=777):
+    print(f"{workers} workers, {os.cpu_count()} CPUs")
+    engine = CandidateEngine(workers)
+    rng = random.Random(seed)
+    budgets = {'in thread': None, 'engine, default budget': engine.BUDGET, 'engine, no budget': 0.0}
+    shots = ('direct_shot', 'high_shot')
+    elapsed = {(name, shot): 0.0 for name in budgets for shot in shots}
+    differences = dict.fromkeys(elapsed, 0)
+    try:
+        for _ in range(num_configurations):
+            car, ball = random_configuration(rng)
+            if rng.random() < 0.3:
+                ball.position = vec3(rng.choice([-1, 1]) * 3900, ball.position[1], rng.uniform(800, 1800))
+            info = predicted_info(ball, int(PREDICTION_TIME / DT), DT)
+
+            for shot in shots:
+                # the first decision on a prediction also converts it to arrays, don't charge that to any case
+                reference = getattr(Offense(info), shot)(car, TARGET)
+                for name, budget in budgets.items():
+                    offense = Offense(info)
+                    if budget is not None:
+                        engine.BUDGET = budget
+                        offense.engine = engine
+                    start = time.perf_counter()
+                    if budget is not None:
+                        engine.start_tick()
+                    strike = getattr(offense, shot)(car, TARGET)
+                    elapsed[name, shot] += time.perf_counter() - start
+                    differences[name, shot] += not same_strike(reference, strike)
+    finally:
+        engine.close()
+
+    print(f"{'case':<28}" + "".join(f"{shot + ' [ms]':>18}{'differ':>8}" for shot in shots))
+    for name in budgets:
+        print(f"{name:<28}" + "".join(
+            f"{elapsed[name, shot] / num_configurations * 1e3:>18.2f}{differences[name, shot]:>8}" for shot in shots
+        ))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
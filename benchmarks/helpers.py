@@ -0,0 +1,122 @@
+'''
+Micro-benchmarks of the scalar helpers in utils.vector_math and utils.misc, which run
+thousands of times per decision. Every case is timed with the argument types it sees in the bot:
+cars and balls, plain vec3s and rlbot packet structs.
+
+Also times the batched *_many variants against the scalar helpers on the same points,
+tests/test_batched_helpers.py checks that they agree.
+
+Run from the repository root:
+    python -m benchmarks.helpers
+'''
+import random
+import timeit
+
+from rlbot.utils.structures.game_data_struct import Vector3
+
+from rlutilities.linear_algebra import vec3, look_at
+from rlutilities.simulation import Car, Ball
+
+from utils.vector_math import loc, distance, ground_distance, direction, ground_direction, local, \
+    to_array, distance_many, ground_distance_many, direction_many, ground_direction_many, local_many, \
+    nearest_index
+from utils.misc import align, estimate_time, estimate_max_car_speed, nearest_point, align_many, estimate_time_many
+
+
+def legacy_loc(obj) -> vec3:
+    '''utils.vector_math.loc before the per-type dispatch, for comparison'''
+    if hasattr(obj, "position"):
+        return obj.position
+    elif hasattr(obj, "x"):
+        return vec3(obj.x, obj.y, obj.z)
+    elif hasattr(obj, "X"):
+        return vec3(obj.X, obj.Y, obj.Z)
+    return obj
+
+
+def cases():
+    car = Car()
+    car.position = vec3(1200, -300, 17)
+    car.velocity = vec3(800, 1200, 0)
+    car.orientation = look_at(vec3(1, 1, 0), vec3(0, 0, 1))
+    car.boost = 40
+
+    ball = Ball()
+    ball.position = vec3(-400, 2500, 93)
+    ball.velocity = vec3(500, -300, 200)
+
+    point = vec3(0, 5120, 320)
+    struct = Vector3(-400, 2500, 93)
+    speed = estimate_max_car_speed(car)
+
+    return {
+        "loc(car)": (lambda: loc(car), lambda: legacy_loc(car)),
+        "loc(ball)": (lambda: loc(ball), lambda: legacy_loc(ball)),
+        "loc(vec3)": (lambda: loc(point), lambda: legacy_loc(point)),
+        "loc(Vector3 struct)": (lambda: loc(struct), lambda: legacy_loc(struct)),
+        "distance(car, ball)": (lambda: distance(car, ball), None),
+        "distance(vec3, vec3)": (lambda: distance(car.position, point), None),
+        "ground_distance(car, vec3)": (lambda: ground_distance(car, point), None),
+        "ground_direction(car, ball)": (lambda: ground_direction(car, ball), None),
+        "align(vec3, ball, vec3)": (lambda: align(car.position, ball, point), None),
+        "estimate_time(car, vec3)": (lambda: estimate_time(car, point, speed), None),
+        "local(car, vec3)": (lambda: local(car, point), None),
+    }
+
+
+def random_point(rng: random.Random) -> vec3:
+    return vec3(rng.uniform(-4000, 4000), rng.uniform(-5000, 5000), rng.uniform(17, 1500))
+
+
+def time_batched(num_points=200, seed=0):
+    '''Time every batched helper and its scalar version on the same points.'''
+    rng = random.Random(seed)
+    car = Car()
+    car.position = random_point(rng)
+    car.velocity = vec3(rng.uniform(-1500, 1500), rng.uniform(-1500, 1500), 0)
+    car.orientation = look_at(vec3(rng.uniform(-1, 1), rng.uniform(-1, 1), 0), vec3(0, 0, 1))
+    car.boost = 30
+    ball = Ball()
+    ball.position = random_point(rng)
+    goal = vec3(0, 5120, 320)
+    points = [random_point(rng) for _ in range(num_points)]
+    array = to_array(points)
+    speed = estimate_max_car_speed(car)
+
+    comparisons = {
+        "distance": (lambda: [distance(car, p) for p in points], lambda: distance_many(car, array)),
+        "ground_distance": (lambda: [ground_distance(car, p) for p in points], lambda: ground_distance_many(car, array)),
+        "direction": (lambda: [list(direction(car, p)) for p in points], lambda: direction_many(car, array)),
+        "ground_direction": (lambda: [list(ground_direction(p, ball)) for p in points],
+                             lambda: ground_direction_many(array, ball)),
+        "local": (lambda: [list(local(car, p)) for p in points], lambda: local_many(car, array)),
+        "align": (lambda: [align(p, ball, goal) for p in points], lambda: align_many(array, ball, goal)),
+        "estimate_time": (lambda: [estimate_time(car, p, speed) for p in points],
+                          lambda: estimate_time_many(car, array, speed)),
+        "estimate_time backwards": (lambda: [estimate_time(car, p, 1000, -1) for p in points],
+                                    lambda: estimate_time_many(car, array, 1000, -1)),
+        "nearest": (lambda: points.index(nearest_point(ball.position, points)),
+                    lambda: nearest_index(ball.position, array)),
+    }
+
+    print(f"{'batched helper, ' + str(num_points) + ' points':<30}{'scalar [us]':>12}{'batched [us]':>14}")
+    for name, (scalar, batched) in comparisons.items():
+        scalar_time = min(timeit.repeat(scalar, number=20, repeat=3)) / 20
+        batched_time = min(timeit.repeat(batched, number=20, repeat=3)) / 20
+        print(f"{name:<30}{scalar_time * 1e6:>12.1f}{batched_time * 1e6:>14.1f}")
+
+
+def main(number=20000):
+    print(f"{'case':<30}{'time [us]':>12}{'legacy [us]':>14}")
+    for case, (function, legacy) in cases().items():
+        elapsed = min(timeit.repeat(function, number=number, repeat=3)) / number
+        row = f"{case:<30}{elapsed * 1e6:>12.3f}"
+        if legacy is not None:
+            row += f"{min(timeit.repeat(legacy, number=number, repeat=3)) / number * 1e6:>14.3f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
+    print()
+    time_batched()
@@ -0,0 +1,114 @@
+'''
+Speed of the utils.kernels kernels against the utils.misc / rlutilities code they replace,
+and a check that they give the same answers. Runs the compiled kernels when Numba is installed
+and the NumPy / Python fallbacks otherwise.
+
+Run from the repository root:
+    python -m benchmarks.kernels
+'''
+import random
+import timeit
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3, look_at, norm
+from rlutilities.simulation import Car, Ball, Input, Field, sphere
+
+from utils import kernels
+from utils.game_info import GameInfo
+from utils.intercept import Intercept
+from utils.misc import estimate_time, estimate_max_car_speed, turn_radius
+from utils.vector_math import to_array
+
+
+def random_car(rng: random.Random, airborne=False) -> Car:
+    car = Car()
+    car.position = vec3(rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), rng.uniform(300, 1800) if airborne else 17)
+    car.velocity = vec3(rng.uniform(-1500, 1500), rng.uniform(-1500, 1500), rng.uniform(-500, 800) if airborne else 0)
+    car.orientation = look_at(vec3(rng.uniform(-1, 1), rng.uniform(-1, 1), 0), vec3(0, 0, 1))
+    car.boost = rng.uniform(0, 100)
+    car.on_ground = not airborne
+    return car
+
+
+def legacy_intercept(car: Car, ball_predictions, predicate=None, backwards=False) -> Ball:
+    '''utils.intercept.Intercept before the kernels, for comparison'''
+    speed = 1000 if backwards else estimate_max_car_speed(car)
+    for ball in ball_predictions:
+        if estimate_time(car, ball.position, speed, -1 if backwards else 1) < ball.time - car.time \
+        and (predicate is None or predicate(car, ball)):
+            return ball
+    return None
+
+
+def legacy_landing(car: Car, num_points=200, dt=0.0333) -> vec3:
+    '''FastRecovery.find_landing_pos before the kernels'''
+    dummy = Car(car)
+    for i in range(0, num_points):
+        dummy.step(Input(), dt)
+        n = Field.collide(sphere(dummy.position, 40)).direction
+        if norm(n) > 0.0 and i > 10:
+            return dummy.position
+    return car.position
+
+
+def kernel_landing(car: Car) -> vec3:
+    t, _, _, _ = kernels.landing(to_array(car.position), to_array(car.velocity), 40.0, 6.66)
+    return car.position if t < 0 else car.position + car.velocity * t + vec3(0, 0, 0.5 * kernels.GRAVITY * t * t)
+
+
+def timed(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main(seed=0):
+    rng = random.Random(seed)
+    kernels.warmup()
+    print(f"numba: {'yes' if kernels.HAS_NUMBA else 'no, running the fallbacks'}")
+
+    info = GameInfo(0, 0)
+    info.ball = Ball()
+    info.ball.position = vec3(1000, 2000, 800)
+    info.ball.velocity = vec3(-800, -1200, 300)
+    info.predict_ball(960, 1 / 120)
+    balls = info.ball_predictions
+    cars = [random_car(rng) for _ in range(50)]
+
+    predicate = lambda car, ball: ball.position[2] < 300
+    mismatches = 0
+    for car in cars:
+        for backwards, check in ((False, None), (True, None), (False, predicate)):
+            expected = legacy_intercept(car, balls, check, backwards)
+            intercept = Intercept(car, balls, check, backwards)
+            mismatches += (intercept.ball if intercept.is_viable else None) is not expected
+    print(f"intercepts differing from the scalar search: {mismatches} / {len(cars) * 3}")
+
+    car = cars[0]
+    speed = estimate_max_car_speed(car)
+    targets = to_array(balls[::4])
+    args = (to_array(car.position), to_array(car.velocity), to_array(car.forward()), float(car.boost), float(speed), 1)
+    assert np.allclose(kernels.estimate_times(*args, targets), [estimate_time(car, vec3(*t), speed) for t in targets])
+    assert abs(kernels.turn_radius(1234.0) - turn_radius(1234.0)) < 1e-9
+
+    airborne = [random_car(rng, airborne=True) for _ in range(50)]
+    errors = [norm(kernel_landing(c) - legacy_landing(c)) for c in airborne]
+    print(f"landing position vs simulated fall: median {np.median(errors):.0f} uu, max {np.max(errors):.0f} uu "
+          f"(the simulated fall checks every 1/30 s)")
+
+    print(f"{'case':<36}{'before [us]':>12}{'kernel [us]':>13}")
+    cases = {
+        "estimate_time, 240 targets": (
+            lambda: [estimate_time(car, vec3(*t), speed) for t in targets],
+            lambda: kernels.estimate_times(*args, targets), 20),
+        "turn_radius": (lambda: turn_radius(1234.0), lambda: kernels.turn_radius(1234.0), 20000),
+        "intercept search": (lambda: legacy_intercept(car, balls), lambda: Intercept(car, balls), 20),
+        "intercept search with predicate": (
+            lambda: legacy_intercept(car, balls, predicate), lambda: Intercept(car, balls, predicate), 20),
+        "landing": (lambda: legacy_landing(airborne[0]), lambda: kernel_landing(airborne[0]), 20),
+    }
+    for name, (before, after, number) in cases.items():
+        print(f"{name:<36}{timed(before, number):>12.1f}{timed(after, number):>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
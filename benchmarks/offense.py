@@ -0,0 +1,127 @@
+'''
+Offense decisions made with shot candidates against building every strike up front like before,
+on random car / ball configurations: they have to pick the same strike, and how long they take.
+
+Run from the repository root:
+    python -m benchmarks.offense
+'''
+import random
+import time
+
+from rlutilities.linear_algebra import vec3, norm
+from rlutilities.simulation import Ball
+
+from maneuvers.strikes.aerial_shot import AerialShot
+from maneuvers.strikes.close_shot import CloseShot
+from maneuvers.strikes.dodge_shot import DodgeShot
+from maneuvers.strikes.ground_shot import GroundShot
+from maneuvers.strikes.wall_dodge_shot import WallDodgeShot
+from maneuvers.strikes.wall_shot import WallShot
+from strategy.offense import Offense
+from tools.shot_database import PREDICTION_TIME, DT
+from tools.simulation import random_configuration
+from utils.game_info import GameInfo
+from utils.vector_math import distance
+
+
+class EagerOffense(Offense):
+    '''Offense before shot candidates, every compared strike is built.'''
+
+    def wall_shot(self, car, target):
+        ground_shot = WallShot(car, self.info, target)
+        dodge_shot = WallDodgeShot(car, self.info, target)
+        if dodge_shot.intercept.time < ground_shot.intercept.time - 0.1:
+            return dodge_shot
+        return ground_shot
+
+    def direct_shot(self, car, target):
+        dodge_shot = DodgeShot(car, self.info, target)
+        ground_shot = None
+        if (
+            distance(dodge_shot.intercept.ground_pos, target) >= 4000
+            and self.worth_building(
+                self.expected_outcomes(car, target), 'GroundShot', dodge_shot.intercept.time - car.time
+            )
+        ):
+            ground_shot = GroundShot(car, self.info, target)
+        if (
+            ground_shot is None
+            or dodge_shot.intercept.time < ground_shot.intercept.time - 0.1
+            or distance(dodge_shot.intercept.ground_pos, target) < 4000
+            or distance(ground_shot.intercept.ball.velocity, car.velocity) < 500
+        ):
+            if (
+                distance(dodge_shot.intercept.ground_pos, target) < 4000
+                and abs(dodge_shot.intercept.ground_pos[0]) < 3000
+            ):
+                return CloseShot(car, self.info, target)
+            return dodge_shot
+        return ground_shot
+
+    def high_shot(self, car, target):
+        direct_shot = self.direct_shot(car, target)
+        expected = self.expected_outcomes(car, target)
+        direct_time = direct_shot.intercept.time - car.time
+        if self.worth_building(expected, 'WallShot', direct_time):
+            wall_shot = self.wall_shot(car, target)
+            if wall_shot.intercept.is_viable and wall_shot.intercept.time < direct_shot.intercept.time:
+                return wall_shot
+        if not self.worth_building(expected, 'AerialShot', direct_time):
+            return direct_shot
+        aerial = AerialShot(car, self.info, target)
+        if (
+            aerial.intercept.is_viable
+            and car.boost > aerial.intercept.ball.position[2] / 50 + 5
+            and aerial.intercept.time < direct_shot.intercept.time
+            and not self.info.about_to_score
+            and abs(aerial.intercept.ball.position[1] - target[1]) > 2000
+        ):
+            return aerial
+        return direct_shot
+
+
+def same_strike(a, b) -> bool:
+    return (
+        type(a) is type(b)
+        and a.intercept.time == b.intercept.time
+        and a.intercept.is_viable == b.intercept.is_viable
+        and norm(a.arrive.target - b.arrive.target) < 1e-3
+        and a.arrive.drive.backwards == b.arrive.drive.backwards
+        and a.finished == b.finished
+    )
+
+
+def main(num_configurations=200, seed=4321):
+    rng = random.Random(seed)
+    elapsed = {}
+    differences = {}
+    for _ in range(num_configurations):
+        car, ball = random_configuration(rng)
+        # the wall shots need balls up the side walls now and then
+        if rng.random() < 0.3:
+            ball.position = vec3(rng.choice([-1, 1]) * 3900, ball.position[1], rng.uniform(800, 1800))
+        info = GameInfo(0, 0)
+        info.ball = Ball(ball)
+        info.predict_ball(int(PREDICTION_TIME / DT), DT)
+
+        for method in ('direct_shot', 'wall_shot', 'high_shot'):
+            strikes = []
+            for offense_type in (EagerOffense, Offense):
+                offense = offense_type(info)
+                # CloseShot moves its target around, every decision gets its own
+                target = vec3(0, 5120, 320)
+                start = time.perf_counter()
+                strikes.append(getattr(offense, method)(car, target))
+                name = f"{method}, {'candidates' if offense_type is Offense else 'eager'}"
+                elapsed[name] = elapsed.get(name, 0.0) + time.perf_counter() - start
+            differences[method] = differences.get(method, 0) + (not same_strike(*strikes))
+
+    for method, count in differences.items():
+        print(f"{method}: {count} / {num_configurations} decisions differ")
+    print(f"{'case':<32}{'time [ms]':>12}")
+    for name, total in elapsed.items():
+        print(f"{name:<32}{total / num_configurations * 1e3:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
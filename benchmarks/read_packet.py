@@ -0,0 +1,94 @@
+'''
+GameInfo.read_packet per tick against the one from before the roster cache, which rebuilt the teammate,
+opponent and large pad lists every tick, on the synthetic 1v1 scenario of tools/replay.py. The current one
+also tracks the boost pads and the car state history every tick. Separately, the agent's check for cars
+near the ball when the latest touch is missing, the old one with a list of distances.
+
+With the pure-Python backend `cars` is a plain list; the native one converts it into new Car copies on
+every access, which the old read_packet did 2 + 4 * num_cars times per tick, and the current one once.
+The shared read_game_information varies a lot from tick to tick, so it's timed on its own too and the
+work read_packet does on top of it is shown separately.
+
+Run from the repository root:
+    python -m benchmarks.read_packet
+'''
+import time
+from typing import List
+
+import numpy as np
+
+from rlutilities.simulation import Car
+
+from tools.replay import synthetic_packets
+from utils.game_info import GameInfo
+from utils.vector_math import distance
+
+
+class ListGameInfo(GameInfo):
+    '''read_packet before the roster cache, without the car state arrays and history.'''
+
+    def read_packet(self, packet, field_info):
+        self.read_game_information(packet, field_info)
+        self.teammates = self.get_teammates()
+        self.opponents = self.get_opponents()
+        self.large_boost_pads = [self.pads[i] for i in (3, 4, 15, 18, 29, 30)] if len(self.pads) > 30 else []
+
+    def get_teammates(self) -> List[Car]:
+        cars: List[Car] = []
+        for i in range(self.num_cars):
+            if self.cars[i].team == self.team and self.cars[i].id != self.id:
+                cars.append(self.cars[i])
+        return cars
+
+    def get_opponents(self) -> List[Car]:
+        cars: List[Car] = []
+        for i in range(self.num_cars):
+            if self.cars[i].team != self.team:
+                cars.append(self.cars[i])
+        return cars
+
+    def cars_near_ball(self) -> bool:
+        return any([distance(self.ball, car) < 300 for car in self.opponents + self.teammates])
+
+
+class CachedGameInfo(GameInfo):
+
+    def cars_near_ball(self) -> bool:
+        return len(self.cars_near(self.ball.position, 300, self.other_car_indices)) > 0
+
+
+def median_us(times) -> float:
+    # the first ticks build the roster and the pad index
+    return float(np.median(times[10:])) * 1e6
+
+
+def main(num_ticks=3000, seed=0):
+    infos, streams = {}, {}
+    for name, info_type in (('lists', ListGameInfo), ('cached', CachedGameInfo)):
+        index, team, _, field_info, packets = synthetic_packets(num_ticks, seed)
+        infos[name] = info_type(index, team)
+        streams[name] = packets
+    timings = {name: {'game information': [], 'read_packet': [], 'cars near ball': []} for name in infos}
+
+    # interleaved tick by tick, so both see the same load on the machine
+    for packets in zip(*streams.values()):
+        for (name, info), packet in zip(infos.items(), packets):
+            start = time.perf_counter()
+            info.read_game_information(packet, field_info)
+            timings[name]['game information'].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            info.read_packet(packet, field_info)
+            timings[name]['read_packet'].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            info.cars_near_ball()
+            timings[name]['cars near ball'].append(time.perf_counter() - start)
+
+    print(f"{'GameInfo':<10}{'read_packet [us]':>18}{'on top of game info [us]':>26}{'cars near ball [us]':>22}")
+    for name, times in timings.items():
+        total = median_us(times['read_packet'])
+        own = median_us(np.array(times['read_packet']) - np.array(times['game information']))
+        print(f"{name:<10}{total:>18.1f}{own:>26.1f}{median_us(times['cars near ball']):>22.1f}")
+
+
+if __name__ == '__main__':
+    main()
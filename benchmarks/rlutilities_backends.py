@@ -0,0 +1,86 @@
+'''
+Compare the pure-Python rlutilities fallback against the native module (when it can be loaded).
+
+Run from the repository root:
+    python -m benchmarks.rlutilities_backends
+'''
+import importlib
+import timeit
+
+
+def load_backends():
+    backends = {}
+    for name, module in (("native", "rlutilities.rlutilities"), ("fallback", "rlutilities.fallback")):
+        try:
+            backends[name] = importlib.import_module(module)
+            if name == "fallback":
+                # the fallback package doesn't import its submodules itself
+                for submodule in ("linear_algebra", "simulation", "mechanics"):
+                    importlib.import_module(f"{module}.{submodule}")
+        except ImportError as error:
+            print(f"{name} backend unavailable: {error}")
+    return backends
+
+
+def cases(backend):
+    la, sim = backend.linear_algebra, backend.simulation
+    vec3, mat3, dot, norm, normalize, look_at = la.vec3, la.mat3, la.dot, la.norm, la.normalize, la.look_at
+
+    a, b = vec3(1200, -300, 17), vec3(-400, 2500, 93)
+    orientation = look_at(vec3(1, 1, 0), vec3(0, 0, 1))
+
+    ball = sim.Ball()
+    ball.position = vec3(0, 0, 1000)
+    ball.velocity = vec3(1500, 2000, 500)
+
+    def predict():
+        prediction = sim.Ball(ball)
+        for _ in range(960):
+            prediction.step(1 / 120)
+
+    def collide():
+        sim.Field.collide(sim.sphere(b, 200))
+
+    car = sim.Car()
+    controls = sim.Input()
+    controls.throttle = 1
+    controls.steer = 0.5
+
+    def drive():
+        test_car = sim.Car(car)
+        for _ in range(120):
+            test_car.step(controls, 1 / 120)
+
+    return {
+        "vec3 arithmetic": (lambda: (a - b) * 0.5 + a, 100000),
+        "norm(normalize(v))": (lambda: norm(normalize(a - b)), 100000),
+        "dot(vec3, mat3)": (lambda: dot(a - b, orientation), 100000),
+        "look_at": (lambda: look_at(a, vec3(0, 0, 1)), 20000),
+        "Field.collide(sphere)": (collide, 20000),
+        "ball prediction 8s@120Hz": (predict, 5),
+        "car driving 1s@120Hz": (drive, 20),
+    }
+
+
+def main():
+    backends = load_backends()
+    results = {name: {} for name in backends}
+
+    for name, backend in backends.items():
+        for case, (function, number) in cases(backend).items():
+            results[name][case] = min(timeit.repeat(function, number=number, repeat=3)) / number
+
+    names = list(backends)
+    header = f"{'case':<28}" + "".join(f"{name + ' [us]':>18}" for name in names)
+    if len(names) == 2:
+        header += f"{'slowdown':>12}"
+    print(header)
+    for case in results[names[0]]:
+        row = f"{case:<28}" + "".join(f"{results[name][case] * 1e6:>18.2f}" for name in names)
+        if len(names) == 2:
+            row += f"{results['fallback'][case] / results['native'][case]:>11.1f}x"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''
+RolloutStrategy in the synthetic replay scenario of tools/replay.py, with a few time budgets per tick:
+how long its planning takes on top of the rules in a tick and in the ticks that decide, how many rollouts a decision gets over the ticks
+it is carried over, and how often it overrides the rules.
+
+Run from the repository root:
+    python -m benchmarks.rollout
+'''
+import time
+
+import numpy as np
+
+from strategy.rollout import RolloutStrategy
+from strategy.soccar_strategy import SoccarStrategy
+from tools.replay import run, synthetic_packets
+
+
+def main(num_ticks=1200, seed=3, budgets=(0.002, 0.004, 0.03)):
+    print(f"{'budget [ms]':>12}{'decisions':>11}{'tick [ms]':>11}{'p99 [ms]':>10}{'deciding [ms]':>15}"
+          f"{'max [ms]':>10}{'rollouts':>10}{'overridden':>12}")
+    for budget in budgets:
+        ticks, deciding, decisions, rules = [], [], [], []
+
+        class TimedRules(SoccarStrategy):
+            def choose_maneuver(self):
+                start = time.perf_counter()
+                maneuver = super().choose_maneuver()
+                rules.append(time.perf_counter() - start)
+                return maneuver
+
+        # RolloutStrategy's rules are TimedRules', so the planning time is the rest of the tick
+        class Strategy(RolloutStrategy, TimedRules):
+            BUDGET = budget
+
+            def choose_maneuver(self):
+                start = time.perf_counter()
+                maneuver = super().choose_maneuver()
+                ticks.append(time.perf_counter() - start - rules[-1])
+                deciding.append(ticks[-1])
+                if self.candidates:
+                    decisions.append(self.candidates)
+                return maneuver
+
+            def reconsider(self, maneuver):
+                start = time.perf_counter()
+                maneuver = super().reconsider(maneuver)
+                ticks.append(time.perf_counter() - start)
+                return maneuver
+
+        run(*synthetic_packets(num_ticks, seed), rendering=False, strategy=Strategy)
+        # the decision's final choice, after its planning was carried over
+        rollouts = [sum(c.count for c in candidates) for candidates in decisions]
+        overridden = [max(candidates, key=lambda c: c.mean) is not candidates[0]
+                      for candidates in decisions if any(c.scores for c in candidates)]
+        print(f"{budget * 1e3:>12.0f}{len(decisions):>11}{np.mean(ticks) * 1e3:>11.1f}"
+              f"{np.percentile(ticks, 99) * 1e3:>10.1f}"
+              f"{np.mean(deciding) * 1e3:>15.1f}{np.max(deciding) * 1e3:>10.1f}{np.mean(rollouts):>10.0f}{sum(overridden):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+'''
+How well the offline shot outcome table (utils/shot_outcomes.py, generated by tools/shot_database.py)
+predicts the shots on fresh configurations, and how much it saves in Offense.direct_shot.
+
+Run from the repository root:
+    python -m benchmarks.shot_outcomes
+'''
+import random
+import time
+import timeit
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Ball
+
+from strategy.offense import Offense
+from tools.shot_database import sample, PREDICTION_TIME, DT
+from tools.simulation import random_configuration
+from utils.game_info import GameInfo
+from utils.shot_outcomes import shot_outcomes, SHOT_TYPES, VIABLE, TIME
+
+
+def main(num_configurations=200, seed=12345):
+    table = shot_outcomes()
+    if table is None:
+        print("no shot outcome table, generate one with python -m tools.shot_database")
+        return
+    print(f"table: {len(table)} samples")
+    target = vec3(0, 5120, 320)
+
+    # predictions against the intercepts of fresh samples
+    rng = random.Random(seed)
+    predicted, actual, unknown = [], [], 0
+    for _ in range(num_configurations):
+        state = rng.getstate()
+        car, ball = random_configuration(rng)
+        rng.setstate(state)
+        _, outcomes = sample(rng, target, simulate=False)
+        expected = table.query(car, ball, target)
+        if not expected:
+            unknown += 1
+            continue
+        predicted.append([[expected[name].viable, expected[name].time] for name in SHOT_TYPES])
+        actual.append(outcomes[:, [VIABLE, TIME]])
+    predicted, actual = np.array(predicted), np.array(actual)
+    print(f"configurations without close enough neighbours: {unknown} / {num_configurations}")
+    for i, name in enumerate(SHOT_TYPES):
+        correct = np.mean((predicted[:, i, 0] >= 0.5) == (actual[:, i, 0] > 0.5))
+        both = (predicted[:, i, 0] >= 0.5) & (actual[:, i, 0] > 0.5)
+        error = np.median(np.abs(predicted[both, i, 1] - actual[both, i, 1])) if both.any() else float('nan')
+        print(f"{name:<12} viability right {correct * 100:5.1f} %, median time error {error:.2f} s")
+
+    # decisions and cost of direct_shot with and without the table
+    rng = random.Random(seed + 1)
+    changed = 0
+    elapsed = {'without table': 0.0, 'with table': 0.0}
+    for _ in range(num_configurations):
+        car, ball = random_configuration(rng)
+        info = GameInfo(0, 0)
+        info.ball = Ball(ball)
+        info.predict_ball(int(PREDICTION_TIME / DT), DT)
+        offense = Offense(info)
+        shots = {}
+        for name, outcomes in (('without table', None), ('with table', table)):
+            offense.outcomes = outcomes
+            start = time.perf_counter()
+            shots[name] = offense.direct_shot(car, target)
+            elapsed[name] += time.perf_counter() - start
+        before, after = shots.values()
+        changed += type(before) is not type(after) or before.intercept.time != after.intercept.time
+    print(f"direct_shot decisions changed by the table: {changed} / {num_configurations}")
+    for name, total in elapsed.items():
+        print(f"direct_shot {name}: {total / num_configurations * 1e3:.2f} ms")
+
+    car, ball = random_configuration(random.Random(seed))
+    print(f"table query: {min(timeit.repeat(lambda: table.query(car, ball, target), number=200, repeat=3)) / 200 * 1e6:.0f} us")
+
+
+if __name__ == '__main__':
+    main()
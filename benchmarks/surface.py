@@ -0,0 +1,113 @@
+'''
+The unfolded surface model of utils.surface against the wall path estimate WallShot used before
+(ground distance + height), and the wall intercept scan with both.
+
+Run from the repository root:
+    python -m benchmarks.surface
+'''
+import math
+import random
+import timeit
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3, look_at
+from rlutilities.simulation import Car, Ball
+
+from maneuvers.strikes.wall_shot import WallShot
+from utils.arena import Arena, FILLET_RADIUS
+from utils.game_info import GameInfo
+from utils.intercept import Intercept
+from utils.misc import estimate_max_car_speed
+from utils.surface import surface_distance, estimate_surface_time, \
+    estimate_surface_time_many, surface_waypoint, unfold, unfold_point
+from utils.vector_math import ground_distance, to_array
+
+
+def legacy_predicate(car: Car, ball: Ball) -> bool:
+    '''WallShot.intercept_predicate before the surface model, for comparison'''
+    return ball.position[2] > 800 and abs(ball.position[0]) > Arena.size[0] - 150 \
+        and (ground_distance(car, ball) + ball.position[2] - car.position[2]) / estimate_max_car_speed(car) * 1.2 \
+        < ball.time - car.time
+
+
+def side_wall_path(floor_point: vec3, wall_point: vec3) -> float:
+    '''Length of the shortest path from a floor point to a point on the +x side wall, over the fillet'''
+    r = FILLET_RADIUS
+    along_wall = wall_point[1] - floor_point[1]
+    across = (Arena.size[0] - r - floor_point[0]) + math.pi * r / 2 + (wall_point[2] - r)
+    return math.hypot(across, along_wall)
+
+
+def random_car(rng: random.Random) -> Car:
+    car = Car()
+    car.position = vec3(rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), 17)
+    car.velocity = vec3(rng.uniform(-1200, 1200), rng.uniform(-1200, 1200), 0)
+    car.orientation = look_at(vec3(rng.uniform(-1, 1), rng.uniform(-1, 1), 0), vec3(0, 0, 1))
+    car.boost = rng.uniform(0, 100)
+    car.on_ground = True
+    return car
+
+
+def main(seed=0):
+    rng = random.Random(seed)
+
+    floor = [vec3(rng.uniform(-3500, 3500), rng.uniform(-4000, 4000), 17) for _ in range(200)]
+    wall = [vec3(Arena.size[0], rng.uniform(-3000, 3000), rng.uniform(400, 1800)) for _ in range(200)]
+    exact = np.array([side_wall_path(f, w) for f, w in zip(floor, wall)])
+    unfolded = np.array([surface_distance(f, w) for f, w in zip(floor, wall)])
+    legacy = np.array([ground_distance(f, w) + w[2] - f[2] for f, w in zip(floor, wall)])
+    print(f"floor to side wall path error, unfolded: max {np.abs(unfolded - exact).max():.1f} uu, "
+          f"ground + height: median {np.median(legacy - exact):.0f} uu, max {np.abs(legacy - exact).max():.0f} uu")
+
+    # balls rising along the +x side wall, cars on the floor in that half
+    info = GameInfo(0, 0)
+    info.ball = Ball()
+    cars = [random_car(rng) for _ in range(50)]
+    for car in cars:
+        car.position = vec3(abs(car.position[0]), car.position[1], car.position[2])
+    predicate = lambda car, ball: WallShot.intercept_predicate(None, car, ball)
+    viable_before = viable_after = rejected = 0
+    shifts = []
+    for throw in range(10):
+        info.ball.position = vec3(3960, rng.uniform(-2000, 2000), 500)
+        info.ball.velocity = vec3(20, rng.uniform(-400, 400), rng.uniform(1200, 1600))
+        info.predict_ball(480, 1 / 120)
+        balls = info.ball_predictions
+        for car in cars:
+            before = Intercept(car, balls, legacy_predicate)
+            after = Intercept(car, balls, predicate)
+            viable_before += before.is_viable
+            viable_after += after.is_viable
+            if before.is_viable:
+                speed = estimate_max_car_speed(car)
+                rejected += estimate_surface_time(car, before.ball, speed) >= before.time - car.time
+                if after.is_viable:
+                    shifts.append(after.time - before.time)
+    print(f"wall intercepts over {10 * len(cars)} car / ball pairs: {viable_before} viable before, "
+          f"{viable_after} with the surface model, {rejected} of the old ones unreachable over the surface, "
+          f"intercept time change: median {np.median(shifts):+.3f} s")
+
+    car = cars[0]
+    positions = to_array(balls)
+    speed = estimate_max_car_speed(car)
+    assert np.allclose(unfold(positions), [list(unfold_point(b.position))[:2] for b in balls])
+    assert np.allclose(estimate_surface_time_many(car, positions, speed),
+                       [estimate_surface_time(car, b, speed) for b in balls])
+
+    cases = {
+        "ground + height estimate": (lambda: legacy_predicate(car, balls[100]), 2000),
+        "estimate_surface_time": (lambda: estimate_surface_time(car, balls[100], speed), 2000),
+        f"estimate_surface_time_many, {len(balls)} balls": (
+            lambda: estimate_surface_time_many(car, positions, speed), 100),
+        "surface_waypoint": (lambda: surface_waypoint(car.position, balls[100].position), 2000),
+        "wall intercept, before": (lambda: Intercept(car, balls, legacy_predicate), 20),
+        "wall intercept, surface model": (lambda: Intercept(car, balls, predicate), 20),
+    }
+    print(f"{'case':<40}{'time [us]':>12}")
+    for name, (function, number) in cases.items():
+        print(f"{name:<40}{min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,12 @@
 from maneuvers.kit import *
 
 from maneuvers.air.recovery import Recovery
+from rlutilities import NATIVE
 from rlutilities.simulation import Field
 from rlutilities.mechanics import AerialTurn
 
+from utils.kernels import landing, GRAVITY
+
 class FastRecovery(Maneuver):
     '''Boost down and try to land on all four wheels'''
 
@@ -40,7 +43,16 @@ class FastRecovery(Maneuver):
 
         self.finished = self.car.on_ground
 
-    def find_landing_pos(self, num_points=200, dt=0.0333) -> vec3:
+    def find_landing_pos(self, max_time=6.66) -> vec3:
+        '''Where the falling car first hits the arena, against the native arena mesh like Recovery when it's loaded'''
+        if NATIVE:
+            return self.collide_landing_pos()
+        t, _, _, _ = landing(to_array(self.car.position), to_array(self.car.velocity), 40.0, max_time)
+        if t < 0:
+            return self.car.position
+        return self.car.position + self.car.velocity * t + vec3(0, 0, 0.5 * GRAVITY * t * t)
+
+    def collide_landing_pos(self, num_points=200, dt=0.0333) -> vec3:
         '''Simulate car falling until it hits a plane and return it's final position'''
         dummy = Car(self.car)
         for i in range(0, num_points):
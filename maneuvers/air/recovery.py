@@ -1,8 +1,13 @@
+import numpy as np
+
 from maneuvers.kit import *
 
 from maneuvers.driving.arrive import Arrive
+from rlutilities import NATIVE
 from rlutilities.mechanics import AerialTurn
-from rlutilities.simulation import Field
+
+from utils.arena_sdf import arena_sdf
+from utils.kernels import GRAVITY
 
 
 class Recovery(Maneuver):
@@ -14,7 +19,7 @@ class Recovery(Maneuver):
         super().__init__(car)
 
         self.turn = AerialTurn(car)
-        self.trajectory = []
+        self.trajectory = np.zeros((0, 3))
 
     def step(self, dt):
         self.find_landing_orientation(200)
@@ -23,35 +28,56 @@ class Recovery(Maneuver):
         self.controls.throttle = 1 # in case we're turtling
         self.finished = self.car.on_ground
 
-    def find_landing_orientation(self, num_points):
+    def find_landing_orientation(self, num_points, dt=0.01633):
+        '''Land with the wheels on the first surface the falling car touches'''
+        if NATIVE:
+            u, velocity = self.collide_landing(num_points, dt)
+        else:
+            u, velocity = self.sdf_landing(num_points, dt)
 
-        f = vec3(0, 0, 0)
-        l = vec3(0, 0, 0)
-        u = vec3(0, 0, 0)
+        if u is not None:
+            f = normalize(velocity - dot(velocity, u) * u)
+            l = normalize(cross(u, f))
+            self.turn.target = mat3(f[0], l[0], u[0],
+                                    f[1], l[1], u[1],
+                                    f[2], l[2], u[2])
+        else:
+            self.turn.target = self.car.orientation
 
+    def collide_landing(self, num_points, dt):
+        '''The contact normal and velocity, stepping a copy of the car against the native arena mesh'''
         dummy = Car(self.car)
-        self.trajectory = [vec3(dummy.position)]
-        found = False
+        trajectory = [vec3(dummy.position)]
         for i in range(0, num_points):
-            dummy.step(Input(), 0.01633)
-            self.trajectory.append(vec3(dummy.position))
+            dummy.step(Input(), dt)
+            trajectory.append(vec3(dummy.position))
             u = Field.collide(sphere(dummy.position, 40)).direction
             if norm(u) > 0.0 and i > 40:
-                f = normalize(dummy.velocity - dot(dummy.velocity, u) * u)
-                l = normalize(cross(u, f))
-                found = True
-                break
+                self.trajectory = to_array(trajectory)
+                return u, dummy.velocity
+        self.trajectory = to_array(trajectory)
+        return None, None
 
-        if found:
-            self.turn.target = mat3(f[0], l[0], u[0],
-                                    f[1], l[1], u[1],
-                                    f[2], l[2], u[2])
-        else:
-            self.turn.target = self.car.orientation
+    def sdf_landing(self, num_points, dt):
+        '''
+        The contact normal and velocity, checked against the arena SDF. The fallback's Field.collide is the
+        analytic arena model, too slow to query along the whole path every tick.
+        '''
+        field = arena_sdf()
+        i, positions = field.falling_contact(to_array(self.car.position), to_array(self.car.velocity), 40,
+                                             num_points, dt, skip=41)
+        self.trajectory = positions
+        if i < 0:
+            return None, None
+        self.trajectory = positions[:i + 1]
+        _, normal = field.query(positions[i])
+        return to_vec3(normal), self.car.velocity + vec3(0, 0, GRAVITY * (i + 1) * dt)
 
     def render(self, draw: DrawingTool):
         draw.color(draw.cyan)
-        draw.polyline(self.trajectory)
+        draw.priority(draw.LOW)
+        draw.polyline([self.car.position] + to_vec3s(self.trajectory))
+        draw.priority(draw.NORMAL)
         draw.color(draw.green)
         draw.vector(self.car.position, facing(self.turn.target) * 200)
         draw.color(draw.red)
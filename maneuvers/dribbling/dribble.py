@@ -18,6 +18,9 @@ class Dribble(Maneuver):
         self.flick = AirDodge(car, 0.15, info.ball.position)
         self.flicking = False
 
+        # predicted once for the decision, recomputing it every tick costs about a millisecond
+        self.opponent_prediction = info.predict_opponents()
+
     def step(self, dt):
         if not self.flicking:
             self.carry.step(dt)
@@ -38,9 +41,10 @@ class Dribble(Maneuver):
                 self.flicking = True
             
             # flick if opponent is close
-            for opponent in self.info.opponents:
+            predicted = self.opponent_prediction.at(car.time + 1.0)
+            for opponent, future in zip(self.info.opponents, predicted):
                 if (
-                    distance(opponent.position + opponent.velocity, car) < max(300, norm(opponent.velocity) * 0.5)
+                    distance(to_vec3(future), car) < max(300, norm(opponent.velocity) * 0.5)
                     and dot(opponent.velocity, direction(opponent, self.info.ball)) > 0.5
                 ):
                     if distance(car.position, self.info.ball.position) < 350:
@@ -2,6 +2,7 @@ from maneuvers.kit import *
 
 from maneuvers.driving.drive import Drive
 from maneuvers.driving.travel import Travel
+from utils import kernels
 
 class Arrive(Maneuver):
     '''
@@ -30,7 +31,7 @@ class Arrive(Maneuver):
             car_vel = norm(car.velocity)
             target_direction = normalize(self.target_direction)
             shift = clamp(distance(car.position, target) * self.lerp_t, 0, car_vel * 1.5)
-            if shift - self.additional_shift < turn_radius(clamp(car_vel, 1400, 2000) * 1.1):
+            if shift - self.additional_shift < kernels.turn_radius(clamp(car_vel, 1400, 2000) * 1.1):
                 shift = 0
             else:
                 shift += self.additional_shift
@@ -1,5 +1,7 @@
 from maneuvers.kit import *
 
+from utils.surface import surface_waypoint, on_wall
+
 
 class Drive(Maneuver):
 
@@ -14,8 +16,13 @@ class Drive(Maneuver):
     def step(self, dt):
         target = self.target_pos
 
-        # dont try driving outside the arena
-        target = Arena.clamp(target, 100)
+        # up a wall, steer along the shortest path over the surface
+        if self.drive_on_walls:
+            target = surface_waypoint(self.car.position, target)
+
+        # dont try driving outside the arena, waypoints up a wall are on its surface already
+        if not (self.drive_on_walls and on_wall(target)):
+            target = Arena.clamp(target, 100)
 
         # smoothly escape goal
         if abs(self.car.position[1]) > Arena.size[1] - 50:
@@ -1,11 +1,17 @@
+from typing import List
+
 from maneuvers.kit import *
 
 from maneuvers.driving.drive import Drive
 from maneuvers.jumps.half_flip import HalfFlip
 from rlutilities.mechanics import Wavedash, Dodge
+from utils.boost_pads import BoostPad
 
 class Travel(Maneuver):
 
+    # how close to a pad's center we need to get to pick it up
+    PAD_PICKUP_DISTANCE = 150
+
     def __init__(self, car: Car, target: vec3 = vec3(0, 0, 0), waste_boost=False):
         super().__init__(car)
 
@@ -16,6 +22,9 @@ class Travel(Maneuver):
         self._time_on_ground = 0
         self.driving = True
 
+        # boost pads to drive over on the way, see utils.boost_route
+        self.route: List[BoostPad] = []
+
         self.dodge_duration = 1.5
         self.halflip_duration = 2
         self.wavedash_duration = 1.3
@@ -30,9 +39,21 @@ class Travel(Maneuver):
         self.drive = Drive(car, self.target, 2300, backwards)
         self.action = self.drive
 
+    def next_waypoint(self) -> vec3:
+        car = self.car
+        while self.route:
+            pad = self.route[0]
+            dist = ground_distance(car, pad)
+            # skip pads we drove over or that won't be back in time
+            if dist < self.PAD_PICKUP_DISTANCE or (not pad.is_active and pad.timer > dist / max(norm(car.velocity), 1000)):
+                self.route.pop(0)
+            else:
+                return ground(pad.position)
+        return ground(self.target)
+
     def step(self, dt):
         car = self.car
-        target = ground(self.target)
+        target = self.next_waypoint()
 
         car_vel = norm(car.velocity)
         time_left = (distance(car, target) - self.finish_distance) / max(car_vel + 500, 1400)
@@ -76,7 +97,7 @@ class Travel(Maneuver):
             self.action = self.drive
             self.drive.backwards = False
 
-        if distance(car, target) < self.finish_distance and self.driving:
+        if not self.route and distance(car, target) < self.finish_distance and self.driving:
             self.finished = True
 
         if not self.waste_boost and car.boost < 70:
@@ -86,4 +107,7 @@ class Travel(Maneuver):
         if self.driving:
             self.action.render(draw)
         draw.color(draw.orange)
-        draw.square(self.target, clamp(distance(self.car, self.target) / 10, 100, 1000))
\ No newline at end of file
+        draw.square(self.target, clamp(distance(self.car, self.target) / 10, 100, 1000))
+        if self.route:
+            draw.color(draw.yellow)
+            draw.polyline([self.car.position] + [pad.position for pad in self.route] + [self.target])
\ No newline at end of file
@@ -1,9 +1,15 @@
+import numpy as np
+
 from maneuvers.kit import *
 
 from maneuvers.driving.travel import Travel
 
 
 class Refuel(Maneuver):
+
+    # pads the opponents get to first count as this much further away
+    CONTESTED_PAD_PENALTY = 1.5
+
     def __init__(self, car: Car, info: GameInfo, target: vec3):
         super().__init__(car)
         self.info = info
@@ -14,15 +20,14 @@ class Refuel(Maneuver):
 
     @staticmethod
     def nearest_boostpad(car: Car, info: GameInfo, pos: vec3):
-        best_pad = None
-        best_dist = 9999
-        for pad in info.large_boost_pads:
-            if pad.is_full_boost:
-                dist = distance(pos, pad.position)
-                if (pad.is_active or pad.timer < estimate_time(car, pad.position, estimate_max_car_speed(car))) and dist < best_dist:
-                    best_pad = pad
-                    best_dist = dist
-        return best_pad
+        pads = info.boost_pads
+        # a pad's distance counts more the smaller part of the boost we need it gives us,
+        # so small pads only win when they are much closer
+        needed = max(100 - car.boost, 1)
+        cost_factors = 1 / np.minimum(1, pads.amounts / needed)
+        contested = info.static_reach.advantage(pads.positions) < 0
+        cost_factors = np.where(contested, cost_factors * Refuel.CONTESTED_PAD_PENALTY, cost_factors)
+        return pads.nearest(pos, car, cost_factors=cost_factors) or pads.soonest_available(car)
 
     def step(self, dt):
         if norm(self.car.velocity) > 1400:
@@ -6,6 +6,13 @@ from maneuvers.driving.drive import Drive
 
 class ShadowDefense(Maneuver):
 
+    # pick up boost pads on the way when low on boost and it costs at most this much extra time
+    ROUTE_BOOST_THRESHOLD = 60
+    ROUTE_SLACK = 1.0
+
+    # seconds the opponents can be sooner at a shadowing position before we avoid it
+    CONTESTED_ADVANTAGE = -0.5
+
     def __init__(self, car: Car, info: GameInfo, face_target: vec3, distance_from_target: float):
         super().__init__(car)
 
@@ -18,12 +25,18 @@ class ShadowDefense(Maneuver):
         near_goal = ground_distance(car, info.my_goal.center) < 3000
         side_shift = 400 if near_goal else 2000
         points = [target_pos + vec3(side_shift, 0, 0), target_pos - vec3(side_shift, 0, 0)]
+        # don't pick a side where the opponents would get first
+        advantage = info.static_reach.advantage(to_array(points))
+        points = [p for p, adv in zip(points, advantage) if adv > self.CONTESTED_ADVANTAGE] or points
         target_pos = nearest_point(face_target, points) if near_goal else furthest_point(face_target, points)
 
         self.target = Arena.clamp(target_pos, 500)
 
         self.travel = Travel(car, self.target)
         self.travel.finish_distance = 800 if near_goal else 1500
+        if car.boost < self.ROUTE_BOOST_THRESHOLD and info.boost_routes is not None:
+            time_budget = estimate_time(car, self.target, estimate_max_car_speed(car)) + self.ROUTE_SLACK
+            self.travel.route = list(info.boost_routes.plan(car, self.target, time_budget).pads)
         self.drive = Drive(car)
 
         self.start_time = car.time
@@ -11,15 +11,18 @@ class AerialStrike(Strike):
     stop_updating = 1.5
     max_additional_time = 2
 
-    def __init__(self, car, info, target=None):
+    def __init__(self, car, info, target=None, intercept=None):
         self.aerial = Aerial(car)
 
         self.aerialing = False
-        super().__init__(car, info, target)
+        super().__init__(car, info, target, intercept)
         self.arrive.allow_dodges_and_wavedashes = False
     
-    def update(self):
-        self.intercept = AerialIntercept(self.car, self.info.ball_predictions, self.intercept_predicate)
+    def find_intercept(self, reachable=None) -> AerialIntercept:
+        return AerialIntercept(self.car, self.info.ball_predictions, self.intercept_predicate)
+
+    def update(self, intercept: AerialIntercept = None):
+        self.intercept = intercept or self.find_intercept()
         self.configure(self.intercept)
         self._last_update_time = self.car.time
         if not self.intercept.is_viable:
@@ -3,11 +3,16 @@ from maneuvers.kit import *
 from maneuvers.strikes.dodge_shot import DodgeShot
 from maneuvers.strikes.strike import Strike
 
+from utils.shot_targets import goal_mouth
+
 class CloseShot(DodgeShot):
 
     max_base_height = 180
+    # aim inside this distance from the center of the goal
+    max_aim_offset = 400
 
     def configure(self, intercept: Intercept):
         
-        self.target[0] = signclamp(self.intercept.ground_pos[0], 400)
+        aim_points = goal_mouth(vec3(0, self.target[1], self.target[2]), self.max_aim_offset)
+        self.target[0] = Strike.pick_easiest_target(self.car, intercept.ball, aim_points)[0]
         super().configure(intercept)
@@ -10,11 +10,11 @@ class DodgeStrike(Strike):
     def intercept_predicate(self, car, ball):
         return ball.position[2] < 280
 
-    def __init__(self, car, info, target=None):
+    def __init__(self, car, info, target=None, intercept=None):
         self.dodge = AimDodge(car, 0.1, info.ball.position)
         self.dodging = False
 
-        super().__init__(car, info, target)
+        super().__init__(car, info, target, intercept)
 
     def configure(self, intercept: Intercept):
         super().configure(intercept)
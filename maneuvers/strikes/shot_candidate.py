@@ -0,0 +1,35 @@
+import inspect
+from typing import Type
+
+from maneuvers.kit import *
+
+from maneuvers.strikes.strike import Strike
+
+
+class ShotCandidate:
+    '''
+    The intercept a strike would go for, found without building the strike (its Arrive, Drive, dodges...).
+    Offense compares candidates and turns only the one it picks into a Maneuver.
+    Candidates of the same car state can share a ReachableSlices, so the reachability of every ball slice
+    is estimated once, not once per shot type and direction.
+    '''
+
+    def __init__(self, shot_type: Type[Strike], car: Car, info: GameInfo, target: vec3 = None,
+                 reachable: ReachableSlices = None, intercept: Intercept = None):
+        self.shot_type = shot_type
+        self.car = car
+        self.info = info
+        self.target = target
+        self.intercept = intercept or shot_type.find_intercept(self, reachable)
+
+    def __getattr__(self, name):
+        # the intercept predicates run on the candidate, and read the strike's other methods and class attributes
+        attribute = inspect.getattr_static(self.shot_type, name)
+        return attribute.__get__(self, self.shot_type) if hasattr(attribute, '__get__') else attribute
+
+    def materialize(self, shot_type: Type[Strike] = None) -> Strike:
+        '''
+        Build the strike, going for the intercept already found. `shot_type` builds another strike instead,
+        it has to look for the same intercepts (like CloseShot for a DodgeShot candidate).
+        '''
+        return (shot_type or self.shot_type)(self.car, self.info, self.target, self.intercept)
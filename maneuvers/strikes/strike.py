@@ -2,6 +2,8 @@ from maneuvers.kit import *
 
 from maneuvers.driving.arrive import Arrive
 
+from utils.shot_targets import rank_targets, rank_directions
+
 class Strike(Maneuver):
 
     allow_backwards = False
@@ -9,7 +11,7 @@ class Strike(Maneuver):
     stop_updating = 0.3
     max_additional_time = 1
 
-    def __init__(self, car: Car, info: GameInfo, target: vec3 = None):
+    def __init__(self, car: Car, info: GameInfo, target: vec3 = None, intercept: Intercept = None):
         super().__init__(car)
         
         self.info = info
@@ -22,7 +24,8 @@ class Strike(Maneuver):
         self._last_update_time = car.time
         self._should_strike_backwards = False
         self._initial_time = 999999
-        self.update()
+        # a ShotCandidate hands over the intercept it already found
+        self.update(intercept)
         self._initial_time = self.intercept.time
 
     def intercept_predicate(self, car: Car, ball: Ball):
@@ -33,15 +36,19 @@ class Strike(Maneuver):
         self.arrive.time = intercept.time
         self.arrive.drive.backwards = self._should_strike_backwards
 
-    def update(self):
-        self.intercept = Intercept(self.car, self.info.ball_predictions, self.intercept_predicate)
+    def find_intercept(self, reachable: ReachableSlices = None) -> Intercept:
+        intercept = Intercept(self.car, self.info.ball_predictions, self.intercept_predicate, reachable=reachable)
         if self.allow_backwards:
-            backwards_intercept = Intercept(self.car, self.info.ball_predictions, self.intercept_predicate, backwards=True)
-            if backwards_intercept.time + 0.1 < self.intercept.time:
-                self.intercept = backwards_intercept
-                self._should_strike_backwards = True
-            else:
-                self._should_strike_backwards = False
+            backwards_intercept = Intercept(
+                self.car, self.info.ball_predictions, self.intercept_predicate, backwards=True, reachable=reachable
+            )
+            if backwards_intercept.time + 0.1 < intercept.time:
+                return backwards_intercept
+        return intercept
+
+    def update(self, intercept: Intercept = None):
+        self.intercept = intercept or self.find_intercept()
+        self._should_strike_backwards = self.intercept.backwards
 
         self.configure(self.intercept)
         self._last_update_time = self.car.time
@@ -89,22 +96,10 @@ class Strike(Maneuver):
 
     @staticmethod
     def pick_easiest_target(car: Car, ball: Ball, targets) -> vec3:
-        best_dot = -99
-        best_target = None
-        for target in targets:
-            this_dot = dot(ground_direction(car, ball), ground_direction(ball, target))
-            if this_dot > best_dot:
-                best_dot = this_dot
-                best_target = target
-        return best_target
+        order, _ = rank_targets(car, ball.position, targets)
+        return targets[int(order[0])]
 
     @staticmethod
     def pick_easiest_direction(car: Car, ball: Ball, directions) -> vec3:
-        best_dot = -99
-        best_direction = None
-        for d in directions:
-            this_dot = dot(ground_direction(car, ball), d)
-            if this_dot > best_dot:
-                best_dot = this_dot
-                best_direction = d
-        return best_direction
+        order, _ = rank_directions(car, ball.position, directions)
+        return directions[int(order[0])]
@@ -1,23 +1,24 @@
 from maneuvers.kit import *
 
 from maneuvers.strikes.dodge_strike import DodgeStrike
+from utils.surface import estimate_surface_time, wall_distance, wall_point, over_goal
 
 class WallDodgeShot(DodgeStrike):
 
     def intercept_predicate(self, car: Car, ball: Ball):
-        return ball.position[2] > 1000 and abs(ball.position[0]) > Arena.size[0] - 300 \
-        and (ground_distance(car, ball) + ball.position[2] - car.position[2]) / estimate_max_car_speed(car) * 1.2 < ball.time - car.time
+        return ball.position[2] > 1000 and wall_distance(ball.position) < 300 and not over_goal(ball.position) \
+        and estimate_surface_time(car, ball, estimate_max_car_speed(car)) < ball.time - car.time
 
     def configure(self, intercept: Intercept):
         self.arrive.drive.drive_on_walls = True
         ball = intercept.ball
 
-        self.arrive.target = vec3(Arena.size[0] * sign(ball.position[0]), ball.position[1], ball.position[2])
+        self.arrive.target, wall_normal = wall_point(ball.position)
 
         target_direction = direction(ball, self.target)
-        target_direction[0] = 0
+        target_direction -= wall_normal * dot(target_direction, wall_normal)
 
-        dist_to_wall = Arena.size[0] - abs(ball.position[0])
+        dist_to_wall = distance(ball, self.arrive.target)
 
         self.arrive.target_direction = normalize(target_direction)
         self.arrive.time = intercept.time
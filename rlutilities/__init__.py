@@ -1,5 +1,14 @@
 import sys
-from .rlutilities import mechanics, simulation, linear_algebra
+import warnings
+
+try:
+    from .rlutilities import mechanics, simulation, linear_algebra
+    NATIVE = True
+except ImportError:
+    NATIVE = False
+    # the native module is only built for Windows, fall back to a (slower, simplified) pure-Python backend
+    from .fallback import mechanics, simulation, linear_algebra
+    warnings.warn("native rlutilities module could not be loaded, using the pure-Python fallback")
 
 sys.modules["rlutilities.mechanics"] = mechanics
 sys.modules["rlutilities.simulation"] = simulation
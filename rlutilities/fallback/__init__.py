@@ -0,0 +1,2 @@
+# rlutilities/__init__.py imports the submodules: linear_algebra has to be registered as
+# rlutilities.linear_algebra before simulation loads (see utils/arena.py)
@@ -0,0 +1,474 @@
+'''Pure-Python implementation of the subset of rlutilities.linear_algebra used by the bot.'''
+import math
+
+__all__ = [
+    "mat2",
+    "mat3",
+    "vec2",
+    "vec3",
+    "vec4",
+    "angle_between",
+    "axis_to_rotation",
+    "clip",
+    "cross",
+    "dot",
+    "euler_to_rotation",
+    "inv",
+    "look_at",
+    "norm",
+    "normalize",
+    "rotation",
+    "rotation_to_axis",
+    "rotation_to_euler",
+    "sgn",
+    "transpose",
+    "xy"
+]
+
+_new = object.__new__
+
+
+class _vec:
+    '''Shared behaviour of the fixed size vector types, components are stored in a list.'''
+    __slots__ = ('_d',)
+
+    def __getitem__(self, index):
+        return self._d[index]
+
+    def __setitem__(self, index, value):
+        self._d[index] = float(value)
+
+    def __len__(self):
+        return len(self._d)
+
+    def __iter__(self):
+        return iter(self._d)
+
+    def __str__(self):
+        return "(" + ", ".join(str(c) for c in self._d) + ")"
+
+    def __repr__(self):
+        return type(self).__name__ + str(self)
+
+    def __getstate__(self):
+        return self._d
+
+    def __setstate__(self, state):
+        self._d = list(state)
+
+
+class vec2(_vec):
+    __slots__ = ()
+
+    def __init__(self, x=0.0, y=None):
+        if y is None and isinstance(x, _vec):
+            self._d = [x._d[0], x._d[1]]
+        else:
+            self._d = [float(x), float(y or 0.0)]
+
+    def __add__(self, other):
+        a, b = self._d, other._d
+        return _v2(a[0] + b[0], a[1] + b[1])
+
+    def __sub__(self, other):
+        a, b = self._d, other._d
+        return _v2(a[0] - b[0], a[1] - b[1])
+
+    def __mul__(self, s):
+        a = self._d
+        return _v2(a[0] * s, a[1] * s)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, s):
+        a = self._d
+        return _v2(a[0] / s, a[1] / s)
+
+    def __neg__(self):
+        a = self._d
+        return _v2(-a[0], -a[1])
+
+    def __iadd__(self, other):
+        a, b = self._d, other._d
+        a[0] += b[0]
+        a[1] += b[1]
+        return self
+
+    def __isub__(self, other):
+        a, b = self._d, other._d
+        a[0] -= b[0]
+        a[1] -= b[1]
+        return self
+
+    def __imul__(self, s):
+        a = self._d
+        a[0] *= s
+        a[1] *= s
+        return self
+
+    def __itruediv__(self, s):
+        a = self._d
+        a[0] /= s
+        a[1] /= s
+        return self
+
+
+class vec3(_vec):
+    __slots__ = ()
+
+    def __init__(self, x=0.0, y=None, z=None):
+        if y is None and isinstance(x, _vec):
+            d = x._d
+            self._d = [d[0], d[1], d[2] if len(d) > 2 else 0.0]
+        else:
+            self._d = [float(x), float(y or 0.0), float(z or 0.0)]
+
+    def __add__(self, other):
+        a, b = self._d, other._d
+        return _v3(a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+    def __sub__(self, other):
+        a, b = self._d, other._d
+        return _v3(a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+    def __mul__(self, s):
+        a = self._d
+        return _v3(a[0] * s, a[1] * s, a[2] * s)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, s):
+        a = self._d
+        return _v3(a[0] / s, a[1] / s, a[2] / s)
+
+    def __neg__(self):
+        a = self._d
+        return _v3(-a[0], -a[1], -a[2])
+
+    def __iadd__(self, other):
+        a, b = self._d, other._d
+        a[0] += b[0]
+        a[1] += b[1]
+        a[2] += b[2]
+        return self
+
+    def __isub__(self, other):
+        a, b = self._d, other._d
+        a[0] -= b[0]
+        a[1] -= b[1]
+        a[2] -= b[2]
+        return self
+
+    def __imul__(self, s):
+        a = self._d
+        a[0] *= s
+        a[1] *= s
+        a[2] *= s
+        return self
+
+    def __itruediv__(self, s):
+        a = self._d
+        a[0] /= s
+        a[1] /= s
+        a[2] /= s
+        return self
+
+
+class vec4(_vec):
+    __slots__ = ()
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=0.0):
+        self._d = [float(x), float(y), float(z), float(w)]
+
+    def __add__(self, other):
+        return _v4(*(a + b for a, b in zip(self._d, other._d)))
+
+    def __sub__(self, other):
+        return _v4(*(a - b for a, b in zip(self._d, other._d)))
+
+    def __mul__(self, s):
+        return _v4(*(a * s for a in self._d))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, s):
+        return _v4(*(a / s for a in self._d))
+
+    def __iadd__(self, other):
+        self._d = [a + b for a, b in zip(self._d, other._d)]
+        return self
+
+    def __isub__(self, other):
+        self._d = [a - b for a, b in zip(self._d, other._d)]
+        return self
+
+    def __imul__(self, s):
+        self._d = [a * s for a in self._d]
+        return self
+
+    def __itruediv__(self, s):
+        self._d = [a / s for a in self._d]
+        return self
+
+
+def _v2(x, y) -> vec2:
+    v = _new(vec2)
+    v._d = [x, y]
+    return v
+
+
+def _v3(x, y, z) -> vec3:
+    v = _new(vec3)
+    v._d = [x, y, z]
+    return v
+
+
+def _v4(x, y, z, w) -> vec4:
+    v = _new(vec4)
+    v._d = [x, y, z, w]
+    return v
+
+
+class _mat:
+    '''Square matrix stored row-major in a flat list, indexed with m[row, column].'''
+    __slots__ = ('_d',)
+    _n = 0
+
+    def __getitem__(self, index):
+        return self._d[index[0] * self._n + index[1]]
+
+    def __setitem__(self, index, value):
+        self._d[index[0] * self._n + index[1]] = float(value)
+
+    def __str__(self):
+        n = self._n
+        return "\n".join(" ".join(str(self._d[i * n + j]) for j in range(n)) for i in range(n))
+
+    def __repr__(self):
+        return type(self).__name__ + "(" + ", ".join(str(c) for c in self._d) + ")"
+
+    def __getstate__(self):
+        return self._d
+
+    def __setstate__(self, state):
+        self._d = list(state)
+
+
+class mat2(_mat):
+    __slots__ = ()
+    _n = 2
+
+    def __init__(self, a00, a01, a10, a11):
+        self._d = [float(a00), float(a01), float(a10), float(a11)]
+
+
+class mat3(_mat):
+    __slots__ = ()
+    _n = 3
+
+    def __init__(self, a00, a01, a02, a10, a11, a12, a20, a21, a22):
+        self._d = [float(a00), float(a01), float(a02),
+                   float(a10), float(a11), float(a12),
+                   float(a20), float(a21), float(a22)]
+
+
+def _m2(d) -> mat2:
+    m = _new(mat2)
+    m._d = d
+    return m
+
+
+def _m3(d) -> mat3:
+    m = _new(mat3)
+    m._d = d
+    return m
+
+
+def dot(a, b):
+    ta, tb = type(a), type(b)
+    if ta is vec3:
+        a = a._d
+        if tb is vec3:
+            b = b._d
+            return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+        if tb is mat3:
+            m = b._d
+            return _v3(
+                a[0] * m[0] + a[1] * m[3] + a[2] * m[6],
+                a[0] * m[1] + a[1] * m[4] + a[2] * m[7],
+                a[0] * m[2] + a[1] * m[5] + a[2] * m[8]
+            )
+    elif ta is mat3:
+        m = a._d
+        if tb is vec3:
+            v = b._d
+            return _v3(
+                m[0] * v[0] + m[1] * v[1] + m[2] * v[2],
+                m[3] * v[0] + m[4] * v[1] + m[5] * v[2],
+                m[6] * v[0] + m[7] * v[1] + m[8] * v[2]
+            )
+        if tb is mat3:
+            n = b._d
+            return _m3([
+                sum(m[i * 3 + k] * n[k * 3 + j] for k in range(3))
+                for i in range(3) for j in range(3)
+            ])
+    elif ta is vec2:
+        a = a._d
+        if tb is vec2:
+            b = b._d
+            return a[0] * b[0] + a[1] * b[1]
+        if tb is mat2:
+            m = b._d
+            return _v2(a[0] * m[0] + a[1] * m[2], a[0] * m[1] + a[1] * m[3])
+    elif ta is mat2:
+        m = a._d
+        if tb is vec2:
+            v = b._d
+            return _v2(m[0] * v[0] + m[1] * v[1], m[2] * v[0] + m[3] * v[1])
+        if tb is mat2:
+            n = b._d
+            return _m2([
+                m[0] * n[0] + m[1] * n[2], m[0] * n[1] + m[1] * n[3],
+                m[2] * n[0] + m[3] * n[2], m[2] * n[1] + m[3] * n[3]
+            ])
+    elif ta is vec4 and tb is vec4:
+        return sum(x * y for x, y in zip(a._d, b._d))
+    raise TypeError(f"dot(): unsupported operand types {ta.__name__} and {tb.__name__}")
+
+
+def cross(a, b=None):
+    if b is None:
+        if type(a) is vec2:
+            return _v2(-a._d[1], a._d[0])
+        a = a._d
+        return _v3(-a[1], a[0], 0.0)
+    a, b = a._d, b._d
+    return _v3(
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0]
+    )
+
+
+def norm(v) -> float:
+    d = v._d
+    if len(d) == 3:
+        return math.sqrt(d[0] * d[0] + d[1] * d[1] + d[2] * d[2])
+    return math.sqrt(sum(c * c for c in d))
+
+
+def normalize(v):
+    d = v._d
+    n = math.sqrt(sum(c * c for c in d))
+    if n == 0:
+        return type(v)(v)
+    if len(d) == 3:
+        return _v3(d[0] / n, d[1] / n, d[2] / n)
+    return _v2(d[0] / n, d[1] / n)
+
+
+def clip(x, minimum, maximum):
+    return min(max(x, minimum), maximum)
+
+
+def sgn(x) -> float:
+    return float((x > 0) - (x < 0))
+
+
+def xy(v: vec3) -> vec3:
+    return _v3(v._d[0], v._d[1], 0.0)
+
+
+def transpose(m):
+    d = m._d
+    if type(m) is mat3:
+        return _m3([d[0], d[3], d[6], d[1], d[4], d[7], d[2], d[5], d[8]])
+    return _m2([d[0], d[2], d[1], d[3]])
+
+
+def inv(m):
+    d = m._d
+    if type(m) is mat2:
+        det = d[0] * d[3] - d[1] * d[2]
+        return _m2([d[3] / det, -d[1] / det, -d[2] / det, d[0] / det])
+    a, b, c, e, f, g, h, i, j = d
+    det = a * (f * j - g * i) - b * (e * j - g * h) + c * (e * i - f * h)
+    return _m3([
+        (f * j - g * i) / det, (c * i - b * j) / det, (b * g - c * f) / det,
+        (g * h - e * j) / det, (a * j - c * h) / det, (c * e - a * g) / det,
+        (e * i - f * h) / det, (b * h - a * i) / det, (a * f - b * e) / det
+    ])
+
+
+def angle_between(a, b) -> float:
+    if isinstance(a, _mat):
+        r = dot(transpose(a), b)._d
+        return math.acos(clip(0.5 * (r[0] + r[4] + r[8] - 1.0), -1.0, 1.0))
+    denominator = norm(a) * norm(b)
+    if denominator == 0:
+        return 0.0
+    return math.acos(clip(dot(a, b) / denominator, -1.0, 1.0))
+
+
+def rotation(theta: float) -> mat2:
+    c, s = math.cos(theta), math.sin(theta)
+    return _m2([c, -s, s, c])
+
+
+def look_at(direction: vec3, up: vec3 = None) -> mat3:
+    if up is None:
+        up = _v3(0.0, 0.0, 1.0)
+    f = normalize(direction)
+    u = normalize(cross(f, cross(up, f)))
+    l = normalize(cross(u, f))
+    f, l, u = f._d, l._d, u._d
+    return _m3([f[0], l[0], u[0], f[1], l[1], u[1], f[2], l[2], u[2]])
+
+
+def euler_to_rotation(pyr: vec3) -> mat3:
+    '''Rotation matrix from (pitch, yaw, roll), columns are forward, left and up.'''
+    cp, sp = math.cos(pyr[0]), math.sin(pyr[0])
+    cy, sy = math.cos(pyr[1]), math.sin(pyr[1])
+    cr, sr = math.cos(pyr[2]), math.sin(pyr[2])
+    return _m3([
+        cp * cy, cy * sp * sr - cr * sy, -cr * cy * sp - sr * sy,
+        cp * sy, sy * sp * sr + cr * cy, -cr * sy * sp + sr * cy,
+        sp, -cp * sr, cp * cr
+    ])
+
+
+def rotation_to_euler(m: mat3) -> vec3:
+    d = m._d
+    return _v3(
+        math.atan2(d[6], math.hypot(d[0], d[3])),
+        math.atan2(d[3], d[0]),
+        math.atan2(-d[7], d[8])
+    )
+
+
+def axis_to_rotation(omega: vec3) -> mat3:
+    theta = norm(omega)
+    if theta < 1e-6:
+        return _m3([1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0])
+    x, y, z = omega[0] / theta, omega[1] / theta, omega[2] / theta
+    c, s = math.cos(theta), math.sin(theta)
+    t = 1.0 - c
+    return _m3([
+        c + x * x * t, x * y * t - z * s, x * z * t + y * s,
+        y * x * t + z * s, c + y * y * t, y * z * t - x * s,
+        z * x * t - y * s, z * y * t + x * s, c + z * z * t
+    ])
+
+
+def rotation_to_axis(m: mat3) -> vec3:
+    d = m._d
+    theta = math.acos(clip(0.5 * (d[0] + d[4] + d[8] - 1.0), -1.0, 1.0))
+    if theta > math.pi - 1e-3:
+        # sin(theta) vanishes, recover the axis from the symmetric part instead
+        x = math.sqrt(max(0.0, (d[0] + 1.0) * 0.5))
+        y = math.copysign(math.sqrt(max(0.0, (d[4] + 1.0) * 0.5)), d[1] + d[3] if x else 1.0)
+        z = math.copysign(math.sqrt(max(0.0, (d[8] + 1.0) * 0.5)), d[2] + d[6] if x else d[5] + d[7])
+        return _v3(x * theta, y * theta, z * theta)
+    scale = 0.5 if theta < 1e-6 else 0.5 * theta / math.sin(theta)
+    return _v3(scale * (d[7] - d[5]), scale * (d[2] - d[6]), scale * (d[3] - d[1]))
@@ -0,0 +1,311 @@
+'''
+Simplified pure-Python stand-ins for the rlutilities.mechanics controllers used by the bot.
+They drive the same attributes as the native versions, but use plain feedback control
+instead of the model-predictive solvers of RLUtilities.
+'''
+import math
+
+from .linear_algebra import vec2, vec3, mat3, dot, norm, normalize, clip, look_at, angle_between, \
+    rotation_to_axis, transpose
+from .simulation import Car, Input, Game, _max_curvature, _throttle_accel
+
+__all__ = [
+    "Aerial",
+    "AerialTurn",
+    "Dodge",
+    "Drive",
+    "Jump",
+    "Wavedash"
+]
+
+
+class Jump:
+    acceleration = 1458.333251953125
+    max_duration = 0.20000000298023224
+    min_duration = 0.02500000037252903
+    speed = 291.6669921875
+
+    def __init__(self, car: Car):
+        self.car = car
+        self.duration = 0.2
+        self.controls = Input()
+        self.finished = False
+        self._timer = 0.0
+
+    def step(self, dt: float):
+        self.controls.jump = self._timer < self.duration
+        self._timer += dt
+        self.finished = self._timer > self.duration + 2 * dt
+
+
+class Drive:
+    boost_accel = 991.6669921875
+    brake_accel = 3500.0
+    coasting_accel = 525.0
+    max_speed = 2300.0
+    max_throttle_speed = 1410.0
+
+    def __init__(self, car: Car):
+        self.car = car
+        self.target = vec3(0, 0, 0)
+        self.speed = 1400.0
+        self.reaction_time = 0.04
+        self.controls = Input()
+        self.finished = False
+
+    @staticmethod
+    def max_turning_curvature(speed: float) -> float:
+        return _max_curvature(speed)
+
+    @staticmethod
+    def max_turning_speed(curvature: float) -> float:
+        low, high = 0.0, 2300.0
+        for _ in range(20):
+            middle = (low + high) / 2
+            if _max_curvature(middle) > curvature:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    @staticmethod
+    def throttle_accel(speed: float) -> float:
+        return _throttle_accel(speed)
+
+    def step(self, dt: float):
+        local_target = dot(self.target - self.car.position, self.car.orientation)
+        angle = math.atan2(local_target[1], local_target[0])
+        self.controls.steer = clip(3.0 * angle, -1.0, 1.0)
+
+        vf = dot(self.car.velocity, self.car.forward())
+        error = self.speed - vf
+        self.controls.throttle = clip(error / 100.0, -1.0, 1.0)
+        self.controls.boost = error > 150 and abs(angle) < 0.3 and self.speed > self.max_throttle_speed
+        self.controls.handbrake = abs(angle) > 1.5
+        self.finished = norm(local_target) < 100
+
+
+class AerialTurn:
+    '''Rotate the car towards `target` orientation with a damped feedback controller on the angular velocity.'''
+
+    def __init__(self, car: Car):
+        self.car = car
+        self.target = mat3(1, 0, 0, 0, 1, 0, 0, 0, 1)
+        self.controls = Input()
+        self.finished = False
+        self.eps_phi = 0.1
+        self.eps_omega = 0.15
+        self.horizon_time = 0.05
+        self.alpha = vec3(0, 0, 0)
+
+    def step(self, dt: float):
+        car = self.car
+        orientation = car.orientation
+
+        # rotation still needed, expressed in the car's local frame
+        error = rotation_to_axis(dot(transpose(orientation), self.target))
+        omega = dot(car.angular_velocity, orientation)
+
+        target_omega = error * 3.0
+        speed = norm(target_omega)
+        if speed > Car.max_omega:
+            target_omega *= Car.max_omega / speed
+
+        alpha = (target_omega - omega) / max(self.horizon_time, dt)
+        inputs = [0.0, 0.0, 0.0]
+        for i in range(3):
+            damping = Car.D[i] * omega[i]
+            inputs[i] = clip((alpha[i] - damping) / Car.T[i], -1.0, 1.0)
+
+        self.alpha = alpha
+        self.controls.roll, self.controls.pitch, self.controls.yaw = inputs
+        self.finished = angle_between(orientation, self.target) < self.eps_phi and norm(omega) < self.eps_omega
+
+
+class Dodge:
+    forward_torque = 224.0
+    input_threshold = 0.5
+    side_torque = 260.0
+    timeout = 1.5
+    torque_time = 0.6499999761581421
+    z_damping = 0.3499999940395355
+    z_damping_end = 0.20999999344348907
+    z_damping_start = 0.15000000596046448
+
+    def __init__(self, car: Car):
+        self.car = car
+        self.controls = Input()
+        self.finished = False
+        self.timer = 0.0
+
+        self.direction: vec2 = None
+        self.target: vec3 = None
+        self.duration: float = None
+        self.delay: float = None
+        self.preorientation: mat3 = None
+
+        self._dodged = False
+        self._turn = AerialTurn(car)
+
+    def _stick(self) -> vec2:
+        if self.target is not None:
+            direction = self.target - self.car.position
+        elif self.direction is not None:
+            direction = vec3(self.direction)
+        else:
+            return vec2(0, 0)
+
+        forward = normalize(vec3(self.car.forward()[0], self.car.forward()[1], 0))
+        left = normalize(vec3(self.car.left()[0], self.car.left()[1], 0))
+        local = vec2(dot(direction, forward), dot(direction, left))
+        scale = max(abs(local[0]), abs(local[1]))
+        return local / scale if scale > 0 else local
+
+    def step(self, dt: float):
+        duration = self.duration if self.duration is not None else 0.0
+        delay = self.delay if self.delay is not None else duration + 2 * Game.frametime
+
+        self.controls = Input()
+        if self.timer < duration:
+            self.controls.jump = True
+
+        elif self.timer < delay:
+            if self.preorientation is not None:
+                self._turn.target = self.preorientation
+                self._turn.step(dt)
+                self.controls = self._turn.controls
+
+        elif not self._dodged:
+            stick = self._stick()
+            self.controls.jump = True
+            self.controls.pitch = -stick[0]
+            self.controls.yaw = stick[1]
+            self._dodged = True
+
+        self.timer += dt
+        self.finished = (self._dodged and self.car.on_ground and self.timer > delay + 0.2) \
+            or self.timer > delay + self.timeout
+
+
+class Wavedash:
+    '''Jump, tilt the nose up and dodge into the floor just before landing.'''
+
+    def __init__(self, car: Car):
+        self.car = car
+        self.controls = Input()
+        self.finished = False
+        self.direction: vec2 = None
+
+        self._timer = 0.0
+        self._dodge = None
+
+    def step(self, dt: float):
+        car = self.car
+        self.controls = Input()
+
+        if self._dodge is None:
+            if self._timer < 0.08:
+                self.controls.jump = True
+            else:
+                self.controls.pitch = 0.3
+                if not car.on_ground and car.position[2] + car.velocity[2] * 0.05 < 45 and self._timer > 0.3:
+                    self._dodge = Dodge(car)
+                    self._dodge.direction = self.direction if self.direction is not None else vec2(car.forward())
+                    self._dodge.duration = 0.0
+                    self._dodge.delay = 0.0
+
+        if self._dodge is not None:
+            self._dodge.step(dt)
+            self.controls = self._dodge.controls
+
+        self._timer += dt
+        self.finished = (self._timer > 0.3 and car.on_ground) or self._timer > 1.5
+
+
+class Aerial:
+    boost_accel = 1060.0
+    boost_per_second = 30.0
+    max_speed = 2300.0
+    throttle_accel = 66.66667175292969
+
+    def __init__(self, car: Car):
+        self.car = car
+        self.controls = Input()
+        self.finished = False
+
+        self.target = vec3(0, 0, 0)
+        self.arrival_time = 0.0
+        self.up = vec3(0, 0, 1)
+        self.target_orientation: mat3 = None
+
+        self.angle_threshold = 0.3
+        self.reorient_distance = 50.0
+        self.throttle_distance = 50.0
+
+        self.boost_estimate = 0.0
+        self.velocity_estimate = vec3(0, 0, 0)
+
+        self._jump_timer = 0.0
+        self._turn = AerialTurn(car)
+
+    def _required_acceleration(self):
+        '''Constant acceleration that brings the car to the target at arrival time, on top of gravity.'''
+        car = self.car
+        T = self.arrival_time - car.time
+        if T <= 0:
+            return None, T
+        velocity = vec3(car.velocity)
+        if car.on_ground:
+            velocity += car.up() * (Jump.speed + Jump.acceleration * Jump.max_duration)
+        predicted = car.position + velocity * T + vec3(0, 0, 0.5 * Game.gravity * T * T)
+        delta = self.target - predicted
+        return delta * (2.0 / (T * T)), T
+
+    def is_viable(self) -> bool:
+        acceleration, T = self._required_acceleration()
+        if acceleration is None:
+            return False
+        ratio = norm(acceleration) / self.boost_accel
+        self.boost_estimate = ratio * T * self.boost_per_second
+        self.velocity_estimate = self.car.velocity + acceleration * T
+        return ratio < 0.9 and self.boost_estimate < self.car.boost and norm(self.velocity_estimate) < self.max_speed
+
+    def simulate(self) -> Car:
+        car = Car(self.car)
+        aerial = Aerial(car)
+        aerial.target = vec3(self.target)
+        aerial.arrival_time = self.arrival_time
+        aerial.up = vec3(self.up)
+        while car.time < self.arrival_time and not aerial.finished:
+            aerial.step(Game.frametime)
+            car.step(aerial.controls, Game.frametime)
+            car.time += Game.frametime
+        return car
+
+    def step(self, dt: float):
+        car = self.car
+        self.controls = Input()
+
+        if car.on_ground or self._jump_timer < Jump.max_duration:
+            self.controls.jump = True
+            self._jump_timer += dt
+            if car.on_ground:
+                return
+
+        acceleration, T = self._required_acceleration()
+        if acceleration is None:
+            self.finished = True
+            return
+
+        if norm(self.target - car.position) < self.reorient_distance and self.target_orientation is not None:
+            self._turn.target = self.target_orientation
+        elif norm(acceleration) > 1:
+            self._turn.target = look_at(acceleration, self.up)
+        self._turn.step(dt)
+        self.controls.roll = self._turn.controls.roll
+        self.controls.pitch = self._turn.controls.pitch
+        self.controls.yaw = self._turn.controls.yaw
+
+        angle = angle_between(car.forward(), acceleration) if norm(acceleration) > 1 else math.pi
+        self.controls.boost = angle < self.angle_threshold and norm(acceleration) > self.throttle_accel
+        self.controls.throttle = 1.0 if norm(acceleration) > 0 else 0.0
@@ -0,0 +1,542 @@
+'''
+Pure-Python implementation of the subset of rlutilities.simulation used by the bot.
+
+The soccar arena is the analytic model of utils.arena_model: a box with rounded floor/wall/ceiling
+edges, 45 degree corner walls and two goal boxes. Ball physics follow the bounce model used by
+RLUtilities; car physics only cover basic driving, jumping, dodging and air control.
+'''
+import math
+
+from utils.arena_model import arena_distance
+
+from .linear_algebra import vec2, vec3, vec4, mat2, mat3, dot, cross, norm, normalize, clip, \
+    euler_to_rotation, axis_to_rotation, _v3, _m3
+
+__all__ = [
+    "Ball",
+    "Car",
+    "Field",
+    "Game",
+    "Goal",
+    "Input",
+    "Pad",
+    "obb",
+    "ray",
+    "sphere",
+    "tri",
+    "intersect",
+    "arena_distance"
+]
+
+class Input:
+    __slots__ = ('throttle', 'steer', 'pitch', 'yaw', 'roll', 'jump', 'boost', 'handbrake', 'use_item')
+
+    def __init__(self):
+        self.throttle = 0.0
+        self.steer = 0.0
+        self.pitch = 0.0
+        self.yaw = 0.0
+        self.roll = 0.0
+        self.jump = False
+        self.boost = False
+        self.handbrake = False
+        self.use_item = False
+
+
+class sphere:
+    __slots__ = ('center', 'radius')
+
+    def __init__(self, center: vec3 = None, radius: float = 0.0):
+        self.center = vec3(0, 0, 0) if center is None else center
+        self.radius = radius
+
+
+class ray:
+    __slots__ = ('start', 'direction')
+
+    def __init__(self, start: vec3 = None, direction: vec3 = None):
+        self.start = vec3(0, 0, 0) if start is None else start
+        self.direction = vec3(0, 0, 0) if direction is None else direction
+
+
+class obb:
+    __slots__ = ('center', 'half_width', 'orientation')
+
+    def __init__(self):
+        self.center = vec3(0, 0, 0)
+        self.half_width = vec3(0, 0, 0)
+        self.orientation = mat3(1, 0, 0, 0, 1, 0, 0, 0, 1)
+
+
+class tri:
+    __slots__ = ('_p',)
+
+    def __init__(self):
+        self._p = [vec3(0, 0, 0), vec3(0, 0, 0), vec3(0, 0, 0)]
+
+    def __getitem__(self, index) -> vec3:
+        return self._p[index]
+
+    def __setitem__(self, index, value: vec3):
+        self._p[index] = value
+
+
+def intersect(a, b) -> bool:
+    box, ball = (a, b) if isinstance(a, obb) else (b, a)
+    local = dot(ball.center - box.center, box.orientation)
+    closest = vec3(*(clip(local[i], -box.half_width[i], box.half_width[i]) for i in range(3)))
+    return norm(local - closest) <= ball.radius
+
+
+class Field:
+    mode = 'Uninitialized'
+    triangles = []
+    walls = []
+
+    @staticmethod
+    def collide(shape) -> ray:
+        '''
+        Contact of a sphere (or the bounding sphere of an obb) with the arena.
+        Returns a ray from the contact point along the surface normal, or a zero ray if there is no contact.
+        '''
+        if isinstance(shape, obb):
+            center, radius = shape.center, norm(shape.half_width)
+        else:
+            center, radius = shape.center, shape.radius
+        p = center._d
+        dist, *n = arena_distance(p[0], p[1], p[2])
+        if dist > radius:
+            return ray()
+        return ray(_v3(p[0] - n[0] * dist, p[1] - n[1] * dist, p[2] - n[2] * dist), _v3(*n))
+
+
+class Pad:
+
+    def __init__(self):
+        self.is_active = True
+        self.is_full_boost = False
+        self.position = vec3(0, 0, 0)
+        self.timer = 0.0
+
+
+class Goal:
+
+    def __init__(self):
+        self.direction = vec3(0, 0, 0)
+        self.location = vec3(0, 0, 0)
+        self.team = 0
+
+
+class Ball:
+    collision_radius = 93.1500015258789
+    drag = -0.030500000342726707
+    friction = 2.0
+    mass = 30.0
+    max_omega = 6.0
+    max_speed = 4000.0
+    moment_of_inertia = 99918.75
+    radius = 91.25
+    restitution = 0.6000000238418579
+
+    # surface interaction coefficients of the RLUtilities bounce model
+    _mu = 0.285
+    _spin_coupling = 0.0003
+    _friction_ratio = 2.0
+
+    def __init__(self, other: 'Ball' = None):
+        if other is None:
+            self.position = vec3(0, 0, 110)
+            self.velocity = vec3(0, 0, 0)
+            self.angular_velocity = vec3(0, 0, 0)
+            self.time = 0.0
+        else:
+            self.position = vec3(other.position)
+            self.velocity = vec3(other.velocity)
+            self.angular_velocity = vec3(other.angular_velocity)
+            self.time = other.time
+
+    def hitbox(self) -> sphere:
+        return sphere(vec3(self.position), self.collision_radius)
+
+    def step(self, dt: float, car: 'Car' = None):
+        # car touches are not simulated, `car` is only accepted for API compatibility
+        p = self.position._d
+        v = self.velocity._d
+        w = self.angular_velocity._d
+        r = self.collision_radius
+
+        dist, *n = arena_distance(p[0], p[1], p[2])
+        if dist < r:
+            vn = v[0] * n[0] + v[1] * n[1] + v[2] * n[2]
+            if vn < 0:
+                v_perp = (n[0] * vn, n[1] * vn, n[2] * vn)
+                spin = (n[1] * w[2] - n[2] * w[1], n[2] * w[0] - n[0] * w[2], n[0] * w[1] - n[1] * w[0])
+                s = [v[i] - v_perp[i] + r * spin[i] for i in range(3)]
+                s_norm = math.sqrt(s[0] * s[0] + s[1] * s[1] + s[2] * s[2])
+                ratio = abs(vn) / max(s_norm, 0.0001)
+                friction = -min(1.0, self._friction_ratio * ratio) * self._mu
+                dv_para = (s[0] * friction, s[1] * friction, s[2] * friction)
+                for i in range(3):
+                    v[i] += -(1.0 + self.restitution) * v_perp[i] + dv_para[i]
+                coupling = self._spin_coupling * r
+                w[0] += coupling * (dv_para[1] * n[2] - dv_para[2] * n[1])
+                w[1] += coupling * (dv_para[2] * n[0] - dv_para[0] * n[2])
+                w[2] += coupling * (dv_para[0] * n[1] - dv_para[1] * n[0])
+            for i in range(3):
+                p[i] += n[i] * (r - dist)
+
+        drag = self.drag * dt
+        v[0] += v[0] * drag
+        v[1] += v[1] * drag
+        v[2] += v[2] * drag + Game.gravity * dt
+
+        speed = math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+        if speed > self.max_speed:
+            scale = self.max_speed / speed
+            v[0] *= scale
+            v[1] *= scale
+            v[2] *= scale
+
+        omega = math.sqrt(w[0] * w[0] + w[1] * w[1] + w[2] * w[2])
+        if omega > self.max_omega:
+            scale = self.max_omega / omega
+            w[0] *= scale
+            w[1] *= scale
+            w[2] *= scale
+
+        p[0] += v[0] * dt
+        p[1] += v[1] * dt
+        p[2] += v[2] * dt
+        self.time += dt
+
+
+def _throttle_accel(speed: float) -> float:
+    speed = abs(speed)
+    if speed < 1400:
+        return 1600.0 - speed * (1600.0 - 160.0) / 1400.0
+    if speed < 1410:
+        return 160.0 - (speed - 1400.0) * 16.0
+    return 0.0
+
+
+_CURVATURE_SPEEDS = (0.0, 500.0, 1000.0, 1500.0, 1750.0, 2300.0)
+_CURVATURES = (0.0069, 0.00398, 0.00235, 0.001375, 0.0011, 0.00088)
+
+
+def _max_curvature(speed: float) -> float:
+    speed = clip(abs(speed), 0.0, 2300.0)
+    for i in range(1, len(_CURVATURE_SPEEDS)):
+        if speed <= _CURVATURE_SPEEDS[i]:
+            t = (speed - _CURVATURE_SPEEDS[i - 1]) / (_CURVATURE_SPEEDS[i] - _CURVATURE_SPEEDS[i - 1])
+            return _CURVATURES[i - 1] + t * (_CURVATURES[i] - _CURVATURES[i - 1])
+    return _CURVATURES[-1]
+
+
+class Car:
+    max_speed = 2300.0
+    ground_height = 17.01
+    brake_accel = 3500.0
+    coasting_accel = 525.0
+    boost_accel_ground = 991.667
+    boost_accel_air = 1060.0
+    boost_per_second = 33.3
+    jump_impulse = 291.667
+    jump_accel = 1458.333
+    jump_max_duration = 0.2
+    dodge_impulse = 500.0
+    dodge_window = 1.25
+    # the dodge torque lasts this long, pitch and yaw aren't damped meanwhile
+    dodge_torque_duration = 0.65
+    max_omega = 5.5
+
+    # angular acceleration per unit input (T) and damping (D) around the local roll, pitch and yaw axes
+    T = (-36.07956616966136, -12.14599781908070, 8.91962804287785)
+    D = (-4.47166302201591, -2.798194258050845, -1.886491900437232)
+
+    hitbox_offset = vec3(13.88, 0.0, 20.75)
+    hitbox_half_width = vec3(59.00368, 42.09956, 18.07911)
+
+    def __init__(self, other: 'Car' = None):
+        if other is None:
+            self.position = vec3(0, 0, self.ground_height)
+            self.velocity = vec3(0, 0, 0)
+            self.angular_velocity = vec3(0, 0, 0)
+            self.orientation = mat3(1, 0, 0, 0, 1, 0, 0, 0, 1)
+            self.rotator = vec3(0, 0, 0)
+            self.quaternion = vec4(1, 0, 0, 0)
+            self.dodge_rotation = mat2(1, 0, 0, 1)
+            self.controls = Input()
+            self.boost = 0
+            self.dodge_timer = 0.0
+            self.dodge_heading = None
+            self.jump_timer = -1.0
+            self.jumped = False
+            self.double_jumped = False
+            self.on_ground = True
+            self.supersonic = False
+            self.id = 0
+            self.team = 0
+            self.time = 0.0
+        else:
+            self.position = vec3(other.position)
+            self.velocity = vec3(other.velocity)
+            self.angular_velocity = vec3(other.angular_velocity)
+            self.orientation = _m3(list(other.orientation._d))
+            self.rotator = vec3(other.rotator)
+            self.quaternion = vec4(*other.quaternion)
+            self.dodge_rotation = mat2(other.dodge_rotation[0, 0], other.dodge_rotation[0, 1],
+                                       other.dodge_rotation[1, 0], other.dodge_rotation[1, 1])
+            self.controls = Input()
+            for attribute in Input.__slots__:
+                setattr(self.controls, attribute, getattr(other.controls, attribute))
+            self.boost = other.boost
+            self.dodge_timer = other.dodge_timer
+            self.dodge_heading = None if other.dodge_heading is None else vec3(other.dodge_heading)
+            self.jump_timer = other.jump_timer
+            self.jumped = other.jumped
+            self.double_jumped = other.double_jumped
+            self.on_ground = other.on_ground
+            self.supersonic = other.supersonic
+            self.id = other.id
+            self.team = other.team
+            self.time = other.time
+
+    def forward(self) -> vec3:
+        m = self.orientation._d
+        return _v3(m[0], m[3], m[6])
+
+    def left(self) -> vec3:
+        m = self.orientation._d
+        return _v3(m[1], m[4], m[7])
+
+    def up(self) -> vec3:
+        m = self.orientation._d
+        return _v3(m[2], m[5], m[8])
+
+    def hitbox(self) -> obb:
+        box = obb()
+        box.center = self.position + dot(self.orientation, self.hitbox_offset)
+        box.half_width = vec3(self.hitbox_half_width)
+        box.orientation = _m3(list(self.orientation._d))
+        return box
+
+    def extrapolate(self, dt: float):
+        if not self.on_ground:
+            self.position += self.velocity * dt + vec3(0, 0, 0.5 * Game.gravity * dt * dt)
+            self.velocity += vec3(0, 0, Game.gravity * dt)
+        else:
+            self.position += self.velocity * dt
+
+    def step(self, controls: Input, dt: float):
+        jump_pressed = controls.jump and not self.controls.jump
+
+        if self.on_ground:
+            self._step_ground(controls, dt, jump_pressed)
+        else:
+            self._step_air(controls, dt, jump_pressed)
+
+        if controls.boost and self.boost > 0:
+            self.boost = max(0, self.boost - self.boost_per_second * dt)
+
+        speed = norm(self.velocity)
+        if speed > self.max_speed:
+            self.velocity *= self.max_speed / speed
+        self.supersonic = speed > 2200
+
+        self.position += self.velocity * dt
+        self._resolve_arena_contact()
+
+        for attribute in Input.__slots__:
+            setattr(self.controls, attribute, getattr(controls, attribute))
+
+    def _step_ground(self, controls: Input, dt: float, jump_pressed: bool):
+        f = self.forward()
+        vf = dot(self.velocity, f)
+
+        if controls.boost and self.boost > 0:
+            accel = self.boost_accel_ground + _throttle_accel(vf)
+        elif abs(controls.throttle) < 0.01:
+            accel = -math.copysign(min(self.coasting_accel, abs(vf) / dt), vf)
+        elif controls.throttle * vf >= 0:
+            accel = controls.throttle * _throttle_accel(vf)
+        else:
+            accel = -math.copysign(min(self.brake_accel, abs(vf) / dt), vf)
+        vf += accel * dt
+
+        curvature = _max_curvature(vf) * (1.5 if controls.handbrake else 1.0)
+        turn_rate = clip(controls.steer, -1, 1) * curvature * vf
+        self.angular_velocity = self.up() * turn_rate
+        self.orientation = dot(axis_to_rotation(self.angular_velocity * dt), self.orientation)
+
+        self.velocity = self.forward() * vf
+
+        if jump_pressed:
+            self.velocity += self.up() * self.jump_impulse
+            self.on_ground = False
+            self.jumped = True
+            self.double_jumped = False
+            self.jump_timer = 0.0
+
+    def _step_air(self, controls: Input, dt: float, jump_pressed: bool):
+        self.velocity += vec3(0, 0, Game.gravity * dt)
+
+        if controls.boost and self.boost > 0:
+            self.velocity += self.forward() * (self.boost_accel_air * dt)
+
+        if self.jump_timer >= 0:
+            if controls.jump and self.jump_timer < self.jump_max_duration and not self.double_jumped:
+                self.velocity += self.up() * (self.jump_accel * dt)
+            self.jump_timer += dt
+
+        if jump_pressed and not self.double_jumped and 0 <= self.jump_timer < self.dodge_window:
+            stick = vec2(-controls.pitch, controls.yaw)
+            if abs(stick[0]) + abs(stick[1]) > 0.5:
+                stick = normalize(stick)
+                f, l = normalize(vec3(self.forward()[0], self.forward()[1], 0)), normalize(vec3(self.left()[0], self.left()[1], 0))
+                dodge_direction = f * stick[0] + l * stick[1]
+                self.velocity += dodge_direction * self.dodge_impulse
+                self.angular_velocity = cross(vec3(0, 0, 1), dodge_direction) * self.max_omega
+                self.dodge_timer = 0.0
+                self.dodge_heading = f
+            else:
+                self.velocity += self.up() * self.jump_impulse
+            self.double_jumped = True
+
+        # air control, integrated in the car's local frame
+        u = (controls.roll, controls.pitch, controls.yaw)
+        omega = dot(self.angular_velocity, self.orientation)
+        damped = 0.0 if self.dodge_heading is not None and self.dodge_timer < self.dodge_torque_duration else 1.0
+        alpha = vec3(
+            self.T[0] * u[0] + self.D[0] * omega[0],
+            self.T[1] * u[1] + self.D[1] * (1 - abs(u[1])) * damped * omega[1],
+            self.T[2] * u[2] + self.D[2] * (1 - abs(u[2])) * damped * omega[2]
+        )
+        self.angular_velocity += dot(self.orientation, alpha) * dt
+        omega_norm = norm(self.angular_velocity)
+        if omega_norm > self.max_omega:
+            self.angular_velocity *= self.max_omega / omega_norm
+        self.orientation = dot(axis_to_rotation(self.angular_velocity * dt), self.orientation)
+        self.dodge_timer += dt
+
+    def _resolve_arena_contact(self):
+        p = self.position._d
+        dist, *n = arena_distance(p[0], p[1], p[2])
+        if dist >= self.ground_height:
+            return
+
+        normal = _v3(*n)
+        for i in range(3):
+            p[i] += n[i] * (self.ground_height - dist)
+        vn = dot(self.velocity, normal)
+        if vn < 0:
+            self.velocity -= normal * vn
+
+        # land on the floor, everything else is treated as a simple wall slide
+        if n[2] > 0.9 and not self.on_ground:
+            f = self.forward()
+            if self.dodge_heading is not None:
+                # a dodge lands facing the way it started, however far the flip got
+                heading = self.dodge_heading
+            elif abs(f[2]) < 0.99:
+                heading = normalize(vec3(f[0], f[1], 0))
+            else:
+                heading = normalize(vec3(-self.up()[0], -self.up()[1], 0))
+            self.orientation = euler_to_rotation(vec3(0, math.atan2(heading[1], heading[0]), 0))
+            self.angular_velocity = vec3(0, 0, 0)
+            self.on_ground = True
+            self.jumped = False
+            self.double_jumped = False
+            self.jump_timer = -1.0
+            self.dodge_heading = None
+
+
+class Game:
+    frametime = 0.008333333767950535
+    gravity = -650.0
+    map = 'map_not_set'
+
+    def __init__(self, index: int, team: int):
+        self.id = index
+        self.team = team
+
+        self.ball = Ball()
+        self.cars = [Car() for _ in range(max(8, index + 1))]
+        self.my_car = self.cars[index]
+        self.pads = []
+        self.num_cars = 0
+
+        self.time = 0.0
+        self.time_delta = 0.0
+        self.time_remaining = 0.0
+        self.frame = 0
+        self.frame_delta = 0
+        self.kickoff_pause = False
+        self.match_ended = False
+        self.overtime = False
+        self.round_active = False
+
+        for i, car in enumerate(self.cars):
+            car.id = i
+
+    @staticmethod
+    def set_mode(mode: str):
+        Game.map = mode
+        Field.mode = mode
+
+    def read_game_information(self, packet, field_info):
+        info = packet.game_info
+        self.time_delta = info.seconds_elapsed - self.time
+        self.time = info.seconds_elapsed
+        self.time_remaining = info.game_time_remaining
+        self.kickoff_pause = info.is_kickoff_pause
+        self.match_ended = info.is_match_ended
+        self.overtime = info.is_overtime
+        self.round_active = info.is_round_active
+        self.frame += 1
+        self.frame_delta = 1
+
+        self.num_cars = packet.num_cars
+        while len(self.cars) < self.num_cars:
+            car = Car()
+            car.id = len(self.cars)
+            self.cars.append(car)
+
+        for i in range(self.num_cars):
+            game_car = packet.game_cars[i]
+            car = self.cars[i]
+            _read_physics(game_car.physics, car)
+            rotation = game_car.physics.rotation
+            car.rotator = vec3(rotation.pitch, rotation.yaw, rotation.roll)
+            car.orientation = euler_to_rotation(car.rotator)
+            car.boost = game_car.boost
+            car.team = game_car.team
+            car.on_ground = game_car.has_wheel_contact
+            car.jumped = game_car.jumped
+            car.double_jumped = game_car.double_jumped
+            car.supersonic = game_car.is_super_sonic
+            car.time = self.time
+
+        _read_physics(packet.game_ball.physics, self.ball)
+        self.ball.time = self.time
+
+        num_pads = field_info.num_boosts
+        while len(self.pads) < num_pads:
+            self.pads.append(Pad())
+        for i in range(num_pads):
+            pad = self.pads[i]
+            location = field_info.boost_pads[i].location
+            pad.position = vec3(location.x, location.y, location.z)
+            pad.is_full_boost = field_info.boost_pads[i].is_full_boost
+            pad.is_active = packet.game_boosts[i].is_active
+            pad.timer = packet.game_boosts[i].timer
+
+
+def _read_physics(physics, target):
+    '''Copy an rlbot Physics struct into an existing Car or Ball, keeping the vec3 objects in place.'''
+    for source, destination in (
+        (physics.location, target.position),
+        (physics.velocity, target.velocity),
+        (physics.angular_velocity, target.angular_velocity),
+    ):
+        d = destination._d
+        d[0], d[1], d[2] = source.x, source.y, source.z
@@ -0,0 +1,221 @@
+'''
+Shot candidates evaluated ahead of time by a small pool of worker processes that stays up for the whole match.
+
+Offense hands the engine the candidates it may need, then evaluates the ones it needs for sure in its own thread
+while the workers are busy with the rest. The ball prediction is published once per decision into shared memory
+(a multiprocessing.RawArray the workers inherit when the pool starts), in one of two slots that take turns,
+so the workers copy it from there instead of getting it pickled with every task.
+
+All the work of a tick shares one deadline, set by start_tick: workers skip the tasks that are already late
+when they get to them, and a result that isn't in by the deadline is dropped. The candidate is then evaluated
+in the calling thread, just like without an engine, so the engine changes how long a decision takes, not
+which one it is.
+'''
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Car, Ball
+
+from maneuvers.strikes.dodge_shot import DodgeShot
+from maneuvers.strikes.ground_shot import GroundShot
+from maneuvers.strikes.shot_candidate import ShotCandidate
+from maneuvers.strikes.strike import Strike
+from maneuvers.strikes.wall_dodge_shot import WallDodgeShot
+from maneuvers.strikes.wall_shot import WallShot
+from tools.simulation import car_state, car_from_state
+from utils.game_info import GameInfo
+from utils.intercept import Intercept, ReachableSlices
+
+# the strikes a worker can look for, by name. Aerials find an AerialIntercept, they are always evaluated here
+SHOT_TYPES = {shot_type.__name__: shot_type for shot_type in (DodgeShot, GroundShot, WallShot, WallDodgeShot)}
+
+# time, position, velocity, angular velocity
+BALL_FIELDS = 10
+
+# per slot: generation, number of slices
+HEADER = 4
+
+
+def _snapshot_arrays(shared, capacity: int):
+    '''(header, slots) views of the shared array, the header holds (generation, number of slices) per slot.'''
+    values = np.frombuffer(shared, dtype=np.float64)
+    return values[:HEADER].reshape(2, 2), values[HEADER:].reshape(2, capacity, BALL_FIELDS)
+
+
+# worker process state: the shared snapshot and the last prediction read from it
+_header = _slots = None
+_info: GameInfo = None
+_info_generation = -1
+_reachable: Tuple[tuple, ReachableSlices] = ((), None)
+
+
+def _attach(shared, capacity: int):
+    global _header, _slots, _info
+    _header, _slots = _snapshot_arrays(shared, capacity)
+    _info = GameInfo(0, 0)
+
+
+def _read_prediction(slot: int, generation: int) -> bool:
+    '''Load the prediction of `generation` into the worker's GameInfo, False if it was overwritten already.'''
+    global _info_generation
+    if _info_generation == generation:
+        return True
+    if _header[slot, 0] != generation:
+        return False
+    rows = np.array(_slots[slot, :int(_header[slot, 1])])
+    # the slot may have been rewritten while we copied it
+    if _header[slot, 0] != generation:
+        return False
+
+    balls = []
+    for row in rows.tolist():
+        ball = Ball()
+        ball.time = row[0]
+        ball.position = vec3(*row[1:4])
+        ball.velocity = vec3(*row[4:7])
+        ball.angular_velocity = vec3(*row[7:10])
+        balls.append(ball)
+    _info.ball_predictions = balls
+    _info.ball = balls[0] if balls else Ball()
+    _info_generation = generation
+    return True
+
+
+def _evaluate(slot: int, generation: int, deadline: float, state: tuple, shot_type: str,
+              target: Tuple[float, float, float]) -> Optional[Tuple[int, bool, bool]]:
+    '''
+    Find the intercept of one shot candidate in a worker.
+    Returns the index of its ball slice, whether it is viable and whether it is backwards,
+    or None if the task is late or its prediction is gone.
+    '''
+    global _reachable
+    if time.monotonic() > deadline or not _read_prediction(slot, generation):
+        return None
+
+    # the candidates of a decision share the car state, and so the reachable slices
+    key = (generation, state)
+    if _reachable[0] != key:
+        car = car_from_state(state)
+        _reachable = (key, ReachableSlices(car, _info.ball_predictions))
+    reachable = _reachable[1]
+
+    candidate = ShotCandidate(SHOT_TYPES[shot_type], reachable.car, _info, vec3(*target), reachable)
+    intercept = candidate.intercept
+    index = next((i for i, ball in enumerate(_info.ball_predictions) if ball is intercept.ball), -1)
+    return index, bool(intercept.is_viable), bool(intercept.backwards)
+
+
+def _ready() -> bool:
+    return True
+
+
+class CandidateBatch:
+    '''
+    The candidates of one car state and target that a decision may look at. Those handed to the workers are taken
+    from them when they are in by the deadline, all the others are evaluated in the calling thread when asked for.
+    '''
+
+    def __init__(self, car: Car, info: GameInfo, target: vec3, reachable: ReachableSlices = None,
+                 futures: Dict[Type[Strike], Future] = None, deadline: float = 0.0):
+        self.car = car
+        self.info = info
+        self.target = target
+        self.reachable = reachable
+        self.futures = futures or {}
+        self.deadline = deadline
+        self.candidates: Dict[Type[Strike], ShotCandidate] = {}
+
+    def get(self, shot_type: Type[Strike]) -> ShotCandidate:
+        if shot_type not in self.candidates:
+            candidate = self._from_worker(shot_type)
+            if candidate is None:
+                if self.reachable is None:
+                    self.reachable = ReachableSlices(self.car, self.info.ball_predictions)
+                candidate = ShotCandidate(shot_type, self.car, self.info, self.target, self.reachable)
+            self.candidates[shot_type] = candidate
+        return self.candidates[shot_type]
+
+    def _from_worker(self, shot_type: Type[Strike]) -> Optional[ShotCandidate]:
+        future = self.futures.pop(shot_type, None)
+        if future is None:
+            return None
+        wait([future], timeout=max(self.deadline - time.monotonic(), 0))
+        if not future.done():
+            future.cancel()
+            return None
+        result = None if future.cancelled() or future.exception() is not None else future.result()
+        if result is None or result[0] < 0:
+            return None
+        index, is_viable, backwards = result
+        intercept = Intercept.at(self.info.ball_predictions[index], is_viable, backwards)
+        return ShotCandidate(shot_type, self.car, self.info, self.target, intercept=intercept)
+
+
+class CandidateEngine:
+
+    # seconds per tick the workers' results are waited for, at most
+    BUDGET = 0.004
+
+    def __init__(self, workers: int = 2, capacity: int = 1024):
+        self.capacity = capacity
+        shared = multiprocessing.RawArray('d', HEADER + 2 * capacity * BALL_FIELDS)
+        self._header, self._slots = _snapshot_arrays(shared, capacity)
+        self._header[:] = -1
+        self._generation = -1
+        self._published = (None, 0)
+        self._pending: List[Future] = []
+        self.deadline = 0.0
+
+        self._pool = ProcessPoolExecutor(workers, initializer=_attach, initargs=(shared, capacity))
+        # start the workers now, not on the first decision
+        wait([self._pool.submit(_ready) for _ in range(workers)])
+
+    def start_tick(self):
+        '''Start the budget of a new tick, the tasks of the previous ones that no worker got to are dropped.'''
+        self.deadline = time.monotonic() + self.BUDGET
+        for future in self._pending:
+            future.cancel()
+        self._pending = []
+
+    def _publish(self, ball_predictions: List[Ball]) -> Tuple[int, int]:
+        '''Write the prediction into the next slot, unless it is the one published last. Returns (slot, generation).'''
+        predictions, length = self._published
+        if predictions is not ball_predictions or length != len(ball_predictions):
+            self._generation += 1
+            slot = self._generation % 2
+            self._header[slot, 0] = -1
+            self._slots[slot, :len(ball_predictions)] = [
+                (ball.time, *ball.position, *ball.velocity, *ball.angular_velocity) for ball in ball_predictions
+            ]
+            self._header[slot, 1] = len(ball_predictions)
+            self._header[slot, 0] = self._generation
+            self._published = (ball_predictions, len(ball_predictions))
+        return self._generation % 2, self._generation
+
+    def submit(self, car: Car, info: GameInfo, target: vec3, shot_types: Sequence[Type[Strike]],
+               reachable: ReachableSlices = None) -> CandidateBatch:
+        '''Hand the candidates of the shot types to the workers, if there is time left in this tick for them.'''
+        balls = info.ball_predictions
+        shot_types = [shot_type for shot_type in shot_types if shot_type.__name__ in SHOT_TYPES]
+        if not shot_types or not 0 < len(balls) <= self.capacity or time.monotonic() >= self.deadline:
+            return CandidateBatch(car, info, target, reachable)
+
+        slot, generation = self._publish(balls)
+        state = car_state(car)
+        futures = {
+            shot_type: self._pool.submit(
+                _evaluate, slot, generation, self.deadline, state, shot_type.__name__, tuple(target)
+            ) for shot_type in shot_types
+        }
+        self._pending += futures.values()
+        return CandidateBatch(car, info, target, reachable, futures, self.deadline)
+
+    def close(self):
+        for future in self._pending:
+            future.cancel()
+        self._pool.shutdown(wait=False)
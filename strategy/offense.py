@@ -1,4 +1,7 @@
 
+import math
+from typing import Dict
+
 from utils.game_info import GameInfo
 from rlutilities.linear_algebra import *
 from rlutilities.simulation import Car, Ball
@@ -6,7 +9,7 @@ from rlutilities.simulation import Car, Ball
 from utils.vector_math import *
 from utils.math import *
 from utils.misc import *
-from utils.intercept import Intercept, AerialIntercept
+from utils.intercept import Intercept, AerialIntercept, ReachableSlices
 
 
 from maneuvers.kit import Maneuver
@@ -20,32 +23,87 @@ from maneuvers.strikes.close_shot import CloseShot
 from maneuvers.strikes.aerial_shot import AerialShot
 from maneuvers.strikes.wall_shot import WallShot
 from maneuvers.strikes.wall_dodge_shot import WallDodgeShot
+from maneuvers.strikes.shot_candidate import ShotCandidate
 from maneuvers.shadow_defense import ShadowDefense
+from strategy.candidate_engine import CandidateEngine, CandidateBatch
+
+from utils.shot_outcomes import shot_outcomes, ShotOutcome
 
 
 
 
 class Offense:
 
-    def __init__(self, info: GameInfo):
+    # don't build a shot the outcome table expects to be this unlikely to be viable
+    UNLIKELY_VIABLE = 0.2
+    # or to get to the ball this much later than a shot we already have
+    EXPECTED_SLOWER = 0.3
+
+    def __init__(self, info: GameInfo, engine: CandidateEngine = None):
         self.info = info
+        self.outcomes = shot_outcomes()
+        # evaluates the candidates we may need in worker processes, if the agent sets one up
+        self.engine = engine
+
+    def expected_outcomes(self, car: Car, target: vec3) -> Dict[str, ShotOutcome]:
+        '''Expected outcome of each shot type from the offline table, empty if there is none or it can't tell.'''
+        if self.outcomes is None:
+            return {}
+        return self.outcomes.query(car, self.info.ball, target)
+
+    def worth_building(self, expected: Dict[str, ShotOutcome], shot_type: str, time_to_beat=math.inf) -> bool:
+        outcome = expected.get(shot_type)
+        return outcome is None or (
+            outcome.viable >= self.UNLIKELY_VIABLE and outcome.time < time_to_beat + self.EXPECTED_SLOWER
+        )
 
-    def wall_shot(self, car: Car, target: vec3) -> Maneuver:
-        ground_shot = WallShot(car, self.info, target)
-        dodge_shot = WallDodgeShot(car, self.info, target)
+    def speculate(self, car: Car, target: vec3, shot_types, reachable: ReachableSlices = None) -> CandidateBatch:
+        '''
+        The candidates a decision may look at: handed to the engine's workers right away if there is an engine,
+        evaluated in this thread when they are asked for otherwise.
+        '''
+        if self.engine is None:
+            return CandidateBatch(car, self.info, target, reachable)
+        return self.engine.submit(car, self.info, target, shot_types, reachable)
+
+    def wall_shot_candidate(self, car: Car, target: vec3, reachable: ReachableSlices = None,
+                            batch: CandidateBatch = None) -> ShotCandidate:
+        reachable = reachable or ReachableSlices(car, self.info.ball_predictions)
+        batch = batch or self.speculate(car, target, [WallDodgeShot], reachable)
+        ground_shot = batch.get(WallShot)
+        dodge_shot = batch.get(WallDodgeShot)
 
         if dodge_shot.intercept.time < ground_shot.intercept.time - 0.1:
             return dodge_shot
 
         return ground_shot
 
+    def wall_shot(self, car: Car, target: vec3) -> Maneuver:
+        return self.wall_shot_candidate(car, target).materialize()
+
 
-    def direct_shot(self, car: Car, target: vec3) -> Maneuver:
-        dodge_shot = DodgeShot(car, self.info, target)
-        ground_shot = GroundShot(car, self.info, target)
+    def direct_shot_candidate(self, car: Car, target: vec3, reachable: ReachableSlices = None,
+                              expected: Dict[str, ShotOutcome] = None, batch: CandidateBatch = None) -> ShotCandidate:
+        '''`expected` are the outcomes from the table if the caller already has them, queried when needed otherwise'''
+        reachable = reachable or ReachableSlices(car, self.info.ball_predictions)
+        # the workers look for the ground shot while we look for the dodge shot, in case we need it
+        batch = batch or self.speculate(car, target, [GroundShot], reachable)
+        dodge_shot = batch.get(DodgeShot)
 
+        # only build the ground shot when it can make a difference
+        ground_shot = None
         if (
-            dodge_shot.intercept.time < ground_shot.intercept.time - 0.1
+            distance(dodge_shot.intercept.ground_pos, target) >= 4000
+            and self.worth_building(
+                self.expected_outcomes(car, target) if expected is None else expected,
+                'GroundShot', dodge_shot.intercept.time - car.time
+            )
+        ):
+            ground_shot = batch.get(GroundShot)
+
+        if (
+            ground_shot is None
+            or dodge_shot.intercept.time < ground_shot.intercept.time - 0.1
             or distance(dodge_shot.intercept.ground_pos, target) < 4000
             or distance(ground_shot.intercept.ball.velocity, car.velocity) < 500
         ):
@@ -53,19 +111,35 @@ class Offense:
                 distance(dodge_shot.intercept.ground_pos, target) < 4000
                 and abs(dodge_shot.intercept.ground_pos[0]) < 3000
             ):
-                return CloseShot(car, self.info, target)
+                # a close shot looks for the same intercepts as a dodge shot
+                return ShotCandidate(CloseShot, car, self.info, target, intercept=dodge_shot.intercept)
             return dodge_shot
         return ground_shot
 
+    def direct_shot(self, car: Car, target: vec3) -> Maneuver:
+        return self.direct_shot_candidate(car, target).materialize()
+
  
     def high_shot(self, car: Car, target: vec3) -> Maneuver:
-        direct_shot = self.direct_shot(car, target)
-
-        wall_shot = self.wall_shot(car, target)
-        if wall_shot.intercept.is_viable and wall_shot.intercept.time < direct_shot.intercept.time:
-            return wall_shot
-
-        aerial = AerialShot(car, self.info, target)
+        reachable = ReachableSlices(car, self.info.ball_predictions)
+        expected = self.expected_outcomes(car, target)
+        batch = self.speculate(car, target, [
+            shot_type for shot_type, name in (
+                (GroundShot, 'GroundShot'), (WallShot, 'WallShot'), (WallDodgeShot, 'WallShot')
+            ) if self.worth_building(expected, name)
+        ], reachable)
+        direct_shot = self.direct_shot_candidate(car, target, reachable, expected, batch)
+        direct_time = direct_shot.intercept.time - car.time
+
+        if self.worth_building(expected, 'WallShot', direct_time):
+            wall_shot = self.wall_shot_candidate(car, target, reachable, batch)
+            if wall_shot.intercept.is_viable and wall_shot.intercept.time < direct_shot.intercept.time:
+                return wall_shot.materialize()
+
+        if not self.worth_building(expected, 'AerialShot', direct_time):
+            return direct_shot.materialize()
+
+        aerial = ShotCandidate(AerialShot, car, self.info, target)
         if (
             aerial.intercept.is_viable
             and car.boost > aerial.intercept.ball.position[2] / 50 + 5
@@ -73,9 +147,9 @@ class Offense:
             and not self.info.about_to_score
             and abs(aerial.intercept.ball.position[1] - target[1]) > 2000
         ):
-            return aerial
+            return aerial.materialize()
 
-        return direct_shot
+        return direct_shot.materialize()
         
 
     def any_shot(self, car: Car, target: vec3, intercept: Intercept) -> Maneuver:
@@ -0,0 +1,350 @@
+'''
+An anytime Monte Carlo planner on top of SoccarStrategy's rules.
+
+The rules' choice and a few alternatives (shadowing, grabbing boost, a clear into a corner, the best shot)
+are each described by when and where they touch the ball and where they leave our car. Rollouts then sample
+how the first touch goes: our hit is aimed at the maneuver's target with some error, the opponents commit
+to their intercepts with a probability given by how much they are chasing the ball, and hit it like in
+TouchEnsemble. All rollouts of all candidates are stepped together in one BallBatch, and the states they end in
+are scored by goals, field position and who is closer to the ball.
+
+The alternatives are built one at a time, then rounds of rollouts go on until the time budget of the tick runs out,
+the candidates that are clearly worse are dropped between rounds, and the best one found so far is returned.
+Building the alternatives and stepping a round both check the budget as they go, and what doesn't fit is carried over
+to the next ticks: while the chosen maneuver runs, the planning goes on for a short while within the same budget
+per tick, and switches to a better candidate if the rollouts find one.
+'''
+import math
+import time
+from typing import Callable, Generator, List
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Ball
+
+from maneuvers.kit import Maneuver
+from maneuvers.kickoffs.kickoff import Kickoff
+from maneuvers.air.fast_recovery import FastRecovery
+from maneuvers.driving.stop import Stop
+from maneuvers.dribbling.dribble import Dribble
+from maneuvers.strikes.strike import Strike
+from maneuvers.refuel import Refuel
+from maneuvers.shadow_defense import ShadowDefense
+from strategy.soccar_strategy import SoccarStrategy
+from tools.drawing import DrawingTool
+from utils.arena import Arena
+from utils.ball_batch import BallBatch
+from utils.game_info import GameInfo
+from utils.intercept import Intercept
+from utils.touch_ensemble import TouchEnsemble
+from utils.vector_math import to_array, to_vec3, ground
+
+
+class RolloutCandidate:
+    '''A candidate maneuver, described by what the rollouts need, and the scores of its rollouts so far.'''
+
+    def __init__(self, maneuver: Maneuver, touch_time: float, touch_position: np.ndarray, aim: np.ndarray,
+                 end_position: np.ndarray, boost_gain: float = 0):
+        self.maneuver = maneuver
+        self.name = type(maneuver).__name__
+        self.touch_time = touch_time  # inf if the maneuver doesn't go for the ball
+        self.touch_position = touch_position
+        self.aim = aim  # where the hit goes
+        self.end_position = end_position  # where our car is left
+        self.boost_gain = boost_gain
+        self.scores: List[np.ndarray] = []
+
+    @property
+    def key(self):
+        '''Candidates with the same key would get the same rollouts.'''
+        return self.name, self.touch_time, tuple(np.round(self.aim)), tuple(np.round(self.end_position))
+
+    @property
+    def count(self) -> int:
+        return sum(len(scores) for scores in self.scores)
+
+    @property
+    def mean(self) -> float:
+        return float(np.mean(np.concatenate(self.scores))) if self.scores else -math.inf
+
+    @property
+    def error(self) -> float:
+        '''Standard error of the mean score.'''
+        if self.count < 2:
+            return math.inf
+        return float(np.std(np.concatenate(self.scores)) / math.sqrt(self.count))
+
+
+class RolloutStrategy(SoccarStrategy):
+
+    # seconds of planning per tick, on top of the rules' own decision: building the alternatives and the rollouts
+    BUDGET = 0.004
+    # seconds after a decision that the planning goes on and can still switch maneuvers
+    PLANNING_WINDOW = 0.3
+    ROLLOUTS_PER_ROUND = 32
+    MAX_ROLLOUTS = 256
+    DT = 1 / 10
+
+    # touches later than this aren't simulated, and the ball is followed this long after them
+    MAX_TOUCH_TIME = 4.0
+    AFTER_TOUCH = 2.0
+
+    # our hits
+    HIT_ANGLE_SPREAD = math.radians(15)
+    HIT_STRENGTH = (1200, 2200)
+    HIT_LIFT = 400
+    # how much an opponent's touch time is off from their intercept
+    OPPONENT_TIME_SPREAD = 0.3
+
+    # end state scores
+    GOAL_VALUE = 1.0
+    FIELD_POSITION_VALUE = 0.3
+    POSSESSION_VALUE = 0.2
+    POSSESSION_DISTANCE = 2000
+    BOOST_VALUE = 0.1
+
+    # candidates whose mean is this many standard errors below the best one are dropped
+    CONFIDENCE = 2.0
+
+    def __init__(self, info: GameInfo, drawing_tool: DrawingTool, budget: float = None, seed: int = None):
+        super().__init__(info, drawing_tool)
+        self.budget = self.BUDGET if budget is None else budget
+        self.rng = np.random.default_rng(seed)
+        self.candidates: List[RolloutCandidate] = []
+        # the candidates still in the running, and the one whose maneuver runs
+        self.active: List[RolloutCandidate] = []
+        self.chosen: RolloutCandidate = None
+        # our intercept at the decision, and the alternatives to the rules' choice that are still to be built
+        self.my_hit: Intercept = None
+        self.pending: List[Callable[[], Maneuver]] = []
+        # the round of rollouts in progress and its candidates, None between rounds
+        self.round: Generator[None, None, List[np.ndarray]] = None
+        self.round_candidates: List[RolloutCandidate] = []
+        # the game time of the decision, and the opponents predicted then, the rollouts all start from there
+        self.decision_time = 0.0
+        self.opponent_prediction = None
+        # (opponent, intercept, chase weight, hit velocities, hit weights) of the opponents that can touch the ball
+        self.opponent_touches = []
+
+    def choose_maneuver(self) -> Maneuver:
+        rule = super().choose_maneuver()
+        deadline = time.perf_counter() + self.budget
+        self.round = None
+
+        # situations the rollouts don't model
+        if not self.info.my_car.on_ground or isinstance(rule, (Kickoff, FastRecovery, Stop)):
+            self.candidates, self.active, self.chosen, self.pending = [], [], None, []
+            return rule
+
+        self.decision_time = self.info.time
+        self.opponent_prediction = self.info.predict_opponents() if len(self.info.opponents) else None
+        self.opponent_touches = self.predict_opponent_touches()
+        self.my_hit = Intercept(self.info.my_car, self.info.ball_predictions)
+        self.candidates, self.active = [], []
+        self.add_candidate(rule)
+        self.pending = self.alternatives()
+        self.chosen = self.plan(deadline)
+        self.render_candidates()
+        return self.chosen.maneuver
+
+    def reconsider(self, maneuver: Maneuver) -> Maneuver:
+        '''Go on with the rollouts of the last decision, and switch to a candidate that turns out better.'''
+        if (
+            self.chosen is None
+            or maneuver is not self.chosen.maneuver
+            or not self.planning
+            or self.info.time > self.decision_time + self.PLANNING_WINDOW
+        ):
+            self.active, self.round, self.pending = [], None, []
+            return maneuver
+
+        best = self.plan(time.perf_counter() + self.budget)
+        if best is not self.chosen and self.info.my_car.on_ground and not maneuver.controls.jump:
+            self.chosen = best
+        self.render_candidates()
+        return self.chosen.maneuver
+
+    def predict_opponent_touches(self):
+        info = self.info
+        hits = self.opponent_intercepts()
+        chase_weights = self.opponent_prediction.chase_weights if hits else []
+        touches = []
+        for (opponent, hit), chase_weight in zip(hits, chase_weights):
+            if hit.is_viable:
+                velocities, weights = TouchEnsemble.branches(opponent, hit.ball, info.my_goal.center[1])
+                touches.append((opponent, hit, chase_weight, velocities, weights / weights.sum()))
+        return touches
+
+    def alternatives(self) -> List[Callable[[], Maneuver]]:
+        '''Builders of the alternatives to the rules' choice, cheapest first: the shots run intercept searches.'''
+        info = self.info
+        car = info.my_car
+        their_goal = ground(info.their_goal.center)
+        my_hit = self.my_hit
+        their_best_hit, _ = self.earliest_intercept([(opponent, hit) for opponent, hit, *_ in self.opponent_touches])
+
+        builders = [lambda: ShadowDefense(car, info, their_best_hit.ground_pos, 5500)]
+        if car.boost < 50:
+            builders.append(lambda: Refuel(car, info, my_hit.ground_pos))
+        builders += [lambda: self.clear_into_corner(my_hit), lambda: self.offense.any_shot(car, their_goal, my_hit)]
+        return builders
+
+    def add_candidate(self, maneuver: Maneuver):
+        candidate = self.describe(maneuver)
+        if all(c.key != candidate.key for c in self.candidates):
+            self.candidates.append(candidate)
+            self.active.append(candidate)
+
+    def describe(self, maneuver: Maneuver) -> RolloutCandidate:
+        info = self.info
+        my_hit = self.my_hit
+        car_position = to_array(info.my_car.position)
+        their_goal = to_array(info.their_goal.center)
+
+        if isinstance(maneuver, Strike) and maneuver.intercept.is_viable:
+            target = their_goal if maneuver.target is None else to_array(maneuver.target)
+            return RolloutCandidate(maneuver, maneuver.intercept.time, to_array(maneuver.intercept.ball), target,
+                                    to_array(maneuver.intercept.ground_pos))
+        if isinstance(maneuver, Dribble) and my_hit.is_viable:
+            return RolloutCandidate(maneuver, my_hit.time, to_array(my_hit.ball), to_array(maneuver.target),
+                                    to_array(my_hit.ground_pos))
+        if isinstance(maneuver, ShadowDefense):
+            return RolloutCandidate(maneuver, math.inf, car_position, their_goal, to_array(maneuver.target))
+        if isinstance(maneuver, Refuel):
+            return RolloutCandidate(maneuver, math.inf, car_position, their_goal, to_array(maneuver.pad.position),
+                                    min(maneuver.pad.amount, 100 - info.my_car.boost))
+        return RolloutCandidate(maneuver, math.inf, car_position, their_goal, car_position)
+
+    @property
+    def planning(self) -> bool:
+        '''Whether there are alternatives left to build or rollouts left to do for the last decision.'''
+        return bool(self.pending) or self.round is not None or (
+            len(self.active) > 1 and not all(c.count >= self.MAX_ROLLOUTS for c in self.active)
+        )
+
+    def plan(self, deadline: float) -> RolloutCandidate:
+        '''
+        Build the pending alternatives, then step rounds of rollouts of the active candidates until the deadline,
+        the alternatives left and the round in progress are carried over to the next call.
+        Returns the candidate with the best mean score, the rules' choice if no round finished yet.
+        '''
+        while self.pending and time.perf_counter() < deadline:
+            self.add_candidate(self.pending.pop(0)())
+
+        while self.planning and not self.pending and time.perf_counter() < deadline:
+            if self.round is None:
+                self.round_candidates = list(self.active)
+                self.round = self.rollout_round(self.round_candidates, self.ROLLOUTS_PER_ROUND)
+            try:
+                next(self.round)
+                continue
+            except StopIteration as finished:
+                scores = finished.value
+            self.round = None
+            for candidate, candidate_scores in zip(self.round_candidates, scores):
+                candidate.scores.append(candidate_scores)
+
+            best = max(self.active, key=lambda c: c.mean)
+            self.active = [
+                c for c in self.active
+                if c is best or c.mean + self.CONFIDENCE * c.error >= best.mean - self.CONFIDENCE * best.error
+            ]
+
+        evaluated = [c for c in self.candidates if c.scores]
+        return max(evaluated, key=lambda c: c.mean) if evaluated else self.candidates[0]
+
+    def rollout_round(self, candidates: List[RolloutCandidate], count: int) -> Generator[None, None, List[np.ndarray]]:
+        '''`count` new rollouts of each candidate, yields after every step of the ball batch and returns their scores.'''
+        info, rng = self.info, self.rng
+        n = len(candidates) * count
+        now = self.decision_time
+
+        # our touches
+        our_time = np.repeat([c.touch_time for c in candidates], count)
+        touch_position = np.repeat([c.touch_position for c in candidates], count, axis=0)
+        aim = np.repeat([c.aim for c in candidates], count, axis=0)
+        angle = np.arctan2(aim[:, 1] - touch_position[:, 1], aim[:, 0] - touch_position[:, 0])
+        angle += rng.normal(0, self.HIT_ANGLE_SPREAD, n)
+        strength = rng.uniform(*self.HIT_STRENGTH, n)
+        our_hit = np.column_stack([np.cos(angle) * strength, np.sin(angle) * strength,
+                                   rng.uniform(0, self.HIT_LIFT, n)])
+
+        # the first opponent touch, if any opponent commits
+        opponent_time = np.full(n, math.inf)
+        opponent_hit = np.zeros((n, 3))
+        for opponent, hit, chase_weight, velocities, weights in self.opponent_touches:
+            commits = rng.random(n) < 0.5 + 0.5 * chase_weight
+            times = np.where(commits, hit.time + rng.normal(0, self.OPPONENT_TIME_SPREAD, n), math.inf)
+            branches = rng.choice(len(velocities), n, p=weights)
+            first = times < opponent_time
+            opponent_time = np.where(first, times, opponent_time)
+            opponent_hit[first] = velocities[branches[first]] - 0.3 * to_array(hit.ball.velocity)
+
+        ours = our_time <= opponent_time
+        touch_time = np.where(ours, our_time, opponent_time)
+        touch_hit = np.where(ours[:, None], our_hit, opponent_hit)
+        late = now + self.MAX_TOUCH_TIME
+        if info.time_of_goal != -1:
+            late = min(late, info.time_of_goal)
+        touch_time[touch_time > late] = math.inf
+
+        # the ball follows the prediction until the first touch, so start there,
+        # and follow it until a while after the last touch (or the predicted goal)
+        touched = np.isfinite(touch_time)
+        first_touch = touch_time[touched].min(initial=late) if touched.any() else now
+        last_touch = touch_time[touched].max(initial=now)
+        if info.time_of_goal != -1:
+            last_touch = max(last_touch, info.time_of_goal)
+        ball = self.prediction_at(first_touch)
+        batch = BallBatch(np.tile(to_array(ball.position), (n, 1)), np.tile(to_array(ball.velocity), (n, 1)),
+                          np.tile(to_array(ball.angular_velocity), (n, 1)), ball.time)
+        pending = touched
+        while batch.time < last_touch + self.AFTER_TOUCH:
+            due = pending & (touch_time <= batch.time + self.DT / 2)
+            if due.any():
+                batch.velocity[due] = batch.velocity[due] * 0.3 + touch_hit[due]
+                pending &= ~due
+            batch.step(self.DT)
+            yield
+
+        scores = self.score(batch, np.repeat([c.end_position for c in candidates], count, axis=0),
+                            np.repeat([c.boost_gain for c in candidates], count))
+        return np.split(scores, len(candidates))
+
+    def prediction_at(self, time: float) -> Ball:
+        '''The predicted ball slice closest to `time`, the current ball if there is no prediction.'''
+        balls = self.info.ball_predictions
+        if len(balls) < 2:
+            return self.info.ball
+        step = balls[1].time - balls[0].time
+        return balls[min(max(round((time - balls[0].time) / step), 0), len(balls) - 1)]
+
+    def score(self, batch: BallBatch, our_positions: np.ndarray, boost_gains: np.ndarray) -> np.ndarray:
+        info = self.info
+        attack = 1 if info.their_goal.center[1] > 0 else -1
+        goals = batch.goal * attack
+
+        field_position = np.clip(batch.position[:, 1] * attack / Arena.size[1], -1, 1)
+
+        our_distance = np.linalg.norm(batch.position[:, :2] - our_positions[:, :2], axis=1)
+        if self.opponent_prediction is not None:
+            opponents = self.opponent_prediction.at(batch.time)
+            their_distance = np.linalg.norm(batch.position[:, None, :2] - opponents[None, :, :2], axis=2).min(axis=1)
+        else:
+            their_distance = np.full(len(batch), math.inf)
+        possession = np.tanh((their_distance - our_distance) / self.POSSESSION_DISTANCE)
+
+        in_play = goals == 0
+        return (
+            self.GOAL_VALUE * goals
+            + in_play * (self.FIELD_POSITION_VALUE * field_position + self.POSSESSION_VALUE * possession)
+            + self.BOOST_VALUE * boost_gains / 100
+        )
+
+    def render_candidates(self):
+        self.draw.group("rollouts")
+        for candidate in self.candidates:
+            self.draw.color(self.draw.lime if candidate.scores else self.draw.white)
+            text = f"{candidate.name} {candidate.mean:+.2f} ({candidate.count})" if candidate.scores else candidate.name
+            self.draw.string(to_vec3(candidate.end_position) + vec3(0, 0, 100), text)
@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 from rlbot.agents.base_agent import GameTickPacket
 
 from utils.game_info import GameInfo
@@ -9,6 +11,7 @@ from utils.math import *
 from utils.misc import *
 from utils.intercept import Intercept
 from utils.arena import Arena
+from utils.shot_targets import corner_targets, pass_targets
 
 from tools.drawing import DrawingTool
 
@@ -32,6 +35,19 @@ import time
 #This file is a Wintertide-deadline mess and definitely not something you should learn from..
 
 class SoccarStrategy:
+
+    # opponent touches we don't replan for, see anticipated_touch
+    ANTICIPATED_TOUCH_WINDOW = 0.5
+    HARMLESS_TOUCH_THREAT = 0.1
+
+    # don't go for boost when the opponent's next touch is likely to end up in our goal
+    # before we could be back at the ball, a detour over a pad takes about this long
+    REFUEL_MAX_THREAT = 0.3
+    REFUEL_DETOUR = 1.5
+
+    # seconds the opponents can be sooner at a corner or a pass target before we stop clearing to it
+    CONTESTED_CORNER_ADVANTAGE = -1.0
+
     def __init__(self, info: GameInfo, drawing_tool: DrawingTool):
         self.draw = drawing_tool
         self.info = info
@@ -51,12 +67,40 @@ class SoccarStrategy:
 
         return our_score, their_score
 
+    def intercepts(self, cars, max_height=9999) -> List[Tuple[Car, Intercept]]:
+        return [
+            (car, Intercept(car, self.info.ball_predictions, lambda car, ball: ball.position[2] < max_height))
+            for car in cars
+        ]
+
+    def opponent_intercepts(self, max_height=9999) -> List[Tuple[Car, Intercept]]:
+        """
+        Like intercepts, but an opponent whose predicted trajectory (see GameInfo.predict_opponents)
+        meets the ball sooner than estimate_time allows is assumed to get there at that time instead.
+        """
+        info = self.info
+        hits = self.intercepts(info.opponents, max_height)
+        balls = info.ball_predictions
+        if len(balls) < 2:
+            return hits
+
+        step = balls[1].time - balls[0].time
+        for (opponent, hit), contact_time in zip(hits, info.predict_opponents().contact_times()):
+            if contact_time < hit.time:
+                ball = balls[min(max(round((contact_time - balls[0].time) / step), 0), len(balls) - 1)]
+                if ball.position[2] < max_height:
+                    hit.move_to(ball)
+        return hits
+
     def best_intercept(self, cars, max_height=9999) -> Intercept:
+        return self.earliest_intercept(self.intercepts(cars, max_height))
+
+    @staticmethod
+    def earliest_intercept(intercepts: List[Tuple[Car, Intercept]]) -> Intercept:
         best_intercept = None
         best_car = None
 
-        for car in cars:
-            intercept = Intercept(car, self.info.ball_predictions, lambda car, ball: ball.position[2] < max_height)
+        for car, intercept in intercepts:
             if best_intercept is None or intercept.time <= best_intercept.time:
                 best_intercept = intercept
                 best_car = car
@@ -67,6 +111,19 @@ class SoccarStrategy:
 
         return best_intercept, best_car
 
+    def anticipated_touch(self, time: float) -> bool:
+        """Whether an opponent touch at `time` was foreseen by the last decision as harmless."""
+        ensemble = self.info.touch_ensemble
+        return (
+            ensemble is not None
+            and abs(time - ensemble.touch_time) < self.ANTICIPATED_TOUCH_WINDOW
+            and ensemble.scored_on_probability < self.HARMLESS_TOUCH_THREAT
+        )
+
+    def reconsider(self, maneuver: Maneuver) -> Maneuver:
+        '''Called on every tick `maneuver` keeps running after it was chosen, returns the maneuver to run instead.'''
+        return maneuver
+
     def when_airborne(self) -> Maneuver:
         # double_tap = self.offense.double_tap(self.info.my_car, self.info.their_goal.center)
         # if double_tap is not None:
@@ -76,13 +133,16 @@ class SoccarStrategy:
     def clear_into_corner(self, my_hit: Intercept) -> DodgeShot:
         car = self.info.my_car
         my_goal = self.info.my_goal.center
-        corners = [my_goal + vec3(Arena.size[0], 0, 0), my_goal - vec3(Arena.size[0], 0, 0)]
-        corner = Strike.pick_easiest_target(car, my_hit.ball, corners)
-        corner[1] *= 0.8
-        if abs(corner[1]) > abs(car.position[1]):
-            corner[1] = car.position[1]
+        corners = corner_targets(my_goal)
+        for corner in corners:
+            if abs(corner[1]) > abs(car.position[1]):
+                corner[1] = car.position[1]
+        targets = corners + pass_targets(my_hit.ball.position, self.info.teammates, my_goal)
+        # don't clear towards a spot the opponents get to long before us
+        advantage = self.info.static_reach.advantage(to_array(targets))
+        targets = [t for t, adv in zip(targets, advantage) if adv > self.CONTESTED_CORNER_ADVANTAGE] or targets
 
-        return DodgeShot(car, self.info, corner)
+        return DodgeShot(car, self.info, Strike.pick_easiest_target(car, my_hit.ball, targets))
 
     def choose_maneuver(self):
         info = self.info
@@ -98,7 +158,10 @@ class SoccarStrategy:
 
         
         my_hit = Intercept(car, info.ball_predictions)
-        their_best_hit, opponent = self.best_intercept(info.opponents, 500)
+        their_hits = self.opponent_intercepts(500)
+        their_best_hit, opponent = self.earliest_intercept(their_hits)
+        info.predict_touches([(hitter, hit.ball) for hitter, hit in their_hits if hit.is_viable])
+        safe_to_refuel = info.touch_threat_at(my_hit.time + self.REFUEL_DETOUR) < self.REFUEL_MAX_THREAT
         
         self.draw.group("intersects")
         self.draw.color(self.draw.cyan)
@@ -237,10 +300,11 @@ class SoccarStrategy:
                         return strike
 
             if distance(their_best_hit.ball, my_goal) > 7000 and \
-                (distance(their_best_hit, opponent) > 3000 or align(opponent.position, their_best_hit.ball, my_goal) < 0) and car.boost < 30:
+                (distance(their_best_hit, opponent) > 3000 or align(opponent.position, their_best_hit.ball, my_goal) < 0) and car.boost < 30 \
+                and safe_to_refuel:
                 return Refuel(car, info, my_hit.ground_pos)
 
-            if car.boost < 35 and distance(their_best_hit, opponent) > 3000:
+            if car.boost < 35 and distance(their_best_hit, opponent) > 3000 and safe_to_refuel:
                 refuel = Refuel(car, info, my_hit.ground_pos)
                 if estimate_time(car, refuel.pad.position, 1400) < 1.5:
                     return refuel
@@ -253,7 +317,7 @@ class SoccarStrategy:
             if should_commit:
                 return offense.any_shot(car, their_goal, my_hit)
 
-            if car.boost < 50:
+            if car.boost < 50 and safe_to_refuel:
                 return Refuel(car, info, my_goal)
 
         shadow_distance = 5500
@@ -0,0 +1,46 @@
+'''
+Building, caching and querying utils.arena_sdf.ArenaSDF.
+
+Run from the repository root:
+    python -m pytest tests
+'''
+import os
+
+import numpy as np
+import pytest
+
+from utils import arena_sdf
+from utils.arena import arena_distance_many
+from utils.arena_sdf import ArenaSDF
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(arena_sdf, 'CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_load_builds_and_caches(cache_dir):
+    field = ArenaSDF.load()
+    assert os.path.exists(ArenaSDF.cache_path())
+    # only the cache file is left behind, no temporary ones
+    assert os.listdir(cache_dir) == [os.path.basename(ArenaSDF.cache_path())]
+    assert isinstance(ArenaSDF.load().grid, np.memmap)
+    assert field.grid.shape[:3] == ArenaSDF.grid_shape()
+
+
+def test_load_replaces_a_stale_cache(cache_dir):
+    np.save(ArenaSDF.cache_path(), np.zeros((2, 2, 2, 4), dtype=np.float32))
+    field = ArenaSDF.load()
+    assert field.grid.shape[:3] == ArenaSDF.grid_shape()
+    assert np.load(ArenaSDF.cache_path(), mmap_mode='r').shape[:3] == ArenaSDF.grid_shape()
+
+
+def test_distance_matches_the_analytic_arena(cache_dir):
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.uniform(-3800, 3800, 500), rng.uniform(-4800, 4800, 500), rng.uniform(50, 1900, 500)])
+    expected, _ = arena_distance_many(points)
+    # outside the arena the grid is floored to one cell
+    inside = expected > 0
+    # trilinear interpolation rounds off the fillets and the corners between cells
+    assert np.abs(ArenaSDF.load().distance(points[inside]) - expected[inside]).max() < 20
@@ -0,0 +1,125 @@
+'''
+BallBatch against analytic ball trajectories, against the bot's own ball prediction (GameInfo.predict_ball),
+and against the native RLUtilities ball when it can be loaded.
+
+Run from the repository root:
+    python -m pytest tests
+'''
+import importlib
+import math
+import random
+
+import numpy as np
+import pytest
+
+from rlutilities import NATIVE
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Ball, Game
+
+from utils.ball_batch import BallBatch
+from utils.game_info import GameInfo
+
+DT = 1 / 120
+
+
+def free_flight(p0: np.ndarray, v0: np.ndarray, t: float) -> np.ndarray:
+    '''Exact position under gravity and linear drag (dv/dt = drag * v + g).'''
+    k = Ball.drag
+    g = np.array([0, 0, Game.gravity])
+    return p0 + (v0 + g / k) * (math.exp(k * t) - 1) / k - g * t / k
+
+
+def test_free_flight_matches_analytic_trajectory():
+    rng = np.random.default_rng(0)
+    positions = np.column_stack([rng.uniform(-2000, 2000, 50), rng.uniform(-3000, 3000, 50), np.full(50, 1000.0)])
+    velocities = np.column_stack([rng.uniform(-800, 800, 50), rng.uniform(-800, 800, 50), rng.uniform(0, 500, 50)])
+    batch = BallBatch(positions, velocities)
+
+    steps = int(0.8 / DT)
+    for _ in range(steps):
+        batch.step(DT)
+
+    errors = np.linalg.norm(batch.position - free_flight(positions, velocities, steps * DT), axis=1)
+    # semi-implicit Euler at 120 Hz is a few uu off after 0.8 s
+    assert errors.max() < 5
+
+
+def test_floor_bounce_keeps_restitution():
+    batch = BallBatch([[0, 0, 500]], [[0, 0, 0]])
+    impact_speed = 0.0
+    for _ in range(int(1.5 / DT)):
+        impact_speed = max(impact_speed, -batch.velocity[0, 2])
+        batch.step(DT)
+        if batch.velocity[0, 2] > 0:
+            break
+    rebound = batch.velocity[0, 2]
+    assert rebound == pytest.approx(Ball.restitution * impact_speed, rel=0.05)
+    # a ball without spin bounces straight up
+    assert np.abs(batch.velocity[0, :2]).max() < 1e-6
+
+
+def test_goal_detection():
+    batch = BallBatch([[0, 4500, 300], [0, -4500, 300], [3000, 4500, 300]],
+                      [[0, 2000, 0], [0, -2000, 0], [0, 2000, 0]])
+    batch.simulate(int(1.5 / DT), DT)
+    assert list(batch.goal) == [1, -1, 0]
+
+
+def random_balls(count: int, seed: int):
+    '''Balls anywhere in the arena, fast and spinning, so that most of them bounce off walls, corners and fillets.'''
+    rng = random.Random(seed)
+    balls = []
+    for _ in range(count):
+        ball = Ball()
+        ball.position = vec3(rng.uniform(-3900, 3900), rng.uniform(-4900, 4900), rng.uniform(100, 1900))
+        ball.velocity = vec3(rng.uniform(-2500, 2500), rng.uniform(-2500, 2500), rng.uniform(-1000, 1000))
+        ball.angular_velocity = vec3(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5))
+        balls.append(ball)
+    return balls
+
+
+@pytest.mark.skipif(NATIVE, reason="the native predictor is compared in test_matches_native_predictor")
+def test_matches_predict_ball():
+    '''The fallback predictor runs the same bounce model one ball at a time, the two only differ by rounding.'''
+    balls = random_balls(100, seed=1)
+    steps = int(3.0 / DT)
+    _, positions, _ = BallBatch.from_balls(balls).simulate(steps, DT)
+
+    info = GameInfo(0, 0)
+    for i, ball in enumerate(balls):
+        info.ball = ball
+        info.predict_ball(steps, DT)
+        predicted = np.array([list(prediction.position) for prediction in info.ball_predictions])
+        assert np.linalg.norm(predicted - positions[:, i], axis=1).max() < 1e-6
+
+
+def native_simulation():
+    try:
+        return importlib.import_module("rlutilities.rlutilities").simulation
+    except ImportError:
+        return None
+
+
+@pytest.mark.skipif(native_simulation() is None, reason="the native RLUtilities module can't be loaded here")
+def test_matches_native_predictor():
+    sim = native_simulation()
+    linear_algebra = importlib.import_module("rlutilities.rlutilities").linear_algebra
+    rng = random.Random(0)
+    balls = []
+    for _ in range(100):
+        ball = sim.Ball()
+        ball.position = linear_algebra.vec3(rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), rng.uniform(100, 1800))
+        ball.velocity = linear_algebra.vec3(rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), rng.uniform(-1000, 1000))
+        balls.append(ball)
+
+    batch = BallBatch([list(ball.position) for ball in balls], [list(ball.velocity) for ball in balls])
+    steps = int(1.0 / DT)
+    for _ in range(steps):
+        batch.step(DT)
+        for ball in balls:
+            ball.step(DT)
+
+    errors = np.linalg.norm(batch.position - np.array([list(ball.position) for ball in balls]), axis=1)
+    # the fallback arena model only approximates the real collision mesh near the walls and in the corners
+    assert np.median(errors) < 10
+    assert np.percentile(errors, 90) < 100
@@ -0,0 +1,92 @@
+'''
+The batched *_many helpers of utils.vector_math and utils.misc against their scalar versions.
+
+Run from the repository root:
+    python -m pytest tests
+'''
+import random
+
+import numpy as np
+import pytest
+
+from rlutilities.linear_algebra import vec3, look_at
+from rlutilities.simulation import Car, Ball
+
+from utils.vector_math import distance, ground_distance, direction, ground_direction, local, to_array, to_vec3s, \
+    distance_many, ground_distance_many, direction_many, ground_direction_many, local_many, nearest_index
+from utils.misc import align, estimate_time, estimate_max_car_speed, nearest_point, align_many, estimate_time_many
+
+GOAL = vec3(0, 5120, 320)
+
+
+def random_point(rng: random.Random) -> vec3:
+    return vec3(rng.uniform(-4000, 4000), rng.uniform(-5000, 5000), rng.uniform(17, 1500))
+
+
+@pytest.fixture(params=range(5))
+def scene(request):
+    '''A car, a ball and 200 points, all random.'''
+    rng = random.Random(request.param)
+    car = Car()
+    car.position = random_point(rng)
+    car.velocity = vec3(rng.uniform(-1500, 1500), rng.uniform(-1500, 1500), 0)
+    car.orientation = look_at(vec3(rng.uniform(-1, 1), rng.uniform(-1, 1), 0), vec3(0, 0, 1))
+    car.boost = rng.uniform(0, 100)
+    ball = Ball()
+    ball.position = random_point(rng)
+    points = [random_point(rng) for _ in range(200)]
+    return car, ball, points
+
+
+COMPARISONS = {
+    "distance": (
+        lambda car, ball, points: [distance(car, p) for p in points],
+        lambda car, ball, array: distance_many(car, array),
+    ),
+    "ground_distance": (
+        lambda car, ball, points: [ground_distance(car, p) for p in points],
+        lambda car, ball, array: ground_distance_many(car, array),
+    ),
+    "direction": (
+        lambda car, ball, points: [list(direction(car, p)) for p in points],
+        lambda car, ball, array: direction_many(car, array),
+    ),
+    "ground_direction": (
+        lambda car, ball, points: [list(ground_direction(p, ball)) for p in points],
+        lambda car, ball, array: ground_direction_many(array, ball),
+    ),
+    "local": (
+        lambda car, ball, points: [list(local(car, p)) for p in points],
+        lambda car, ball, array: local_many(car, array),
+    ),
+    "align": (
+        lambda car, ball, points: [align(p, ball, GOAL) for p in points],
+        lambda car, ball, array: align_many(array, ball, GOAL),
+    ),
+    "estimate_time": (
+        lambda car, ball, points: [estimate_time(car, p, estimate_max_car_speed(car)) for p in points],
+        lambda car, ball, array: estimate_time_many(car, array, estimate_max_car_speed(car)),
+    ),
+    "estimate_time backwards": (
+        lambda car, ball, points: [estimate_time(car, p, 1000, -1) for p in points],
+        lambda car, ball, array: estimate_time_many(car, array, 1000, -1),
+    ),
+    "nearest": (
+        lambda car, ball, points: points.index(nearest_point(ball.position, points)),
+        lambda car, ball, array: nearest_index(ball.position, array),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(COMPARISONS))
+def test_batched_matches_scalar(scene, name):
+    car, ball, points = scene
+    scalar, batched = COMPARISONS[name]
+    expected = np.array(scalar(car, ball, points), dtype=float)
+    np.testing.assert_allclose(batched(car, ball, to_array(points)), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_vec3_round_trip(scene):
+    _, _, points = scene
+    array = to_array(points)
+    assert np.array_equal(to_array(to_vec3s(array)), array)
@@ -0,0 +1,73 @@
+'''
+CandidateEngine's workers against evaluating the candidates in the bot's thread: the intercepts, and so the
+decisions of Offense, have to be the same whether the results come from the workers or are evaluated here.
+
+Run from the repository root:
+    python -m pytest tests
+'''
+import random
+
+import pytest
+
+from rlutilities.linear_algebra import vec3
+
+from strategy.candidate_engine import CandidateEngine, SHOT_TYPES
+from strategy.offense import Offense
+from maneuvers.strikes.shot_candidate import ShotCandidate
+from tools.simulation import random_configuration, predicted_info
+
+TARGET = vec3(0, 5120, 320)
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = CandidateEngine(workers=1)
+    yield engine
+    engine.close()
+
+
+def configurations(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        car, ball = random_configuration(rng)
+        yield car, predicted_info(ball, 360, 1 / 60)
+
+
+def same_intercept(a, b) -> bool:
+    return a.ball is b.ball and a.is_viable == b.is_viable and a.backwards == b.backwards
+
+
+def test_workers_match_in_thread(engine):
+    engine.BUDGET = 10.0
+    for car, info in configurations(10):
+        engine.start_tick()
+        batch = engine.submit(car, info, TARGET, list(SHOT_TYPES.values()))
+        futures = dict(batch.futures)
+        assert set(futures) == set(SHOT_TYPES.values())
+        for shot_type in SHOT_TYPES.values():
+            expected = ShotCandidate(shot_type, car, info, TARGET).intercept
+            assert same_intercept(batch.get(shot_type).intercept, expected)
+        # all of them came from the worker
+        assert all(future.result() is not None for future in futures.values())
+
+
+def test_late_results_are_evaluated_in_thread(engine):
+    engine.BUDGET = 0.0
+    for car, info in configurations(3, seed=1):
+        engine.start_tick()
+        batch = engine.submit(car, info, TARGET, list(SHOT_TYPES.values()))
+        assert not batch.futures
+        for shot_type in SHOT_TYPES.values():
+            expected = ShotCandidate(shot_type, car, info, TARGET).intercept
+            assert same_intercept(batch.get(shot_type).intercept, expected)
+
+
+@pytest.mark.parametrize('budget', [0.0, 0.004, 10.0])
+def test_offense_decides_the_same(engine, budget):
+    engine.BUDGET = budget
+    for car, info in configurations(10, seed=2):
+        serial = Offense(info).direct_shot_candidate(car, TARGET)
+        engine.start_tick()
+        parallel = Offense(info, engine).direct_shot_candidate(car, TARGET)
+        assert parallel.shot_type is serial.shot_type
+        assert same_intercept(parallel.intercept, serial.intercept)
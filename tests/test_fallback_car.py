@@ -0,0 +1,58 @@
+'''
+Car model of the pure-Python RLUtilities fallback.
+
+Run from the repository root:
+    python -m pytest tests
+'''
+from rlutilities.fallback.linear_algebra import vec3, dot
+from rlutilities.fallback.simulation import Car, Input
+
+DT = 1 / 120
+
+
+def controls(**values) -> Input:
+    inputs = Input()
+    inputs.throttle = 1.0
+    for name, value in values.items():
+        setattr(inputs, name, value)
+    return inputs
+
+
+def dodge(pitch: float, yaw: float) -> Car:
+    '''Jump, dodge with the stick at (pitch, yaw) and hold still until the car lands.'''
+    car = Car()
+    car.velocity = vec3(1000, 0, 0)
+    steps = [controls(jump=True)] * 12 + [controls()] * 6 + [controls(jump=True, pitch=pitch, yaw=yaw)] * 6
+    for inputs in steps:
+        car.step(inputs, DT)
+    for _ in range(int(3 / DT)):
+        if car.on_ground:
+            break
+        car.step(controls(), DT)
+    assert car.on_ground
+    return car
+
+
+def test_forward_dodge_lands_facing_forward():
+    car = dodge(pitch=-1, yaw=0)
+    assert dot(car.forward(), vec3(1, 0, 0)) > 0.99
+    assert car.velocity[0] > 1400
+
+
+def test_side_dodge_keeps_heading():
+    car = dodge(pitch=0, yaw=1)
+    assert dot(car.forward(), vec3(1, 0, 0)) > 0.99
+    assert abs(car.velocity[1]) > 400
+
+
+def test_forward_dodge_keeps_rotating():
+    '''Pitch isn't damped during the dodge torque, the flip gets well past upside down.'''
+    car = Car()
+    car.velocity = vec3(1000, 0, 0)
+    for inputs in [controls(jump=True)] * 12 + [controls()] * 6 + [controls(jump=True, pitch=-1)]:
+        car.step(inputs, DT)
+    rotation = 0.0
+    while not car.on_ground:
+        rotation += abs(dot(car.angular_velocity, car.left())) * DT
+        car.step(controls(), DT)
+    assert rotation > 3.5
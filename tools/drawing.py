@@ -1,6 +1,8 @@
 import math
 from dataclasses import dataclass
-from typing import List
+from typing import List, Dict, Tuple
+
+import numpy as np
 
 from rlutilities.linear_algebra import vec3, cross
 from rlutilities.simulation import Car, Input, Ball
@@ -11,6 +13,38 @@ from utils.vector_math import loc
 from utils.math import clamp
 
 
+def _tuple(v: vec3) -> tuple:
+    return v[0], v[1], v[2]
+
+
+def simplify_polyline(points: np.ndarray, tolerance: float) -> np.ndarray:
+    '''
+    Ramer-Douglas-Peucker: indices of the points to keep so that
+    no dropped point is further than `tolerance` from the simplified polyline.
+    '''
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        segment = points[last] - points[first]
+        offsets = points[first + 1:last] - points[first]
+        length = np.linalg.norm(segment)
+        if length < 1e-6:
+            distances = np.linalg.norm(offsets, axis=1)
+        else:
+            distances = np.linalg.norm(np.cross(offsets, segment), axis=1) / length
+        furthest = int(np.argmax(distances))
+        if distances[furthest] > tolerance:
+            middle = first + 1 + furthest
+            keep[middle] = True
+            stack.append((first, middle))
+            stack.append((middle, last))
+    return np.flatnonzero(keep)
+
+
 class DrawingTool:
 
     black = 0, 0, 0
@@ -27,6 +61,27 @@ class DrawingTool:
     purple = 128, 0, 128
     teal = 0, 128, 128
 
+    # RLBot drops render groups that get too big, so larger groups are split into chunks of this size
+    MAX_GROUP_ITEMS = 400
+
+    # upper bound on the number of items re-sent to the renderer in a single frame,
+    # when changed groups don't fit, their lowest priority items are dropped and the groups are retried next frame
+    MAX_ITEMS_PER_FRAME = 1200
+
+    # item priorities
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+    # level of detail: maximum deviation [uu] of simplified polylines and arcs from the exact shape,
+    # growing linearly with the distance from `focus` (one tolerance more for every LOD_DISTANCE)
+    POLYLINE_TOLERANCE = 8.0
+    ARC_TOLERANCE = 5.0
+    LOD_DISTANCE = 3000.0
+    MAX_ARC_SEGMENTS = 50
+    # shorter polylines (including arcs, which have their own level of detail) are not worth simplifying
+    SIMPLIFY_MIN_POINTS = 64
+
     def __init__(self, renderer: RenderingManager):
         self._renderer = renderer
         
@@ -34,46 +89,107 @@ class DrawingTool:
         self._R = 0
         self._G = 0
         self._B = 0
+        self._priority = self.NORMAL
+
+        # point of interest for the level of detail (usually our car), or None to draw everything at full detail
+        self.focus: vec3 = None
 
-        self._items_drawn = 0
         self._group_id = 'default'
         self._log_text = ""
 
+        # commands recorded this frame, per group
+        self._frame: Dict[str, List[tuple]] = {}
+        # changed groups waiting to be sent (carried over to the next frame when over the budget)
+        self._pending: Dict[str, Tuple[List[tuple], int]] = {}
+        # hash of the contents last sent for each group, and into how many chunks it was split
+        self._sent_hashes: Dict[str, int] = {}
+        self._sent_chunks: Dict[str, int] = {}
 
-    def begin(self):
-        self._renderer.begin_rendering(self._group_id)
-        self._items_drawn = 0
-        self._log_text = ""
+        self.items_sent = 0
 
-    def _check_limit(self, items=1):
-        if self._items_drawn == 0:
-            self.begin()
-        if self._items_drawn > 400:
-            self._items_drawn = 0
-            self._renderer.end_rendering()
-            self._group_id += 'a'
-            self._renderer.begin_rendering(self._group_id)
-        self._items_drawn += items
+    def _record(self, command: tuple):
+        self._frame.setdefault(self._group_id, []).append(command)
 
     def _render_logs(self):
         if not self._log_text == "":
-            self._check_limit()
-            self._renderer.draw_string_2d(10, 10, 1, 1, self._log_text, self.__getcolor())
+            group_id = self._group_id
+            self._group_id = 'log'
+            self._record(('string2d', self.HIGH, self.__getcolor(), 10, 10, 1, 1, self._log_text))
+            self._group_id = group_id
             self._log_text = ""
 
     def execute(self):
+        """Finish the frame and send the groups whose contents changed since they were last sent."""
         self._render_logs()
-        if self._items_drawn > 0:
-            self._renderer.end_rendering()
-            self._items_drawn = 0
-            self._group_id = 'default'
+        for group_id, commands in self._frame.items():
+            contents_hash = hash(tuple(commands))
+            if contents_hash == self._sent_hashes.get(group_id):
+                self._pending.pop(group_id, None)
+            else:
+                self._pending[group_id] = commands, contents_hash
+        self._frame = {}
+        self._group_id = 'default'
+
+        self.items_sent = 0
+        if not self._pending:
+            return
+
+        kept = None
+        if sum(len(commands) for commands, _ in self._pending.values()) > self.MAX_ITEMS_PER_FRAME:
+            priorities = np.array([command[1] for commands, _ in self._pending.values() for command in commands])
+            order = np.lexsort((np.arange(len(priorities)), -priorities))
+            kept = np.zeros(len(priorities), dtype=bool)
+            kept[order[:self.MAX_ITEMS_PER_FRAME]] = True
+
+        start = 0
+        for group_id in list(self._pending):
+            commands, contents_hash = self._pending[group_id]
+            if kept is None or kept[start:start + len(commands)].all():
+                self._send(group_id, commands)
+                self._sent_hashes[group_id] = contents_hash
+                del self._pending[group_id]
+                self.items_sent += len(commands)
+            elif kept[start:start + len(commands)].any():
+                partial = [command for command, keep in zip(commands, kept[start:start + len(commands)]) if keep]
+                self._send(group_id, partial)
+                self._sent_hashes.pop(group_id, None)
+                self.items_sent += len(partial)
+            start += len(commands)
+
+    def _send(self, group_id: str, commands: List[tuple]):
+        renderer = self._renderer
+        chunks = 0
+        for start in range(0, len(commands), self.MAX_GROUP_ITEMS):
+            renderer.begin_rendering(group_id + 'a' * chunks)
+            for command in commands[start:start + self.MAX_GROUP_ITEMS]:
+                kind, _, color, *args = command
+                color = renderer.create_color(*color)
+                if kind == 'line3d':
+                    renderer.draw_line_3d(args[0], args[1], color)
+                elif kind == 'polyline3d':
+                    renderer.draw_polyline_3d(args[0], color)
+                elif kind == 'rect3d':
+                    renderer.draw_rect_3d(args[0], args[1], args[2], True, color, True)
+                elif kind == 'string3d':
+                    renderer.draw_string_3d(args[0], args[1], args[2], args[3], color)
+                elif kind == 'string2d':
+                    renderer.draw_string_2d(args[0], args[1], args[2], args[3], args[4], color)
+            renderer.end_rendering()
+            chunks += 1
+
+        for stale in range(chunks, self._sent_chunks.get(group_id, 0)):
+            renderer.clear_screen(group_id + 'a' * stale)
+        self._sent_chunks[group_id] = chunks
 
     def clear(self):
         self._renderer.clear_all_touched_render_groups()
-        self.begin()
+        self._log_text = ""
+        self._frame = {}
+        self._pending = {}
+        self._sent_hashes = {}
+        self._sent_chunks = {}
 
     def group(self, group_id='default'):
-        self.execute()
         self._group_id = group_id
 
     # color configuration
@@ -82,37 +198,41 @@ class DrawingTool:
         self._R, self._G, self._B = color
 
     def __getcolor(self):
-        if not self._renderer.is_rendering():
-            self.begin()
-        return self._renderer.create_color(
-            self._opacity, self._R, self._G, self._B
-        )
+        return self._opacity, self._R, self._G, self._B
+
+    def priority(self, priority: int):
+        self._priority = priority
+
+    def _tolerance(self, tolerance: float, pos) -> float:
+        if self.focus is None:
+            return tolerance
+        pos = loc(pos)
+        dist = math.sqrt(sum((pos[i] - self.focus[i]) ** 2 for i in range(3)))
+        return tolerance * (1 + dist / self.LOD_DISTANCE)
 
     # render items
 
     def point(self, pos: vec3, size: float = 5):
-        self._check_limit()
-        self._renderer.draw_rect_3d(loc(pos) + vec3(0,0,5), size, size, 1, self.__getcolor(), 1)
+        self._record(('rect3d', self._priority, self.__getcolor(), _tuple(loc(pos) + vec3(0, 0, 5)), size, size))
 
     def line(self, pos1: vec3, pos2: vec3):
-        self._check_limit()
-        p1, p2 = vec3(loc(pos1)), vec3(loc(pos2))
-        if p1[2] < 10: p1[2] = 10
-        if p2[2] < 10: p2[2] = 10
-        self._renderer.draw_line_3d(p1, p2, self.__getcolor())
+        p1, p2 = _tuple(loc(pos1)), _tuple(loc(pos2))
+        self._record(('line3d', self._priority, self.__getcolor(), (p1[0], p1[1], max(p1[2], 10)), (p2[0], p2[1], max(p2[2], 10))))
 
     def string(self, pos: vec3, text, scale=1):
-        self._check_limit()
-        self._renderer.draw_string_3d(pos, scale, scale, str(text), self.__getcolor())
+        self._record(('string3d', self._priority, self.__getcolor(), _tuple(loc(pos)), scale, scale, str(text)))
 
     def string2D(self, x, y, text, scale=1):
-        self._check_limit()
-        self._renderer.draw_string_2d(x, y, int(scale), int(scale), str(text), self.__getcolor())
+        self._record(('string2d', self._priority, self.__getcolor(), x, y, int(scale), int(scale), str(text)))
 
     def polyline(self, iterable):
         if len(iterable) > 1:
-            self._check_limit()
-            self._renderer.draw_polyline_3d(iterable, self.__getcolor())
+            points = [_tuple(loc(point)) for point in iterable]
+            if len(points) > self.SIMPLIFY_MIN_POINTS:
+                array = np.array(points)
+                array = array[simplify_polyline(array, self._tolerance(self.POLYLINE_TOLERANCE, points[0]))]
+                points = list(map(tuple, array.tolist()))
+            self._record(('polyline3d', self._priority, self.__getcolor(), tuple(points)))
 
 
     # advanced
@@ -136,7 +256,13 @@ class DrawingTool:
         self.cyclic_polyline([left, right, top])
 
 
-    def arc(self, pos: vec3, radius: float, start: float, end: float, segments: int = 50):
+    def arc(self, pos: vec3, radius: float, start: float, end: float, segments: int = None):
+        if segments is None:
+            # enough segments to keep the chords within the tolerance
+            tolerance = min(self._tolerance(self.ARC_TOLERANCE, pos), radius)
+            max_angle = 2 * math.acos(1 - tolerance / max(radius, 1e-6))
+            segments = int(clamp(math.ceil(abs(end - start) / max(max_angle, 1e-6)), 3, self.MAX_ARC_SEGMENTS))
+
         step = (end - start) / segments
         points = []
 
@@ -147,8 +273,7 @@ class DrawingTool:
         self.cyclic_polyline(points)
 
     def circle(self, pos: vec3, radius: float):
-        segments = int(clamp(radius / 20, 10, 50))
-        self.arc(pos, radius, 0, math.pi * 2, segments)
+        self.arc(pos, radius, 0, math.pi * 2)
 
     def square(self, pos: vec3, size: float):
         self.arc(pos, size / 2, 0, math.pi * 2, 4)
@@ -162,7 +287,10 @@ class DrawingTool:
             test_car.step(Input(), dt)
             test_car.time += dt
             steps.append(vec3(test_car.position))
+        priority = self._priority
+        self.priority(self.LOW)
         self.polyline(steps)
+        self.priority(priority)
 
     def ball_trajectory(self, ball_predictions: List[Ball], step=1, time_limit=None):
         points = []
@@ -175,7 +303,9 @@ class DrawingTool:
     def ball_prediction(self, info, time_limit=None):
         self.group('prediction')
         self.color(self.yellow)
+        self.priority(self.LOW)
         self.ball_trajectory(info.ball_predictions, 4, time_limit)
+        self.priority(self.NORMAL)
         self.group()
 
     # text logging
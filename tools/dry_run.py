@@ -0,0 +1,259 @@
+'''
+Dry runs of maneuvers, without the game: a maneuver is stepped at a fixed dt against a simulated car
+(the RLUtilities car model) and the predicted ball, recording its controls, the car's trajectory,
+when it first got to the ball and when it finished. The ball doesn't react to the car, it follows its
+prediction, so runs that start from the same ball share one prediction.
+
+Any maneuver works, it's built by a function of the simulated car and GameInfo, see MANEUVERS:
+    result = dry_run(lambda car, info: Travel(car, info.ball.position), car, ball)
+    results = dry_run_many(make_half_flip, [(car, ball), ...], jobs=4)
+
+The maneuvers are Python objects stepped one at a time, so the runs aren't vectorized; dry_run_many
+spreads them over processes, the runs from one ball state together.
+
+Run from the repository root, to time a maneuver on random initial states:
+    python -m tools.dry_run travel --runs 200 --jobs 2
+'''
+import argparse
+import copy
+import multiprocessing
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3, look_at, norm
+from rlutilities.simulation import Car, Ball
+
+from maneuvers.kit import Maneuver
+from maneuvers.driving.arrive import Arrive
+from maneuvers.driving.travel import Travel
+from maneuvers.jumps.half_flip import HalfFlip
+from maneuvers.kickoffs.kickoff import Kickoff
+from maneuvers.strikes.dodge_strike import DodgeStrike
+from tools.simulation import (car_state, car_from_state, ball_state, ball_from_state, random_configuration,
+                              predicted_info, step_maneuver, REACH_DISTANCE)
+from utils.game_info import GameInfo
+
+DT = 1 / 60
+MAX_TIME = 6.0
+# the strikes look for their intercepts this far ahead
+PREDICTION_TIME = 6.0
+
+CONTROLS = ('throttle', 'steer', 'pitch', 'yaw', 'roll', 'jump', 'boost', 'handbrake')
+
+ManeuverFactory = Callable[[Car, GameInfo], Maneuver]
+
+
+class DryRun(NamedTuple):
+    '''A maneuver's dry run, one row per step, game times are those after each step.'''
+    times: np.ndarray            # (steps,)
+    controls: np.ndarray         # (steps, len(CONTROLS))
+    car_positions: np.ndarray    # (steps, 3)
+    car_velocities: np.ndarray   # (steps, 3)
+    ball_positions: np.ndarray   # (steps, 3)
+    # seconds from the start until the maneuver finished, None if it didn't within the time limit
+    completion_time: Optional[float]
+    # seconds from the start until the car first got within REACH_DISTANCE of the ball, None if it didn't
+    contact_time: Optional[float]
+
+    @property
+    def finished(self) -> bool:
+        return self.completion_time is not None
+
+
+def ball_prediction(ball: Ball, dt: float = DT, max_time: float = MAX_TIME) -> GameInfo:
+    '''The GameInfo the dry runs from `ball` start from, see dry_run_on.'''
+    return predicted_info(ball, int(max(max_time, PREDICTION_TIME) / dt) + 1, dt)
+
+
+def dry_run_on(make_maneuver: ManeuverFactory, car: Car, prediction: GameInfo,
+               dt: float = DT, max_time: float = MAX_TIME) -> DryRun:
+    '''
+    Step the maneuver built by `make_maneuver` on a copy of `car` until it finishes or `max_time` seconds pass,
+    with the ball following `prediction` (from ball_prediction with the same dt and max_time). The car's clock is
+    synced to the ball's time first. `prediction` isn't changed, it can be shared by many runs.
+    '''
+    # the maneuver gets its own GameInfo and ball, the prediction list is only ever replaced, not changed
+    info = copy.copy(prediction)
+    info.ball = Ball(prediction.ball)
+
+    car = Car(car)
+    start = car.time = info.ball.time
+    maneuver = make_maneuver(car, info)
+
+    num_steps = min(int(round(max_time / dt)), len(info.ball_predictions))
+    controls = np.zeros((num_steps, len(CONTROLS)))
+    car_positions = np.zeros((num_steps, 3))
+    car_velocities = np.zeros((num_steps, 3))
+    ball_positions = np.zeros((num_steps, 3))
+    # a maneuver can be done before its first step, e.g. a strike without an intercept
+    completion_time = 0.0 if maneuver.finished else None
+    contact_time = None
+
+    steps = 0
+    if completion_time is None:
+        for steps in step_maneuver(maneuver, car, info, dt):
+            controls[steps - 1] = [float(getattr(maneuver.controls, name)) for name in CONTROLS]
+            car_positions[steps - 1] = tuple(car.position)
+            car_velocities[steps - 1] = tuple(car.velocity)
+            ball_positions[steps - 1] = tuple(info.ball.position)
+            if contact_time is None and norm(car.position - info.ball.position) < REACH_DISTANCE:
+                contact_time = steps * dt
+            if maneuver.finished:
+                completion_time = steps * dt
+            if steps == num_steps:
+                break
+
+    times = start + np.arange(1, steps + 1) * dt
+    return DryRun(times, controls[:steps], car_positions[:steps], car_velocities[:steps],
+                  ball_positions[:steps], completion_time, contact_time)
+
+
+def dry_run(make_maneuver: ManeuverFactory, car: Car, ball: Ball,
+            dt: float = DT, max_time: float = MAX_TIME) -> DryRun:
+    '''
+    Step the maneuver built by `make_maneuver` on copies of `car` and `ball` until it finishes or
+    `max_time` seconds pass. The car's and ball's clocks are synced to the ball's time first.
+    '''
+    return dry_run_on(make_maneuver, car, ball_prediction(ball, dt, max_time), dt, max_time)
+
+
+def _dry_run_states(make_maneuver: ManeuverFactory, cars: List[tuple], ball: tuple,
+                    dt: float, max_time: float) -> List[DryRun]:
+    prediction = ball_prediction(ball_from_state(ball), dt, max_time)
+    return [dry_run_on(make_maneuver, car_from_state(car), prediction, dt, max_time) for car in cars]
+
+
+def dry_run_many(make_maneuver: ManeuverFactory, states: Sequence[Tuple[Car, Ball]],
+                 dt: float = DT, max_time: float = MAX_TIME, jobs: int = 1) -> List[DryRun]:
+    '''
+    Dry runs of a maneuver from many initial (car, ball) states, in order. The runs from equal balls share
+    their prediction. With more than one job `make_maneuver` has to be picklable, i.e. a module level function.
+    '''
+    # RLUtilities cars and balls don't pickle, their states do, and the ball states tell equal balls apart
+    groups: Dict[tuple, List[int]] = {}
+    for i, (_, ball) in enumerate(states):
+        groups.setdefault(ball_state(ball), []).append(i)
+
+    results: List[Optional[DryRun]] = [None] * len(states)
+    if jobs <= 1:
+        for indices in groups.values():
+            prediction = ball_prediction(states[indices[0]][1], dt, max_time)
+            for i in indices:
+                results[i] = dry_run_on(make_maneuver, states[i][0], prediction, dt, max_time)
+        return results
+
+    # a task is a ball and some of its cars, split so that every worker gets a few tasks
+    size = max(1, len(states) // (4 * jobs))
+    tasks, task_indices = [], []
+    for ball, indices in groups.items():
+        for first in range(0, len(indices), size):
+            chunk = indices[first:first + size]
+            tasks.append((make_maneuver, [car_state(states[i][0]) for i in chunk], ball, dt, max_time))
+            task_indices.append(chunk)
+    with multiprocessing.Pool(jobs) as pool:
+        for chunk, runs in zip(task_indices, pool.starmap(_dry_run_states, tasks)):
+            for i, run in zip(chunk, runs):
+                results[i] = run
+    return results
+
+
+def make_arrive(car: Car, info: GameInfo) -> Arrive:
+    '''Arrive under the ball where it is 2 seconds from now, facing the orange goal.'''
+    arrive = Arrive(car)
+    arrive.time = car.time + 2.0
+    ball = info.ball_predictions[min(int(2.0 / DT), len(info.ball_predictions) - 1)]
+    arrive.target = vec3(ball.position[0], ball.position[1], 0)
+    arrive.target_direction = vec3(0, 1, 0)
+    return arrive
+
+
+def make_travel(car: Car, info: GameInfo) -> Travel:
+    return Travel(car, vec3(info.ball.position[0], info.ball.position[1], 0))
+
+
+def make_dodge_strike(car: Car, info: GameInfo) -> DodgeStrike:
+    return DodgeStrike(car, info, vec3(0, 5120, 320))
+
+
+def make_half_flip(car: Car, info: GameInfo) -> HalfFlip:
+    return HalfFlip(car)
+
+
+def make_kickoff(car: Car, info: GameInfo) -> Kickoff:
+    # opponents aren't simulated, one waiting next to the ball makes the kickoff dodge into it
+    opponent = Car()
+    opponent.position = vec3(0, 1000, 17)
+    opponent.team = 1
+    info.opponents = [opponent]
+    return Kickoff(car, info)
+
+
+def kickoff_configuration(rng: random.Random) -> Tuple[Car, Ball]:
+    '''A blue car at one of the kickoff spots, the ball at the center.'''
+    car = Car()
+    x, y = rng.choice([(-2048, -2560), (2048, -2560), (-256, -3840), (256, -3840), (0, -4608)])
+    car.position = vec3(x, y, 17)
+    car.orientation = look_at(vec3(-x, -y, 0), vec3(0, 0, 1))
+    car.boost = 33
+    car.on_ground = True
+
+    ball = Ball()
+    ball.position = vec3(0, 0, 93)
+    return car, ball
+
+
+def random_half_flip_configuration(rng: random.Random) -> Tuple[Car, Ball]:
+    '''Half flips start from driving backwards.'''
+    car, ball = random_configuration(rng)
+    car.velocity = car.forward() * -rng.uniform(0, 1000)
+    return car, ball
+
+
+# name: (maneuver factory, initial states)
+MANEUVERS = {
+    'arrive': (make_arrive, random_configuration),
+    'travel': (make_travel, random_configuration),
+    'dodge_strike': (make_dodge_strike, random_configuration),
+    'half_flip': (make_half_flip, random_half_flip_configuration),
+    'kickoff': (make_kickoff, kickoff_configuration),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('maneuver', choices=list(MANEUVERS))
+    parser.add_argument('--runs', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--dt', type=float, default=DT)
+    parser.add_argument('--max-time', type=float, default=MAX_TIME)
+    args = parser.parse_args()
+
+    make_maneuver, configuration = MANEUVERS[args.maneuver]
+    rng = random.Random(args.seed)
+    states = [configuration(rng) for _ in range(args.runs)]
+
+    start = time.perf_counter()
+    results = dry_run_many(make_maneuver, states, args.dt, args.max_time, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    steps = sum(len(result.times) for result in results)
+    completion_times = np.array([result.completion_time for result in results if result.finished])
+    contact_times = np.array([result.contact_time for result in results if result.contact_time is not None])
+    print(f"{args.maneuver}: {len(completion_times)} / {len(results)} finished, {len(contact_times)} got to the ball "
+          f"within {args.max_time:.1f} s")
+    for name, times in (('completion', completion_times), ('ball contact', contact_times)):
+        if len(times):
+            print(f"{name + ' time [s]:':<24}mean {times.mean():.2f}  "
+                  + "  ".join(f"p{p} {np.percentile(times, p):.2f}" for p in (10, 50, 90)))
+    final_speeds = [norm(vec3(*result.car_velocities[-1])) for result in results if len(result.times)]
+    if final_speeds:
+        print(f"final speed [uu/s]: mean {np.mean(final_speeds):.0f}")
+    print(f"{steps} steps in {elapsed:.2f} s, {elapsed / max(steps, 1) * 1e6:.0f} us per step")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+import struct
+from pathlib import Path
+
+import numpy as np
+
+
+MAGIC = b'BTMSREC1'
+VERSION = 1
+
+MAX_CARS = 8
+MAX_PADS = 50
+HEADER_SIZE = 1024
+
+VEC3 = ('<f4', (3,))
+
+CAR_DTYPE = np.dtype([
+    ('location', *VEC3),
+    ('rotation', *VEC3),
+    ('velocity', *VEC3),
+    ('angular_velocity', *VEC3),
+    ('boost', '<f4'),
+    ('team', 'u1'),
+    ('has_wheel_contact', 'u1'),
+    ('jumped', 'u1'),
+    ('double_jumped', 'u1'),
+    ('is_super_sonic', 'u1'),
+    ('is_demolished', 'u1'),
+])
+
+RECORD_DTYPE = np.dtype([
+    ('tick', '<u4'),
+    ('game', [
+        ('seconds_elapsed', '<f4'),
+        ('game_time_remaining', '<f4'),
+        ('world_gravity_z', '<f4'),
+        ('game_speed', '<f4'),
+        ('is_round_active', 'u1'),
+        ('is_kickoff_pause', 'u1'),
+        ('is_match_ended', 'u1'),
+        ('is_overtime', 'u1'),
+        ('is_unlimited_time', 'u1'),
+    ]),
+    ('scores', '<u2', (2,)),
+    ('num_cars', 'u1'),
+    ('num_pads', 'u1'),
+    ('ball', [
+        ('location', *VEC3),
+        ('rotation', *VEC3),
+        ('velocity', *VEC3),
+        ('angular_velocity', *VEC3),
+    ]),
+    ('touch', [
+        ('time_seconds', '<f4'),
+        ('hit_location', *VEC3),
+        ('hit_normal', *VEC3),
+        ('team', 'u1'),
+        ('player_index', 'i1'),
+    ]),
+    ('cars', CAR_DTYPE, (MAX_CARS,)),
+    ('pads', [
+        ('is_active', 'u1'),
+        ('timer', '<f4'),
+    ], (MAX_PADS,)),
+    ('controls', [
+        ('throttle', '<f4'),
+        ('steer', '<f4'),
+        ('pitch', '<f4'),
+        ('yaw', '<f4'),
+        ('roll', '<f4'),
+        ('jump', 'u1'),
+        ('boost', 'u1'),
+        ('handbrake', 'u1'),
+        ('use_item', 'u1'),
+    ]),
+])
+
+_HEADER_FIELDS = [
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('header_size', '<u4'),
+    ('record_size', '<u4'),
+    ('index', '<u4'),
+    ('team', '<u4'),
+    ('num_pads', '<u4'),
+    ('pad_locations', '<f4', (MAX_PADS, 3)),
+    ('pad_is_full_boost', 'u1', (MAX_PADS,)),
+    ('names', 'S32', (MAX_CARS,)),
+]
+_HEADER_USED = np.dtype(_HEADER_FIELDS).itemsize
+HEADER_DTYPE = np.dtype(_HEADER_FIELDS + [('reserved', 'u1', (HEADER_SIZE - _HEADER_USED,))])
+
+_STRUCT_CODES = {'f4': 'f', 'f8': 'd', 'u1': 'B', 'i1': 'b', 'u2': 'H', 'u4': 'I'}
+
+
+def _struct_format(dtype: np.dtype) -> str:
+    '''Flatten a packed structured dtype into an equivalent struct format string.'''
+    if dtype.subdtype is not None:
+        base, shape = dtype.subdtype
+        return _struct_format(base) * int(np.prod(shape))
+    if dtype.names is not None:
+        return ''.join(_struct_format(dtype.fields[name][0]) for name in dtype.names)
+    return _STRUCT_CODES[dtype.str[1:]]
+
+
+RECORD_STRUCT = struct.Struct('<' + _struct_format(RECORD_DTYPE))
+assert RECORD_STRUCT.size == RECORD_DTYPE.itemsize
+
+_EMPTY_CAR = (0.0,) * 13 + (0,) * 6
+_EMPTY_PAD = (0, 0.0)
+
+
+def _vec(v) -> tuple:
+    return v.x, v.y, v.z
+
+
+def _rot(r) -> tuple:
+    return r.pitch, r.yaw, r.roll
+
+
+class PacketRecorder:
+    '''
+    Appends what the bot saw (GameTickPacket) and what it did (controls) each tick
+    into a fixed-record binary log. Every record has the same size, so the log
+    can be memory-mapped with `read_recording` without any parsing.
+    '''
+
+    def __init__(self, path, index: int, team: int, field_info_getter: callable, buffer_size: int = 1 << 20):
+        self.path = Path(path)
+        self.index = index
+        self.team = team
+        self.ticks = 0
+
+        self._field_info_getter = field_info_getter
+        self._buffer_size = buffer_size
+        self._file = None
+
+    def _open(self, packet):
+        field_info = self._field_info_getter()
+
+        header = np.zeros((), dtype=HEADER_DTYPE)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['header_size'] = HEADER_SIZE
+        header['record_size'] = RECORD_STRUCT.size
+        header['index'] = self.index
+        header['team'] = self.team
+
+        num_pads = min(field_info.num_boosts, MAX_PADS)
+        header['num_pads'] = num_pads
+        for i in range(num_pads):
+            pad = field_info.boost_pads[i]
+            header['pad_locations'][i] = _vec(pad.location)
+            header['pad_is_full_boost'][i] = pad.is_full_boost
+
+        for i in range(min(packet.num_cars, MAX_CARS)):
+            header['names'][i] = packet.game_cars[i].name.encode('utf-8')[:32]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'wb', buffering=self._buffer_size)
+        self._file.write(header.tobytes())
+
+    def record(self, packet, controls):
+        if self._file is None:
+            self._open(packet)
+        self._file.write(RECORD_STRUCT.pack(*self._flatten(packet, controls)))
+        self.ticks += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _flatten(self, packet, controls) -> list:
+        info = packet.game_info
+        ball = packet.game_ball.physics
+        touch = packet.game_ball.latest_touch
+
+        scores = [0, 0]
+        for team in packet.teams[:packet.num_teams]:
+            if team.team_index in (0, 1):
+                scores[team.team_index] = team.score
+
+        num_cars = min(packet.num_cars, MAX_CARS)
+        num_pads = min(packet.num_boost, MAX_PADS)
+
+        values = [
+            self.ticks,
+            info.seconds_elapsed, info.game_time_remaining, info.world_gravity_z, info.game_speed,
+            info.is_round_active, info.is_kickoff_pause, info.is_match_ended,
+            info.is_overtime, info.is_unlimited_time,
+            scores[0], scores[1],
+            num_cars, num_pads,
+        ]
+        values += _vec(ball.location)
+        values += _rot(ball.rotation)
+        values += _vec(ball.velocity)
+        values += _vec(ball.angular_velocity)
+
+        values.append(touch.time_seconds)
+        values += _vec(touch.hit_location)
+        values += _vec(touch.hit_normal)
+        values.append(touch.team)
+        values.append(touch.player_index if touch.player_name else -1)
+
+        for i in range(num_cars):
+            car = packet.game_cars[i]
+            physics = car.physics
+            values += _vec(physics.location)
+            values += _rot(physics.rotation)
+            values += _vec(physics.velocity)
+            values += _vec(physics.angular_velocity)
+            values += (
+                car.boost, car.team, car.has_wheel_contact, car.jumped,
+                car.double_jumped, car.is_super_sonic, car.is_demolished
+            )
+        values += _EMPTY_CAR * (MAX_CARS - num_cars)
+
+        for i in range(num_pads):
+            pad = packet.game_boosts[i]
+            values += (pad.is_active, pad.timer)
+        values += _EMPTY_PAD * (MAX_PADS - num_pads)
+
+        values += (
+            controls.throttle, controls.steer, controls.pitch, controls.yaw, controls.roll,
+            controls.jump, controls.boost, controls.handbrake, getattr(controls, 'use_item', 0)
+        )
+        return values
+
+
+def read_recording(path):
+    '''
+    Memory-map a log written by PacketRecorder.
+    Returns the header (numpy record) and a read-only array of tick records.
+    A partially written last record (e.g. after a crash) is ignored.
+    '''
+    path = Path(path)
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header[0]['magic'] != MAGIC:
+        raise ValueError(f"{path} is not a Botimus packet recording")
+    header = header[0]
+    if header['version'] != VERSION or header['record_size'] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} was recorded with an incompatible format version")
+
+    count = (path.stat().st_size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return header, np.zeros(0, dtype=RECORD_DTYPE)
+    return header, np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
@@ -0,0 +1,192 @@
+'''
+Out-of-process rendering: a drop-in replacement for the RLBot RenderingManager that
+packs every render group into a compact binary datagram and sends it over local UDP
+to a separate process (see tools/render_viewer.py), so the bot never waits on rendering.
+
+Message layout (little endian):
+    header   magic b'BRND', version u8, message type u8, bot index u8, sequence u32,
+             group id length u8, group id (utf-8)
+    GROUP    item count u16, items
+    CLEAR    (nothing else, clears one group)
+    CLEAR_ALL (nothing else, the group id is empty)
+
+    item     kind u8, color a r g b (4 x u8), payload
+    LINE     x1 y1 z1 x2 y2 z2 (6 x f4)
+    POLYLINE point count u16, points (3 x f4 each)
+    RECT     x y z width height (5 x f4), filled u8, centered u8
+    STRING3D x y z (3 x f4), scale x, scale y (2 x u8), text length u16, text (utf-8)
+    STRING2D x y (2 x f4), scale x, scale y (2 x u8), text length u16, text (utf-8)
+'''
+import socket
+import struct
+from itertools import chain
+from typing import List, Tuple
+
+MAGIC = b'BRND'
+VERSION = 1
+DEFAULT_ADDRESS = ('127.0.0.1', 23234)
+
+# message types
+GROUP = 1
+CLEAR = 2
+CLEAR_ALL = 3
+
+# item kinds
+LINE = 1
+POLYLINE = 2
+RECT = 3
+STRING3D = 4
+STRING2D = 5
+
+KIND_NAMES = {LINE: 'line3d', POLYLINE: 'polyline3d', RECT: 'rect3d', STRING3D: 'string3d', STRING2D: 'string2d'}
+
+HEADER = struct.Struct('<4sBBBIB')
+ITEM = struct.Struct('<B4B')
+COUNT = struct.Struct('<H')
+LINE_PAYLOAD = struct.Struct('<6f')
+RECT_PAYLOAD = struct.Struct('<5f2B')
+STRING3D_PAYLOAD = struct.Struct('<3f2BH')
+STRING2D_PAYLOAD = struct.Struct('<2f2BH')
+
+# largest payload of a single UDP datagram
+MAX_DATAGRAM = 65507
+
+
+def _xyz(v) -> Tuple[float, float, float]:
+    return float(v[0]), float(v[1]), float(v[2])
+
+
+class UdpRenderSink:
+    '''Implements the part of RenderingManager that DrawingTool uses and ships the groups over UDP.'''
+
+    def __init__(self, index: int, address=DEFAULT_ADDRESS):
+        self.index = index
+        self.address = address
+        self.sequence = 0
+        self.dropped = 0
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+        self._group_id = None
+        self._items: List[bytes] = []
+        self._count = 0
+
+    def close(self):
+        self._socket.close()
+
+    def _send(self, message_type: int, group_id: str, body: bytes = b''):
+        name = group_id.encode()[:255]
+        data = HEADER.pack(MAGIC, VERSION, message_type, self.index, self.sequence, len(name)) + name + body
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        if len(data) > MAX_DATAGRAM:
+            self.dropped += 1
+            return
+        try:
+            self._socket.sendto(data, self.address)
+        except OSError:
+            # nobody listening or the buffer is full, rendering is best effort
+            self.dropped += 1
+
+    # RenderingManager interface
+
+    def begin_rendering(self, group_id='default'):
+        self._group_id = group_id
+        self._items = []
+        self._count = 0
+
+    def end_rendering(self):
+        if self._group_id is not None:
+            self._send(GROUP, self._group_id, COUNT.pack(self._count) + b''.join(self._items))
+        self._group_id = None
+        self._items = []
+
+    def is_rendering(self):
+        return self._group_id is not None
+
+    def create_color(self, alpha, red, green, blue):
+        return alpha, red, green, blue
+
+    def clear_screen(self, group_id='default'):
+        self._send(CLEAR, group_id)
+
+    def clear_all_touched_render_groups(self):
+        self._send(CLEAR_ALL, '')
+
+    def _item(self, kind: int, color, payload: bytes):
+        self._items.append(ITEM.pack(kind, *color) + payload)
+        self._count += 1
+
+    def draw_line_3d(self, start, end, color):
+        self._item(LINE, color, LINE_PAYLOAD.pack(*_xyz(start), *_xyz(end)))
+
+    def draw_polyline_3d(self, vectors, color):
+        points = [_xyz(v) for v in vectors][:0xFFFF]
+        self._item(POLYLINE, color, COUNT.pack(len(points)) + struct.pack(f'<{3 * len(points)}f', *chain.from_iterable(points)))
+
+    def draw_rect_3d(self, vec, width, height, filled, color, centered=False):
+        self._item(RECT, color, RECT_PAYLOAD.pack(*_xyz(vec), width, height, bool(filled), bool(centered)))
+
+    def draw_string_3d(self, vec, scale_x, scale_y, text, color):
+        encoded = str(text).encode()[:0xFFFF]
+        self._item(STRING3D, color, STRING3D_PAYLOAD.pack(*_xyz(vec), scale_x, scale_y, len(encoded)) + encoded)
+
+    def draw_string_2d(self, x, y, scale_x, scale_y, text, color):
+        encoded = str(text).encode()[:0xFFFF]
+        self._item(STRING2D, color, STRING2D_PAYLOAD.pack(x, y, scale_x, scale_y, len(encoded)) + encoded)
+
+
+def decode_message(data: bytes) -> dict:
+    '''Inverse of UdpRenderSink: turns a datagram into a plain dict (raises ValueError on garbage).'''
+    if len(data) < HEADER.size:
+        raise ValueError("message too short")
+    magic, version, message_type, index, sequence, name_length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a render message")
+    offset = HEADER.size
+    group_id = data[offset:offset + name_length].decode()
+    offset += name_length
+
+    message = {'type': message_type, 'index': index, 'sequence': sequence, 'group': group_id}
+    if message_type != GROUP:
+        return message
+
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    items = []
+    for _ in range(count):
+        kind, a, r, g, b = ITEM.unpack_from(data, offset)
+        offset += ITEM.size
+        item = {'kind': KIND_NAMES.get(kind, kind), 'color': (a, r, g, b)}
+
+        if kind == LINE:
+            values = LINE_PAYLOAD.unpack_from(data, offset)
+            offset += LINE_PAYLOAD.size
+            item['start'], item['end'] = values[:3], values[3:]
+
+        elif kind == POLYLINE:
+            num_points, = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            values = struct.unpack_from(f'<{3 * num_points}f', data, offset)
+            offset += 12 * num_points
+            item['points'] = [values[i:i + 3] for i in range(0, len(values), 3)]
+
+        elif kind == RECT:
+            x, y, z, width, height, filled, centered = RECT_PAYLOAD.unpack_from(data, offset)
+            offset += RECT_PAYLOAD.size
+            item.update(position=(x, y, z), width=width, height=height, filled=bool(filled), centered=bool(centered))
+
+        elif kind in (STRING3D, STRING2D):
+            payload = STRING3D_PAYLOAD if kind == STRING3D else STRING2D_PAYLOAD
+            *position, scale_x, scale_y, length = payload.unpack_from(data, offset)
+            offset += payload.size
+            item.update(position=tuple(position), scale=(scale_x, scale_y),
+                        text=data[offset:offset + length].decode(errors='replace'))
+            offset += length
+
+        else:
+            raise ValueError(f"unknown item kind {kind}")
+        items.append(item)
+
+    message['items'] = items
+    return message
@@ -0,0 +1,104 @@
+'''
+Receives render groups sent by tools/render_sink.py and writes them to disk.
+
+Every received message is appended to <out>/messages.jsonl, and every --snapshot seconds
+the complete retained state (all groups of all bots, like the game would show them)
+is written to <out>/frame-<n>.json.
+
+Run from the repository root, then set BotimusPrime.RENDER_SINK = DEFAULT_ADDRESS:
+    python -m tools.render_viewer --out renders
+'''
+import argparse
+import json
+import socket
+import struct
+import time
+from pathlib import Path
+
+from tools.render_sink import DEFAULT_ADDRESS, MAX_DATAGRAM, GROUP, CLEAR, CLEAR_ALL, decode_message
+
+
+class RenderState:
+    '''The render groups currently on screen, per bot.'''
+
+    def __init__(self):
+        self.groups = {}
+
+    def apply(self, message: dict):
+        index = message['index']
+        if message['type'] == GROUP:
+            self.groups[(index, message['group'])] = message['items']
+        elif message['type'] == CLEAR:
+            self.groups.pop((index, message['group']), None)
+        elif message['type'] == CLEAR_ALL:
+            for key in [key for key in self.groups if key[0] == index]:
+                del self.groups[key]
+
+    def snapshot(self) -> dict:
+        bots = {}
+        for (index, group_id), items in sorted(self.groups.items()):
+            bots.setdefault(str(index), {})[group_id] = items
+        return bots
+
+
+def serve(address, out: Path, snapshot_interval: float, duration: float = None):
+    out.mkdir(parents=True, exist_ok=True)
+    state = RenderState()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(address)
+    sock.settimeout(0.1)
+    print(f"listening on {address[0]}:{address[1]}, writing to {out}")
+
+    start = time.time()
+    next_snapshot = start + snapshot_interval
+    frames = received = errors = 0
+
+    with open(out / 'messages.jsonl', 'a') as log:
+        try:
+            while duration is None or time.time() - start < duration:
+                try:
+                    data, _ = sock.recvfrom(MAX_DATAGRAM)
+                except socket.timeout:
+                    data = None
+                except ConnectionResetError:
+                    continue
+
+                if data is not None:
+                    try:
+                        message = decode_message(data)
+                    except (ValueError, struct.error):
+                        errors += 1
+                    else:
+                        received += 1
+                        state.apply(message)
+                        message['time'] = round(time.time() - start, 4)
+                        log.write(json.dumps(message) + '\n')
+
+                if time.time() >= next_snapshot:
+                    next_snapshot += snapshot_interval
+                    with open(out / f'frame-{frames:05d}.json', 'w') as frame:
+                        json.dump({'time': round(time.time() - start, 4), 'bots': state.snapshot()}, frame)
+                    frames += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sock.close()
+
+    print(f"received {received} messages ({errors} undecodable), wrote {frames} frames")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=DEFAULT_ADDRESS[0])
+    parser.add_argument('--port', type=int, default=DEFAULT_ADDRESS[1])
+    parser.add_argument('--out', default='renders', help="directory for messages.jsonl and the frame snapshots")
+    parser.add_argument('--snapshot', type=float, default=1.0, metavar='SECONDS')
+    parser.add_argument('--duration', type=float, metavar='SECONDS', help="stop after this long")
+    args = parser.parse_args()
+
+    serve((args.host, args.port), Path(args.out), args.snapshot, args.duration)
+
+
+if __name__ == '__main__':
+    main()
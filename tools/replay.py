@@ -0,0 +1,424 @@
+'''
+Headless packet replay for benchmarking the bot without the game.
+
+Feeds recorded (see tools/packet_recorder.py) or synthetic GameTickPackets into
+BotimusPrime with a stubbed renderer, matchcomms and field info, and reports the
+per-tick latency distribution together with a per-phase breakdown.
+
+Run from the repository root:
+    python -m tools.replay recordings/20200117-120000-0.bin
+    python -m tools.replay --synthetic 3000 --seed 1
+'''
+import argparse
+import contextlib
+import cProfile
+import io
+import math
+import pstats
+import queue
+import random
+import time
+from collections import defaultdict
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
+
+from agent import BotimusPrime
+from strategy.rollout import RolloutStrategy
+from strategy.soccar_strategy import SoccarStrategy
+from tools.packet_recorder import read_recording
+from tools.render_sink import DEFAULT_ADDRESS
+
+STRATEGIES = {'soccar': SoccarStrategy, 'rollout': RolloutStrategy}
+
+
+SOCCAR_BOOST_PADS = [
+    (0.0, -4240.0, 70.0), (-1792.0, -4184.0, 70.0), (1792.0, -4184.0, 70.0),
+    (-3072.0, -4096.0, 73.0), (3072.0, -4096.0, 73.0), (-940.0, -3308.0, 70.0),
+    (940.0, -3308.0, 70.0), (0.0, -2816.0, 70.0), (-3584.0, -2484.0, 70.0),
+    (3584.0, -2484.0, 70.0), (-1788.0, -2300.0, 70.0), (1788.0, -2300.0, 70.0),
+    (-2048.0, -1036.0, 70.0), (0.0, -1024.0, 70.0), (2048.0, -1036.0, 70.0),
+    (-3584.0, 0.0, 73.0), (-1024.0, 0.0, 70.0), (1024.0, 0.0, 70.0),
+    (3584.0, 0.0, 73.0), (-2048.0, 1036.0, 70.0), (0.0, 1024.0, 70.0),
+    (2048.0, 1036.0, 70.0), (-1788.0, 2300.0, 70.0), (1788.0, 2300.0, 70.0),
+    (-3584.0, 2484.0, 70.0), (3584.0, 2484.0, 70.0), (0.0, 2816.0, 70.0),
+    (-940.0, 3310.0, 70.0), (940.0, 3308.0, 70.0), (-3072.0, 4096.0, 73.0),
+    (3072.0, 4096.0, 73.0), (-1792.0, 4184.0, 70.0), (1792.0, 4184.0, 70.0),
+    (0.0, 4240.0, 70.0),
+]
+SOCCAR_LARGE_PADS = {3, 4, 15, 18, 29, 30}
+
+
+class NullRenderer:
+    '''Accepts every RenderingManager call and draws nothing.'''
+
+    def __init__(self):
+        self._rendering = False
+        self.items_drawn = 0
+
+    def begin_rendering(self, group_id='default'):
+        self._rendering = True
+
+    def end_rendering(self):
+        self._rendering = False
+
+    def is_rendering(self):
+        return self._rendering
+
+    def create_color(self, alpha, red, green, blue):
+        return alpha, red, green, blue
+
+    def clear_all_touched_render_groups(self):
+        pass
+
+    def clear_screen(self, group_id='default'):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('draw_'):
+            return self._draw
+        raise AttributeError(name)
+
+    def _draw(self, *args, **kwargs):
+        self.items_drawn += 1
+        return self
+
+
+class NullMatchcomms:
+
+    def __init__(self):
+        self.incoming_broadcast = queue.Queue()
+        self.outgoing_broadcast = queue.Queue()
+
+
+class HeadlessBotimus(BotimusPrime):
+
+    def __init__(self, name: str, team: int, index: int, field_info: FieldInfoPacket):
+        super().__init__(name, team, index)
+        self._field_info = field_info
+        self._null_matchcomms = NullMatchcomms()
+        self.renderer = NullRenderer()
+
+    @property
+    def matchcomms(self):
+        return self._null_matchcomms
+
+    def get_field_info(self):
+        return self._field_info
+
+    def send_quick_chat(self, team_only, quick_chat):
+        pass
+
+
+class PhaseTimer:
+    '''Wraps bound methods of the agent's components and accumulates their run times.'''
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def wrap(self, obj, method_name: str, phase: str):
+        method = getattr(obj, method_name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter() - start
+                self.calls[phase] += 1
+
+        setattr(obj, method_name, timed)
+
+    def instrument(self, agent: BotimusPrime):
+        self.wrap(agent.info, 'read_packet', 'read_packet')
+        self.wrap(agent.info, 'predict_ball', 'predict_ball')
+        self.wrap(agent.strategy, 'choose_maneuver', 'choose_maneuver')
+        self.wrap(agent.strategy, 'reconsider', 'reconsider')
+        self.wrap(agent.draw, 'execute', 'render')
+        self.wrap(agent, 'maybe_chat', 'chat')
+        self.wrap(agent.chat, 'step', 'chat')
+
+
+def _set_vec(target, v):
+    target.x, target.y, target.z = float(v[0]), float(v[1]), float(v[2])
+
+
+def _set_rot(target, r):
+    target.pitch, target.yaw, target.roll = float(r[0]), float(r[1]), float(r[2])
+
+
+def field_info_from_pads(pads, large_pads) -> FieldInfoPacket:
+    field_info = FieldInfoPacket()
+    field_info.num_boosts = len(pads)
+    for i, location in enumerate(pads):
+        _set_vec(field_info.boost_pads[i].location, location)
+        field_info.boost_pads[i].is_full_boost = i in large_pads
+
+    field_info.num_goals = 2
+    for team in range(2):
+        goal = field_info.goals[team]
+        goal.team_num = team
+        sign = -1 if team == 0 else 1
+        _set_vec(goal.location, (0, sign * 5120, 642.775 / 2))
+        _set_vec(goal.direction, (0, -sign, 0))
+    return field_info
+
+
+def field_info_from_header(header) -> FieldInfoPacket:
+    num_pads = int(header['num_pads'])
+    pads = header['pad_locations'][:num_pads]
+    large_pads = {i for i in range(num_pads) if header['pad_is_full_boost'][i]}
+    return field_info_from_pads(pads, large_pads)
+
+
+def packet_from_record(record, names, packet: GameTickPacket):
+    '''Fill `packet` in place from a single PacketRecorder record.'''
+    game = record['game']
+    info = packet.game_info
+    info.seconds_elapsed = float(game['seconds_elapsed'])
+    info.game_time_remaining = float(game['game_time_remaining'])
+    info.world_gravity_z = float(game['world_gravity_z'])
+    info.game_speed = float(game['game_speed'])
+    info.is_round_active = bool(game['is_round_active'])
+    info.is_kickoff_pause = bool(game['is_kickoff_pause'])
+    info.is_match_ended = bool(game['is_match_ended'])
+    info.is_overtime = bool(game['is_overtime'])
+    info.is_unlimited_time = bool(game['is_unlimited_time'])
+
+    packet.num_teams = 2
+    for team in range(2):
+        packet.teams[team].team_index = team
+        packet.teams[team].score = int(record['scores'][team])
+
+    ball = record['ball']
+    physics = packet.game_ball.physics
+    _set_vec(physics.location, ball['location'])
+    _set_rot(physics.rotation, ball['rotation'])
+    _set_vec(physics.velocity, ball['velocity'])
+    _set_vec(physics.angular_velocity, ball['angular_velocity'])
+
+    num_cars = int(record['num_cars'])
+    packet.num_cars = num_cars
+    for i in range(num_cars):
+        rec_car = record['cars'][i]
+        car = packet.game_cars[i]
+        _set_vec(car.physics.location, rec_car['location'])
+        _set_rot(car.physics.rotation, rec_car['rotation'])
+        _set_vec(car.physics.velocity, rec_car['velocity'])
+        _set_vec(car.physics.angular_velocity, rec_car['angular_velocity'])
+        car.boost = int(rec_car['boost'])
+        car.team = int(rec_car['team'])
+        car.has_wheel_contact = bool(rec_car['has_wheel_contact'])
+        car.jumped = bool(rec_car['jumped'])
+        car.double_jumped = bool(rec_car['double_jumped'])
+        car.is_super_sonic = bool(rec_car['is_super_sonic'])
+        car.is_demolished = bool(rec_car['is_demolished'])
+        car.name = names[i]
+
+    touch = record['touch']
+    latest_touch = packet.game_ball.latest_touch
+    latest_touch.time_seconds = float(touch['time_seconds'])
+    _set_vec(latest_touch.hit_location, touch['hit_location'])
+    _set_vec(latest_touch.hit_normal, touch['hit_normal'])
+    latest_touch.team = int(touch['team'])
+    player_index = int(touch['player_index'])
+    latest_touch.player_index = max(player_index, 0)
+    latest_touch.player_name = names[player_index] if 0 <= player_index < num_cars else ''
+
+    num_pads = int(record['num_pads'])
+    packet.num_boost = num_pads
+    for i in range(num_pads):
+        packet.game_boosts[i].is_active = bool(record['pads'][i]['is_active'])
+        packet.game_boosts[i].timer = float(record['pads'][i]['timer'])
+
+
+def recorded_packets(path, limit: int = None):
+    header, records = read_recording(path)
+    names = [name.decode('utf-8') or f'car{i}' for i, name in enumerate(header['names'])]
+    packet = GameTickPacket()
+    count = len(records) if limit is None else min(limit, len(records))
+
+    def packets():
+        for i in range(count):
+            packet_from_record(records[i], names, packet)
+            yield packet
+
+    return int(header['index']), int(header['team']), names[int(header['index'])], field_info_from_header(header), packets()
+
+
+def synthetic_packets(num_ticks: int, seed: int = 0, tick_rate: int = 120):
+    '''
+    A deterministic 1v1 scenario: the ball flies around with gravity and simple bounces,
+    both cars chase it along the ground, and the opponent periodically hits it
+    towards the blue goal (which exercises the touch-reset path of the bot).
+    '''
+    rng = random.Random(seed)
+    dt = 1 / tick_rate
+    names = ['Botimus', 'Opponent']
+    packet = GameTickPacket()
+    field_info = field_info_from_pads(SOCCAR_BOOST_PADS, SOCCAR_LARGE_PADS)
+
+    def packets():
+        ball_pos = [rng.uniform(-3000, 3000), rng.uniform(-4000, 4000), 500.0]
+        ball_vel = [rng.uniform(-1000, 1000), rng.uniform(-1000, 1000), 0.0]
+        cars = [[0.0, -4000.0, 17.0], [0.0, 4000.0, 17.0]]
+        touch_time = 0.0
+
+        packet.num_teams = 2
+        packet.num_cars = 2
+        packet.num_boost = len(SOCCAR_BOOST_PADS)
+        packet.game_info.is_round_active = True
+        packet.game_info.is_unlimited_time = True
+        packet.game_info.world_gravity_z = -650.0
+        packet.game_info.game_speed = 1.0
+        for team in range(2):
+            packet.teams[team].team_index = team
+        for i in range(len(SOCCAR_BOOST_PADS)):
+            packet.game_boosts[i].is_active = True
+
+        for tick in range(num_ticks):
+            t = tick * dt
+
+            ball_vel[2] -= 650 * dt
+            for axis in range(3):
+                ball_pos[axis] += ball_vel[axis] * dt
+            if ball_pos[2] < 93:
+                ball_pos[2] = 93
+                ball_vel[2] = abs(ball_vel[2]) * 0.6
+            for axis, limit in ((0, 4000), (1, 5000), (2, 1950)):
+                if abs(ball_pos[axis]) > limit:
+                    ball_pos[axis] = math.copysign(limit, ball_pos[axis])
+                    ball_vel[axis] *= -0.6
+
+            for i, car in enumerate(cars):
+                dx, dy = ball_pos[0] - car[0], ball_pos[1] - car[1]
+                dist = max(math.hypot(dx, dy), 1)
+                speed = 1400 if i == 0 else 1600
+                vel = (dx / dist * speed, dy / dist * speed, 0.0)
+                car[0] += vel[0] * dt
+                car[1] += vel[1] * dt
+
+                game_car = packet.game_cars[i]
+                _set_vec(game_car.physics.location, car)
+                _set_rot(game_car.physics.rotation, (0, math.atan2(dy, dx), 0))
+                _set_vec(game_car.physics.velocity, vel)
+                _set_vec(game_car.physics.angular_velocity, (0, 0, 0))
+                game_car.team = i
+                game_car.boost = 50
+                game_car.has_wheel_contact = True
+                game_car.name = names[i]
+
+                if i == 1 and dist < 200 and t > touch_time + 1:
+                    touch_time = t
+                    ball_vel = [rng.uniform(-800, 800), rng.uniform(-2500, -1000), rng.uniform(0, 800)]
+                    latest_touch = packet.game_ball.latest_touch
+                    latest_touch.time_seconds = t
+                    latest_touch.player_name = names[1]
+                    latest_touch.player_index = 1
+                    latest_touch.team = 1
+                    _set_vec(latest_touch.hit_location, ball_pos)
+
+            physics = packet.game_ball.physics
+            _set_vec(physics.location, ball_pos)
+            _set_vec(physics.velocity, ball_vel)
+            packet.game_info.seconds_elapsed = t
+            yield packet
+
+    return 0, 0, names[0], field_info, packets()
+
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+def run(index: int, team: int, name: str, field_info, packets, rendering=True, verbose=False, profiler=None,
+        render_sink=None, strategy=SoccarStrategy, workers: int = None):
+    agent = HeadlessBotimus(name, team, index, field_info)
+    agent.RENDERING = rendering
+    agent.RENDER_SINK = render_sink
+    agent.STRATEGY = strategy
+    if workers is not None:
+        agent.PARALLEL_WORKERS = workers
+    agent.initialize_agent()
+
+    phases = PhaseTimer()
+    phases.instrument(agent)
+
+    latencies = []
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        if profiler is not None:
+            profiler.enable()
+        for packet in packets:
+            start = time.perf_counter()
+            agent.get_output(packet)
+            latencies.append(time.perf_counter() - start)
+        if profiler is not None:
+            profiler.disable()
+    if agent.candidate_engine is not None:
+        agent.candidate_engine.close()
+    return latencies, phases, agent
+
+
+def report(latencies, phases: PhaseTimer, render_items: int = 0):
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    ms = 1000
+
+    print(f"ticks: {len(latencies)}  total: {total:.3f} s")
+    print("tick latency [ms]: mean {:.3f}  p50 {:.3f}  p90 {:.3f}  p99 {:.3f}  max {:.3f}".format(
+        total / max(len(latencies), 1) * ms,
+        percentile(ordered, 50) * ms,
+        percentile(ordered, 90) * ms,
+        percentile(ordered, 99) * ms,
+        (ordered[-1] if ordered else 0) * ms
+    ))
+
+    print(f"{'phase':<20}{'calls':>8}{'total ms':>12}{'ms/call':>10}{'share':>8}")
+    accounted = 0
+    for phase, phase_total in sorted(phases.totals.items(), key=lambda item: -item[1]):
+        accounted += phase_total
+        calls = phases.calls[phase]
+        print(f"{phase:<20}{calls:>8}{phase_total * ms:>12.2f}{phase_total / calls * ms:>10.3f}{phase_total / max(total, 1e-9):>8.1%}")
+    other = total - accounted
+    print(f"{'maneuver + other':<20}{len(latencies):>8}{other * ms:>12.2f}"
+          f"{other / max(len(latencies), 1) * ms:>10.3f}{other / max(total, 1e-9):>8.1%}")
+    if render_items:
+        print(f"render items sent: {render_items}  ({render_items / max(len(latencies), 1):.1f} per tick)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('recording', nargs='?', help="log written by PacketRecorder")
+    parser.add_argument('--synthetic', type=int, metavar='TICKS', help="replay a synthetic scenario instead")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ticks', type=int, help="only replay the first TICKS recorded ticks")
+    parser.add_argument('--no-render', action='store_true')
+    parser.add_argument('--render-sink', action='store_true', help="render into tools.render_viewer over UDP")
+    parser.add_argument('--verbose', action='store_true', help="don't swallow the bot's prints")
+    parser.add_argument('--profile', type=int, metavar='N', help="print the N most expensive functions")
+    parser.add_argument('--strategy', choices=STRATEGIES, default='soccar')
+    parser.add_argument('--workers', type=int, help="candidate engine workers, the agent's default if not given")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        source = synthetic_packets(args.synthetic, args.seed)
+    elif args.recording:
+        source = recorded_packets(args.recording, args.ticks)
+    else:
+        parser.error("either a recording or --synthetic is required")
+
+    profiler = cProfile.Profile() if args.profile else None
+    latencies, phases, agent = run(*source, rendering=not args.no_render, verbose=args.verbose, profiler=profiler,
+                                   render_sink=DEFAULT_ADDRESS if args.render_sink else None,
+                                   strategy=STRATEGIES[args.strategy], workers=args.workers)
+    report(latencies, phases, agent.renderer.items_drawn)
+
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(args.profile)
+
+
+if __name__ == '__main__':
+    main()
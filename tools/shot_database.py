@@ -0,0 +1,105 @@
+'''
+Offline generator of the shot outcome table used by Offense (see utils/shot_outcomes.py).
+
+Samples random car / ball configurations, builds every shot type in SHOT_TYPES at the orange goal,
+records whether it found a viable intercept and how long until it, then drives the shot with the
+RLUtilities car model to see whether the car actually gets to the ball.
+The table records which RLUtilities backend generated it, Offense only prunes with a table from its own backend,
+so generate it where the native module loads.
+Takes about 0.15 s per sample and CPU, most of it driving the shots.
+
+Run from the repository root:
+    python -m tools.shot_database --samples 12000 --jobs 4
+'''
+import argparse
+import multiprocessing
+import random
+import time
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3, norm
+from rlutilities.simulation import Car
+from rlutilities import mechanics
+
+from maneuvers.strikes.aerial_shot import AerialShot
+from maneuvers.strikes.dodge_shot import DodgeShot
+from maneuvers.strikes.ground_shot import GroundShot
+from maneuvers.strikes.wall_shot import WallShot
+from tools.simulation import random_configuration, predicted_info, step_maneuver, REACH_DISTANCE
+from utils.game_info import GameInfo
+from utils.shot_outcomes import ShotOutcomes, SHOT_TYPES, DEFAULT_PATH, shot_features, VIABLE, TIME, REACHED
+
+SHOTS = {'DodgeShot': DodgeShot, 'GroundShot': GroundShot, 'WallShot': WallShot, 'AerialShot': AerialShot}
+
+PREDICTION_TIME = 6.0
+DT = 1 / 60
+
+# the pure-Python RLUtilities fallback can't fly aerials, they then count as reached when viable
+CAN_FLY = hasattr(mechanics.Aerial, 'calculate_course')
+
+
+def drive_shot(shot, car: Car, info: GameInfo, intercept_time: float) -> bool:
+    '''Step the shot with the car model until the intercept time, return whether the car got to the ball.'''
+    closest = float('inf')
+    for _ in step_maneuver(shot, car, info, DT):
+        closest = min(closest, norm(car.position - info.ball.position))
+        if car.time >= intercept_time + 0.1:
+            break
+    return closest < REACH_DISTANCE
+
+
+def sample(rng: random.Random, target: vec3, simulate: bool = True):
+    car, ball = random_configuration(rng)
+    features = shot_features(car, ball, target)
+    outcomes = np.zeros((len(SHOT_TYPES), 3), dtype=np.float32)
+
+    for i, name in enumerate(SHOT_TYPES):
+        shot_car = Car(car)
+        info = predicted_info(ball, int(PREDICTION_TIME / DT), DT)
+        shot = SHOTS[name](shot_car, info, vec3(target))
+
+        viable = shot.intercept.is_viable
+        outcomes[i, VIABLE] = viable
+        outcomes[i, TIME] = shot.intercept.time - car.time if viable else PREDICTION_TIME
+        if viable and simulate and (CAN_FLY or name != 'AerialShot'):
+            outcomes[i, REACHED] = drive_shot(shot, shot_car, info, shot.intercept.time)
+        else:
+            outcomes[i, REACHED] = viable
+    return features, outcomes
+
+
+def generate(seed: int, count: int, simulate: bool = True):
+    rng = random.Random(seed)
+    target = vec3(0, 5120, 320)
+    samples = [sample(rng, target, simulate) for _ in range(count)]
+    return np.array([f for f, _ in samples]), np.array([o for _, o in samples])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=12000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes, each with its own seed")
+    parser.add_argument('--no-simulation', action='store_true', help="only record the intercepts")
+    parser.add_argument('--out', default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = [args.samples // args.jobs + (job < args.samples % args.jobs) for job in range(args.jobs)]
+    jobs = [(args.seed * 1000 + job, count, not args.no_simulation) for job, count in enumerate(counts)]
+    with multiprocessing.Pool(args.jobs) as pool:
+        results = pool.starmap(generate, jobs)
+    print(f"{args.samples} samples in {time.perf_counter() - start:.0f} s")
+
+    table = ShotOutcomes(np.concatenate([f for f, _ in results]), np.concatenate([o for _, o in results]))
+    table.save(args.out)
+    viable = table.outcomes[:, :, VIABLE].mean(axis=0)
+    reached = table.outcomes[:, :, REACHED].mean(axis=0)
+    for name, v, r in zip(SHOT_TYPES, viable, reached):
+        print(f"{name:<12} viable {v * 100:5.1f} %  reached {r * 100:5.1f} %")
+    print(f"saved {len(table)} samples to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
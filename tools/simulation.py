@@ -0,0 +1,115 @@
+'''
+Simulating maneuvers without the game, shared by the offline tools (tools/dry_run.py, tools/shot_database.py):
+random initial states, stepping a maneuver against the car model and the predicted ball, and the tuples
+cars and balls are sent to worker processes as, since RLUtilities cars and balls don't pickle.
+'''
+import random
+from typing import Iterator, Sequence, Tuple
+
+from rlutilities.linear_algebra import vec3, mat3, look_at
+from rlutilities.simulation import Car, Ball
+
+from maneuvers.kit import Maneuver
+from utils.game_info import GameInfo
+
+# the car got to the ball if its center came this close to the ball's center
+REACH_DISTANCE = 200
+
+
+def car_state(car: Car) -> Tuple[float, ...]:
+    '''Position, velocity, angular velocity, orientation, boost, time, on ground, jumped, double jumped.'''
+    return (
+        *car.position, *car.velocity, *car.angular_velocity,
+        *(car.orientation[i, j] for i in range(3) for j in range(3)),
+        car.boost, car.time, car.on_ground, car.jumped, car.double_jumped
+    )
+
+
+def car_from_state(state: Sequence[float]) -> Car:
+    car = Car()
+    car.position = vec3(*state[0:3])
+    car.velocity = vec3(*state[3:6])
+    car.angular_velocity = vec3(*state[6:9])
+    car.orientation = mat3(*state[9:18])
+    car.boost = state[18]
+    car.time = state[19]
+    car.on_ground, car.jumped, car.double_jumped = (bool(flag) for flag in state[20:23])
+    return car
+
+
+def ball_state(ball: Ball) -> Tuple[float, ...]:
+    '''Time, position, velocity, angular velocity.'''
+    return (ball.time, *ball.position, *ball.velocity, *ball.angular_velocity)
+
+
+def ball_from_state(state: Sequence[float]) -> Ball:
+    ball = Ball()
+    ball.time = state[0]
+    ball.position = vec3(*state[1:4])
+    ball.velocity = vec3(*state[4:7])
+    ball.angular_velocity = vec3(*state[7:10])
+    return ball
+
+
+def set_ball(ball: Ball, state: Ball):
+    '''
+    Copy `state` into `ball` keeping its vec3 objects, like GameInfo.read_packet does in the game: maneuvers can
+    hold on to info.ball.position (e.g. the dodge of a DodgeStrike aims at it) and expect it to follow the ball.
+    '''
+    ball.time = state.time
+    for destination, source in ((ball.position, state.position), (ball.velocity, state.velocity),
+                                (ball.angular_velocity, state.angular_velocity)):
+        destination[0], destination[1], destination[2] = source[0], source[1], source[2]
+
+
+def random_configuration(rng: random.Random) -> Tuple[Car, Ball]:
+    '''A car driving on the floor and a ball somewhere in the field, most of the time within a few seconds of it.'''
+    car = Car()
+    car.position = vec3(rng.uniform(-3800, 3800), rng.uniform(-4800, 4800), 17)
+    heading = vec3(rng.uniform(-1, 1), rng.uniform(-1, 1), 0)
+    car.orientation = look_at(heading, vec3(0, 0, 1))
+    car.velocity = car.forward() * rng.uniform(0, 2000)
+    car.boost = rng.uniform(0, 100)
+    car.on_ground = True
+
+    ball = Ball()
+    near = rng.random() < 0.7  # most decisions are about balls within a few seconds of the car
+    if near:
+        offset = vec3(rng.uniform(-2500, 2500), rng.uniform(-2500, 2500), 0)
+        ball.position = car.position + offset
+    else:
+        ball.position = vec3(rng.uniform(-3800, 3800), rng.uniform(-4800, 4800), 0)
+    ball.position = vec3(
+        max(-3900, min(3900, ball.position[0])), max(-4900, min(4900, ball.position[1])),
+        93 if rng.random() < 0.5 else rng.uniform(93, 1500)
+    )
+    ball.velocity = vec3(rng.uniform(-1500, 1500), rng.uniform(-1500, 1500), rng.uniform(-300, 1200))
+    return car, ball
+
+
+def predicted_info(ball: Ball, num_steps: int, dt: float) -> GameInfo:
+    '''A GameInfo with `ball` and its prediction, `num_steps` slices `dt` apart.'''
+    info = GameInfo(0, 0)
+    info.ball = Ball(ball)
+    info.predict_ball(num_steps, dt)
+    return info
+
+
+def step_maneuver(maneuver: Maneuver, car: Car, info: GameInfo, dt: float) -> Iterator[int]:
+    '''
+    Step `maneuver` and the car it drives at a fixed dt, with info.ball following the prediction in place (the
+    ball doesn't react to the car), until the maneuver finishes or the prediction runs out. The prediction has to
+    start at the car's time. Yields the number of steps done after each step; the controls of the step a maneuver
+    finishes in are still applied.
+    '''
+    start = car.time
+    predictions = info.ball_predictions
+    for steps in range(1, len(predictions) + 1):
+        maneuver.step(dt)
+        car.step(maneuver.controls, dt)
+        # the native car model advances its clock and the fallback doesn't, set it for both
+        car.time = start + steps * dt
+        set_ball(info.ball, predictions[steps - 1])
+        yield steps
+        if maneuver.finished:
+            return
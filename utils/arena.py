@@ -1,10 +1,15 @@
+import numpy as np
+
 from rlutilities.linear_algebra import vec3
+
+from utils.arena_model import ARENA_HALF_WIDTH, ARENA_HALF_LENGTH, ARENA_HEIGHT, FILLET_RADIUS, CORNER_OFFSET, \
+    GOAL_HALF_WIDTH, GOAL_HEIGHT, GOAL_DEPTH, arena_distance
 from utils.math import signclamp
 
 
 class Arena:
 
-    size = vec3(4096, 5120, 2044)
+    size = vec3(ARENA_HALF_WIDTH, ARENA_HALF_LENGTH, ARENA_HEIGHT)
 
     @classmethod
     def clamp(cls, pos: vec3, offset: float = 0) -> vec3:
@@ -17,3 +22,68 @@ class Arena:
     @classmethod
     def inside(cls, pos: vec3, offset: float = 0) -> bool:
         return abs(pos[0]) < cls.size[0] - offset and abs(pos[1]) < cls.size[1] - offset
+
+
+_FACE_NORMALS = np.array([
+    [1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0], [0, 0, 1], [0, 0, -1]
+], dtype=float)
+
+
+def arena_distance_many(points: np.ndarray):
+    '''
+    Vectorized version of arena_distance, the analytic soccar arena model used by the rlutilities fallback.
+    Takes an N×3 array of points, returns the signed distances to the arena surface (positive inside)
+    and the N×3 inward surface normals.
+    '''
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    r = FILLET_RADIUS
+    hx, hy, height = Arena.size[0] - r, Arena.size[1] - r, Arena.size[2]
+
+    # box with rounded inner edges: every point within `r` of the shrunk core box
+    core = np.clip(points, [-hx, -hy, r], [hx, hy, height - r])
+    delta = core - points
+    d = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+    outside_core = d > 1e-9
+
+    faces = np.stack([x + hx, hx - x, y + hy, hy - y, z - r, height - r - z], axis=1)
+    nearest_face = np.argmin(faces, axis=1)
+    face_depth = faces[np.arange(len(points)), nearest_face]
+
+    dist = np.where(outside_core, r - d, r + face_depth)
+    normals = np.where(
+        outside_core[:, None],
+        delta / np.where(outside_core, d, 1.0)[:, None],
+        _FACE_NORMALS[nearest_face]
+    )
+
+    # corner walls cut into the box
+    sx = np.where(x >= 0, 1.0, -1.0)
+    sy = np.where(y >= 0, 1.0, -1.0)
+    corner = (CORNER_OFFSET - sx * x - sy * y) / np.sqrt(2)
+    use_corner = corner < dist
+    if use_corner.any():
+        dist = np.where(use_corner, corner, dist)
+        corner_normals = np.stack([-sx, -sy, np.zeros_like(sx)], axis=1) / np.sqrt(2)
+        normals = np.where(use_corner[:, None], corner_normals, normals)
+
+    # goals are carved out of the back walls
+    in_goal = (np.abs(y) > Arena.size[1] - 1000) & (np.abs(x) < GOAL_HALF_WIDTH) & (z < GOAL_HEIGHT)
+    if in_goal.any():
+        goal_faces = np.stack([
+            GOAL_HALF_WIDTH - np.abs(x), Arena.size[1] + GOAL_DEPTH - np.abs(y), z, GOAL_HEIGHT - z
+        ], axis=1)
+        nearest_goal_face = np.argmin(goal_faces, axis=1)
+        goal = goal_faces[np.arange(len(points)), nearest_goal_face]
+        zeros, ones = np.zeros_like(sx), np.ones_like(sx)
+        goal_normals = np.stack([
+            np.stack([-sx, zeros, zeros], axis=1),
+            np.stack([zeros, -sy, zeros], axis=1),
+            np.stack([zeros, zeros, ones], axis=1),
+            np.stack([zeros, zeros, -ones], axis=1),
+        ], axis=1)[np.arange(len(points)), nearest_goal_face]
+        use_goal = in_goal & (goal > dist)
+        dist = np.where(use_goal, goal, dist)
+        normals = np.where(use_goal[:, None], goal_normals, normals)
+
+    return dist, normals
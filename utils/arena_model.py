@@ -0,0 +1,69 @@
+'''
+Dimensions of the soccar arena and the analytic model of its surface: a box with rounded floor/wall/ceiling
+edges, 45 degree corner walls and two goal boxes. Nothing here imports rlutilities: the pure-Python rlutilities
+fallback builds its arena from this while rlutilities is still loading. utils.kernels compiles arena_distance
+with Numba, so it only works on plain floats.
+'''
+import math
+
+ARENA_HALF_WIDTH = 4096.0
+ARENA_HALF_LENGTH = 5120.0
+ARENA_HEIGHT = 2044.0
+FILLET_RADIUS = 256.0
+CORNER_OFFSET = 8064.0  # |x| + |y| on the 45 degree corner walls
+GOAL_HALF_WIDTH = 893.0
+GOAL_HEIGHT = 642.775
+GOAL_DEPTH = 880.0
+
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+
+def arena_distance(x: float, y: float, z: float):
+    '''
+    Signed distance from a point to the arena surface (positive inside the arena) and the inward facing
+    surface normal at the nearest surface point, as (distance, normal x, normal y, normal z).
+    '''
+    r = FILLET_RADIUS
+    hx, hy = ARENA_HALF_WIDTH - r, ARENA_HALF_LENGTH - r
+
+    # box with rounded inner edges: every point within `r` of the shrunk core box
+    dx = min(max(x, -hx), hx) - x
+    dy = min(max(y, -hy), hy) - y
+    dz = min(max(z, r), ARENA_HEIGHT - r) - z
+    d = math.sqrt(dx * dx + dy * dy + dz * dz)
+    if d > 1e-9:
+        dist, nx, ny, nz = r - d, dx / d, dy / d, dz / d
+    else:
+        dist, nx, ny, nz = x + hx, 1.0, 0.0, 0.0
+        if hx - x < dist:
+            dist, nx, ny, nz = hx - x, -1.0, 0.0, 0.0
+        if y + hy < dist:
+            dist, nx, ny, nz = y + hy, 0.0, 1.0, 0.0
+        if hy - y < dist:
+            dist, nx, ny, nz = hy - y, 0.0, -1.0, 0.0
+        if z - r < dist:
+            dist, nx, ny, nz = z - r, 0.0, 0.0, 1.0
+        if ARENA_HEIGHT - r - z < dist:
+            dist, nx, ny, nz = ARENA_HEIGHT - r - z, 0.0, 0.0, -1.0
+        dist += r
+
+    # corner walls cut into the box
+    sx = 1.0 if x >= 0 else -1.0
+    sy = 1.0 if y >= 0 else -1.0
+    corner = (CORNER_OFFSET - sx * x - sy * y) * _INV_SQRT2
+    if corner < dist:
+        dist, nx, ny, nz = corner, -sx * _INV_SQRT2, -sy * _INV_SQRT2, 0.0
+
+    # goals are carved out of the back walls
+    if abs(y) > ARENA_HALF_LENGTH - 1000 and abs(x) < GOAL_HALF_WIDTH and z < GOAL_HEIGHT:
+        goal, gx, gy, gz = GOAL_HALF_WIDTH - abs(x), -sx, 0.0, 0.0
+        if ARENA_HALF_LENGTH + GOAL_DEPTH - abs(y) < goal:
+            goal, gx, gy, gz = ARENA_HALF_LENGTH + GOAL_DEPTH - abs(y), 0.0, -sy, 0.0
+        if z < goal:
+            goal, gx, gy, gz = z, 0.0, 0.0, 1.0
+        if GOAL_HEIGHT - z < goal:
+            goal, gx, gy, gz = GOAL_HEIGHT - z, 0.0, 0.0, -1.0
+        if goal > dist:
+            dist, nx, ny, nz = goal, gx, gy, gz
+
+    return dist, nx, ny, nz
@@ -0,0 +1,153 @@
+import os
+import tempfile
+from typing import Tuple
+
+import numpy as np
+
+from utils.arena import Arena, arena_distance_many, GOAL_DEPTH
+from utils.kernels import trilinear, GRAVITY
+from utils.vector_math import to_array
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+
+class ArenaSDF:
+    '''
+    Signed distance to the soccar arena surface (positive inside) and the inward surface normal,
+    sampled on a regular grid from utils.arena.arena_distance_many and interpolated trilinearly.
+    Models the corners, goals and fillets, unlike Arena.clamp / Arena.inside.
+
+    Building the grid takes a few hundred milliseconds, so it is saved to utils/cache/ the first time
+    and memory-mapped from there afterwards. Every query takes a single point or an (N, 3) array.
+    '''
+
+    SPACING = 64
+    MARGIN = 2 * SPACING
+    VERSION = 2
+
+    def __init__(self, grid: np.ndarray):
+        # (nx, ny, nz, 4), the distance and the x, y, z of the normal at every grid point
+        self.grid = grid
+        self.origin = -np.array([Arena.size[0], Arena.size[1] + GOAL_DEPTH, 0.0]) - self.MARGIN
+        self.shape = np.array(grid.shape[:3])
+
+        # flat (points, 4) view for utils.kernels.trilinear, a plain ndarray
+        # on top of the memory map so indexing doesn't go through np.memmap
+        self._values = np.asarray(grid).reshape(-1, 4)
+        self._strides = np.array([self.shape[1] * self.shape[2], self.shape[2], 1])
+        self._upper = (self.shape - 1.001).astype(float)
+
+    @classmethod
+    def grid_shape(cls) -> Tuple[int, int, int]:
+        extent = 2 * np.array([Arena.size[0], Arena.size[1] + GOAL_DEPTH, Arena.size[2] / 2]) + 2 * cls.MARGIN
+        return tuple(int(n) for n in np.ceil(extent / cls.SPACING).astype(int) + 1)
+
+    @classmethod
+    def build(cls) -> 'ArenaSDF':
+        shape = cls.grid_shape()
+        axes = [np.arange(n) * cls.SPACING for n in shape]
+        origin = -np.array([Arena.size[0], Arena.size[1] + GOAL_DEPTH, 0.0]) - cls.MARGIN
+        grid = np.empty(shape + (4,), dtype=np.float32)
+        # one x slice at a time, to keep the temporaries small. Outside the arena the analytic model jumps
+        # at the goal edges, so distances are floored to one cell there to not smear the jumps into the field.
+        for i, x in enumerate(axes[0]):
+            ys, zs = np.meshgrid(axes[1], axes[2], indexing='ij')
+            points = np.stack([np.full(ys.size, x), ys.ravel(), zs.ravel()], axis=1) + origin
+            dist, normals = arena_distance_many(points)
+            grid[i, :, :, 0] = np.maximum(dist, -cls.SPACING).reshape(ys.shape)
+            grid[i, :, :, 1:] = normals.reshape(ys.shape + (3,))
+        return cls(grid)
+
+    @classmethod
+    def cache_path(cls) -> str:
+        return os.path.join(CACHE_DIR, f'arena_sdf_v{cls.VERSION}_{cls.SPACING}.npy')
+
+    @classmethod
+    def load(cls) -> 'ArenaSDF':
+        '''Memory-map the cached grid, building and saving it first if there is none or it is stale.'''
+        path = cls.cache_path()
+        if os.path.exists(path):
+            grid = np.load(path, mmap_mode='r')
+            if grid.shape[:3] == cls.grid_shape():
+                return cls(grid)
+            del grid
+
+        field = cls.build()
+        try:
+            cls.save(field.grid, path)
+        except OSError:
+            return field  # read-only install, keep the grid in memory
+        return cls(np.load(path, mmap_mode='r'))
+
+    @staticmethod
+    def save(grid: np.ndarray, path: str):
+        '''
+        Write the grid next to `path` and move it into place, so another bot starting at the same time
+        never memory-maps a half written file, and the old file stays valid until the new one is complete.
+        '''
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.save(file, grid)
+            os.replace(temporary, path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def _sample(self, points) -> Tuple[np.ndarray, bool]:
+        '''Trilinearly interpolated grid values (N, 4) and whether the input was a single point.'''
+        points = to_array(points)
+        single = points.ndim == 1
+        values = trilinear(self._values, self._strides, self._upper, self.origin, self.SPACING,
+                           np.atleast_2d(points))
+        return values, single
+
+    def distance(self, points):
+        '''Signed distance to the arena surface, positive inside.'''
+        values, single = self._sample(points)
+        return values[0, 0] if single else values[:, 0]
+
+    def query(self, points):
+        '''Signed distance to the arena surface and the inward unit normal of the nearest surface.'''
+        values, single = self._sample(points)
+        dist, normals = values[:, 0], values[:, 1:]
+        normals = normals / np.maximum(np.linalg.norm(normals, axis=1), 1e-6)[:, None]
+        return (dist[0], normals[0]) if single else (dist, normals)
+
+    def nearest_surface(self, points):
+        '''Closest point on the arena surface.'''
+        dist, normals = self.query(points)
+        return to_array(points) - normals * np.expand_dims(dist, -1)
+
+    def inside(self, points, offset: float = 0):
+        '''Whether the points are at least `offset` away from every surface, on the inner side.'''
+        return self.distance(points) > offset
+
+    def first_contact(self, positions, radius: float, skip: int = 0) -> int:
+        '''Index of the first of the (N, 3) positions where a sphere of `radius` touches the arena, -1 if none.'''
+        hits = np.flatnonzero(self.distance(positions[skip:]) < radius)
+        return int(hits[0]) + skip if len(hits) else -1
+
+    def falling_contact(self, position: np.ndarray, velocity: np.ndarray, radius: float, num_points: int,
+                        dt: float, skip: int = 0) -> Tuple[int, np.ndarray]:
+        '''
+        Follow a body flying without any input for `num_points` steps of `dt` and find the first step where
+        a sphere of `radius` around it touches the arena. Returns the step index (-1 if none) and the (N, 3) path.
+        '''
+        times = np.arange(1, num_points + 1) * dt
+        positions = position + np.outer(times, velocity)
+        positions[:, 2] += 0.5 * GRAVITY * times ** 2
+        return self.first_contact(positions, radius, skip), positions
+
+
+_arena_sdf = None
+
+
+def arena_sdf() -> ArenaSDF:
+    '''The shared ArenaSDF, loaded on the first call.'''
+    global _arena_sdf
+    if _arena_sdf is None:
+        _arena_sdf = ArenaSDF.load()
+    return _arena_sdf
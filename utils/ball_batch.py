@@ -0,0 +1,125 @@
+from typing import List
+
+import numpy as np
+
+from rlutilities.simulation import Ball, Game
+
+from utils.arena import Arena, arena_distance_many, FILLET_RADIUS, CORNER_OFFSET
+from utils.vector_math import to_array, to_vec3
+
+
+class BallBatch:
+    '''
+    Many hypothetical balls advanced together with the same bounce model as Ball.step
+    (gravity, drag, spin, bounces off the arena surfaces and rounded edges).
+    State is stored in N×3 arrays; all balls share the same clock.
+    Also tracks which balls went into a goal: `goal` is -1 for the blue goal, 1 for the orange goal.
+    '''
+
+    # surface interaction coefficients of the RLUtilities bounce model
+    mu = 0.285
+    spin_coupling = 0.0003
+    friction_ratio = 2.0
+
+    core = (Arena.size[0] - FILLET_RADIUS, Arena.size[1] - FILLET_RADIUS)
+
+    def __init__(self, positions, velocities, angular_velocities=None, time: float = 0.0):
+        self.position = np.array(positions, dtype=float).reshape(-1, 3)
+        self.velocity = np.array(velocities, dtype=float).reshape(-1, 3)
+        if angular_velocities is None:
+            self.angular_velocity = np.zeros_like(self.position)
+        else:
+            self.angular_velocity = np.array(angular_velocities, dtype=float).reshape(-1, 3)
+        self.time = time
+
+        self.goal = np.zeros(len(self), dtype=np.int8)
+        self.goal_time = np.full(len(self), -1.0)
+
+    def __len__(self):
+        return len(self.position)
+
+    @classmethod
+    def from_balls(cls, balls: List[Ball]) -> 'BallBatch':
+        return cls(
+            to_array([ball.position for ball in balls]),
+            to_array([ball.velocity for ball in balls]),
+            to_array([ball.angular_velocity for ball in balls]),
+            balls[0].time if balls else 0.0
+        )
+
+    def ball(self, i: int) -> Ball:
+        ball = Ball()
+        ball.position = to_vec3(self.position[i])
+        ball.velocity = to_vec3(self.velocity[i])
+        ball.angular_velocity = to_vec3(self.angular_velocity[i])
+        ball.time = self.time
+        return ball
+
+    def step(self, dt: float):
+        p, v, w = self.position, self.velocity, self.angular_velocity
+        r = Ball.collision_radius
+
+        # away from the walls only the floor and the ceiling can be hit,
+        # the full arena model is needed just for balls outside of the fillet core or near the corners
+        x, y, z = p[:, 0], p[:, 1], p[:, 2]
+        height = Arena.size[2]
+        walls = (
+            (np.abs(x) > self.core[0]) | (np.abs(y) > self.core[1])
+            | (np.abs(x) + np.abs(y) > CORNER_OFFSET - r * np.sqrt(2))
+        )
+        dist = np.where(z < height / 2, z, height - z)
+        n = np.zeros_like(p)
+        n[:, 2] = np.where(z < height / 2, 1.0, -1.0)
+        if walls.any():
+            dist[walls], n[walls] = arena_distance_many(p[walls])
+
+        contact = np.flatnonzero(dist < r)
+        if len(contact):
+            dist, n = dist[contact], n[contact]
+            vn = np.einsum('ij,ij->i', v[contact], n)
+            bounce = vn < 0
+            if bounce.any():
+                bi = contact[bounce]
+                nb, vb, wb, vnb = n[bounce], v[bi], w[bi], vn[bounce]
+                v_perp = nb * vnb[:, None]
+                s = vb - v_perp + r * np.cross(nb, wb)
+                ratio = np.abs(vnb) / np.maximum(np.linalg.norm(s, axis=1), 0.0001)
+                dv_para = s * (-np.minimum(1.0, self.friction_ratio * ratio) * self.mu)[:, None]
+                v[bi] = vb - (1.0 + Ball.restitution) * v_perp + dv_para
+                w[bi] = wb + self.spin_coupling * r * np.cross(dv_para, nb)
+            p[contact] += n * (r - dist)[:, None]
+
+        v += v * (Ball.drag * dt)
+        v[:, 2] += Game.gravity * dt
+
+        speed = np.linalg.norm(v, axis=1)
+        too_fast = speed > Ball.max_speed
+        if too_fast.any():
+            v[too_fast] *= (Ball.max_speed / speed[too_fast])[:, None]
+
+        omega = np.linalg.norm(w, axis=1)
+        spinning = omega > Ball.max_omega
+        if spinning.any():
+            w[spinning] *= (Ball.max_omega / omega[spinning])[:, None]
+
+        p += v * dt
+        self.time += dt
+
+        scored = (self.goal == 0) & (np.abs(p[:, 1]) > Arena.size[1])
+        if scored.any():
+            self.goal[scored] = np.sign(p[scored, 1]).astype(np.int8)
+            self.goal_time[scored] = self.time
+
+    def simulate(self, num_steps: int, dt: float, record_every: int = 1):
+        '''
+        Step `num_steps` times and return the recorded times (T,), positions (T×N×3) and velocities (T×N×3),
+        sampled every `record_every` steps.
+        '''
+        times, positions, velocities = [], [], []
+        for i in range(1, num_steps + 1):
+            self.step(dt)
+            if i % record_every == 0:
+                times.append(self.time)
+                positions.append(self.position.copy())
+                velocities.append(self.velocity.copy())
+        return np.array(times), np.array(positions), np.array(velocities)
@@ -0,0 +1,169 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Car
+
+from utils.misc import estimate_max_car_speed, estimate_time_many
+from utils.vector_math import to_array
+
+
+class BoostPad:
+    '''
+    Stand-in for rlutilities Pad that stays valid between ticks.
+    `timer` is the time left until the pad respawns (0 when it is active).
+    '''
+    __slots__ = ('index', 'position', 'is_full_boost', 'is_active', 'timer')
+
+    def __init__(self, index: int, position: vec3, is_full_boost: bool):
+        self.index = index
+        self.position = position
+        self.is_full_boost = is_full_boost
+        self.is_active = True
+        self.timer = 0.0
+
+    @property
+    def amount(self) -> float:
+        return BoostPadIndex.LARGE_AMOUNT if self.is_full_boost else BoostPadIndex.SMALL_AMOUNT
+
+
+class BoostPadIndex:
+    '''
+    All boost pads of the map, built once from the field info.
+    Keeps track of when every pad becomes available and answers nearest/soonest queries
+    through a uniform grid over the field instead of scanning every pad.
+    '''
+
+    LARGE_AMOUNT = 100
+    SMALL_AMOUNT = 12
+    LARGE_RESPAWN = 10.0
+    SMALL_RESPAWN = 4.0
+
+    CELL_SIZE = 1024.0
+
+    def __init__(self, field_info):
+        num_pads = field_info.num_boosts
+        self.positions = np.array([
+            [pad.location.x, pad.location.y, pad.location.z] for pad in field_info.boost_pads[:num_pads]
+        ], dtype=float).reshape(-1, 3)
+        self.is_full_boost = np.array([pad.is_full_boost for pad in field_info.boost_pads[:num_pads]], dtype=bool)
+        self.amounts = np.where(self.is_full_boost, self.LARGE_AMOUNT, self.SMALL_AMOUNT)
+
+        self.pads = [BoostPad(i, vec3(*self.positions[i]), bool(self.is_full_boost[i])) for i in range(num_pads)]
+        self.large_pads = [pad for pad in self.pads if pad.is_full_boost]
+        self.small_pads = [pad for pad in self.pads if not pad.is_full_boost]
+
+        # game time at which each pad is (or becomes) active
+        self.active = np.ones(num_pads, dtype=bool)
+        self.ready_time = np.zeros(num_pads)
+        self.time = 0.0
+        # incremented whenever a pad is picked up or respawns, for caches built on top of the pad states
+        self.version = 0
+        self._state_dtype: np.dtype = None
+
+        cells = {}
+        for i, (x, y, _) in enumerate(self.positions):
+            cells.setdefault(self._cell(x, y), []).append(i)
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {cell: np.array(indices) for cell, indices in cells.items()}
+        if cells:
+            self._max_ring = max(max(abs(cx), abs(cy)) for cx, cy in cells) * 2 + 2
+        else:
+            self._max_ring = 0
+
+    def __len__(self):
+        return len(self.pads)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.CELL_SIZE)), int(math.floor(y / self.CELL_SIZE))
+
+    def update(self, packet, time: float):
+        '''Read the pad states of this tick. Only pads that are or were inactive need any work.'''
+        self.time = time
+        num_pads = min(len(self.pads), packet.num_boost)
+        # a view of the packet's ctypes array, reading the flags one struct at a time costs more than the rest
+        if self._state_dtype is None:
+            self._state_dtype = np.dtype(packet.game_boosts._type_)
+        game_boosts = np.frombuffer(packet.game_boosts, dtype=self._state_dtype)[:num_pads]
+        is_active = game_boosts['is_active']
+        for i in np.flatnonzero(~(is_active & self.active[:num_pads])).tolist():
+            pad = self.pads[i]
+            active = bool(is_active[i])
+            if active != self.active[i]:
+                self.version += 1
+            pad.is_active = self.active[i] = active
+            if active:
+                pad.timer = 0.0
+                self.ready_time[i] = time
+            else:
+                # the packet timer counts the time since the pad was picked up
+                respawn = self.LARGE_RESPAWN if pad.is_full_boost else self.SMALL_RESPAWN
+                pad.timer = max(0.0, respawn - float(game_boosts['timer'][i]))
+                self.ready_time[i] = time + pad.timer
+
+    def etas(self, car: Car, indices=None) -> np.ndarray:
+        '''Rough time for the car to reach the pads, see utils.misc.estimate_time.'''
+        positions = self.positions if indices is None else self.positions[indices]
+        return estimate_time_many(car, positions, estimate_max_car_speed(car))
+
+    def available_at_arrival(self, car: Car, indices=None) -> np.ndarray:
+        '''Whether each pad will be active by the time the car gets to it.'''
+        ready = self.ready_time if indices is None else self.ready_time[indices]
+        return ready <= self.time + self.etas(car, indices)
+
+    def nearest(self, pos: vec3, car: Car = None, large_only=False, cost_factors: np.ndarray = None) -> BoostPad:
+        '''
+        Nearest pad to `pos`, optionally only large ones and only those that will be active
+        when `car` arrives. `cost_factors` scale the distance of each pad (e.g. to prefer large pads).
+        Searches rings of grid cells outwards from `pos` until no closer pad can exist.
+        '''
+        cx, cy = self._cell(pos[0], pos[1])
+        point = to_array(pos)
+        min_factor = 1.0 if cost_factors is None else max(float(cost_factors.min()), 1e-6)
+
+        best, best_cost = None, math.inf
+        for ring in range(self._max_ring + 1):
+            candidates = [
+                self._cells[cell] for cell in self._ring(cx, cy, ring) if cell in self._cells
+            ]
+            if candidates:
+                indices = np.concatenate(candidates)
+                if large_only:
+                    indices = indices[self.is_full_boost[indices]]
+                if car is not None and len(indices):
+                    indices = indices[self.available_at_arrival(car, indices)]
+                if len(indices):
+                    costs = np.linalg.norm(self.positions[indices] - point, axis=1)
+                    if cost_factors is not None:
+                        costs = costs * cost_factors[indices]
+                    i = int(np.argmin(costs))
+                    if costs[i] < best_cost:
+                        best, best_cost = int(indices[i]), costs[i]
+
+            # every cell of the next ring is at least this far away
+            if best is not None and ring * self.CELL_SIZE * min_factor > best_cost:
+                break
+
+        return None if best is None else self.pads[best]
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> List[Tuple[int, int]]:
+        if ring == 0:
+            return [(cx, cy)]
+        cells = []
+        for dx in range(-ring, ring + 1):
+            cells.append((cx + dx, cy - ring))
+            cells.append((cx + dx, cy + ring))
+        for dy in range(-ring + 1, ring):
+            cells.append((cx - ring, cy + dy))
+            cells.append((cx + ring, cy + dy))
+        return cells
+
+    def soonest_available(self, car: Car, large_only=False) -> BoostPad:
+        '''The pad the car can pick up the soonest, waiting for it to respawn if needed.'''
+        indices = np.flatnonzero(self.is_full_boost) if large_only else np.arange(len(self.pads))
+        if not len(indices):
+            return None
+        pickup_time = np.maximum(self.etas(car, indices), self.ready_time[indices] - self.time)
+        return self.pads[int(indices[np.argmin(pickup_time)])]
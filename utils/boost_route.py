@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Car
+
+from utils.boost_pads import BoostPadIndex, BoostPad
+from utils.misc import estimate_max_car_speed
+from utils.vector_math import to_array
+
+
+class BoostRoute:
+    def __init__(self, pads: List[BoostPad], boost: float, duration: float):
+        self.pads = pads
+        self.boost = boost
+        self.duration = duration
+
+
+class BoostRoutePlanner:
+    '''
+    Picks a chain of boost pads to drive over on the way to a destination,
+    gaining as much boost as possible while still arriving within the time budget.
+    Uses a straight-line ETA model with a fixed time penalty for every pad on the route.
+    '''
+
+    # time lost by steering over a pad instead of driving straight
+    TURN_PENALTY = 0.25
+    MAX_PADS = 3
+    # only the pads with the smallest detours are considered
+    MAX_CANDIDATES = 8
+
+    # plans are cached by coarse car state, destination and time budget
+    CACHE_CELL = 256.0
+    CACHE_SIZE = 256
+
+    def __init__(self, pads: BoostPadIndex):
+        self.pads = pads
+        self._cache = OrderedDict()
+
+    def _cache_key(self, car: Car, destination: vec3, time_budget: float):
+        cell = self.CACHE_CELL
+        return (
+            round(car.position[0] / cell), round(car.position[1] / cell), round(car.boost / 10),
+            round(destination[0] / cell), round(destination[1] / cell), round(time_budget * 4),
+            self.pads.version
+        )
+
+    def plan(self, car: Car, destination: vec3, time_budget: float) -> BoostRoute:
+        key = self._cache_key(car, destination, time_budget)
+        route = self._cache.get(key)
+        if route is None:
+            route = self._plan(car, destination, time_budget)
+            self._cache[key] = route
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return route
+
+    def _plan(self, car: Car, destination: vec3, time_budget: float) -> BoostRoute:
+        pads = self.pads
+        speed = estimate_max_car_speed(car)
+        start = to_array(car.position) * [1, 1, 0]
+        end = to_array(destination) * [1, 1, 0]
+        direct = np.linalg.norm(end - start)
+        needed = 100 - car.boost
+
+        positions = pads.positions.copy()
+        positions[:, 2] = 0
+        to_start = np.linalg.norm(positions - start, axis=1)
+        to_end = np.linalg.norm(positions - end, axis=1)
+        detours = to_start + to_end - direct
+
+        best = BoostRoute([], 0, direct / speed)
+        slack = time_budget * speed - direct
+        if slack <= 0 or needed <= 0 or not len(pads):
+            return best
+
+        candidates = np.flatnonzero(detours < slack)
+        candidates = candidates[np.argsort(detours[candidates])][:self.MAX_CANDIDATES]
+        if not len(candidates):
+            return best
+
+        # plain lists, the search below indexes single elements
+        points = positions[candidates]
+        between = (np.linalg.norm(points[:, None] - points[None], axis=2) / speed).tolist()
+        from_start = (to_start[candidates] / speed).tolist()
+        to_goal = (to_end[candidates] / speed).tolist()
+        ready = (pads.ready_time[candidates] - pads.time).tolist()
+        amounts = pads.amounts[candidates].tolist()
+
+        best_boost, best_duration, best_route = 0, best.duration, []
+
+        # depth first search over short chains of candidate pads
+        stack = [([], 0.0, 0.0)]
+        while stack:
+            route, elapsed, gained = stack.pop()
+            for j in range(len(candidates)):
+                if j in route:
+                    continue
+                arrival = elapsed + (between[route[-1]][j] if route else from_start[j]) + self.TURN_PENALTY
+                if ready[j] > arrival or arrival + to_goal[j] > time_budget:
+                    continue
+
+                boost = min(needed, gained + amounts[j])
+                duration = arrival + to_goal[j]
+                if boost > best_boost or (boost == best_boost and duration < best_duration):
+                    best_boost, best_duration, best_route = boost, duration, route + [j]
+
+                if len(route) + 1 < self.MAX_PADS and boost < needed:
+                    stack.append((route + [j], arrival, boost))
+
+        return BoostRoute([pads.pads[int(candidates[j])] for j in best_route], best_boost, best_duration)
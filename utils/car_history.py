@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class CarHistory:
+    '''
+    Ring buffer with the last `size` ticks of every car's position, velocity, boost and ground contact,
+    plus the time of every car's last jump.
+    Derived quantities are computed over the whole roster at once, on first use, and cached until the next tick.
+    '''
+
+    SIZE = 32
+    # number of ticks the finite differences are taken over, to smooth out packet noise
+    DERIVATIVE_WINDOW = 8
+
+    def __init__(self, num_cars: int, size: int = SIZE):
+        self.num_cars = num_cars
+        self.size = size
+        self.count = 0
+        self._head = -1
+
+        self.times = np.zeros(size)
+        self.positions = np.zeros((num_cars, size, 3))
+        self.velocities = np.zeros((num_cars, size, 3))
+        self.boosts = np.zeros((num_cars, size))
+        self.on_ground = np.zeros((num_cars, size), dtype=bool)
+
+        # game time of each car's last jump, its first or its second (a double jump or a dodge), kept outside
+        # the buffer since jumps can be older than it. The packets show a jump with the jumped flags a tick
+        # after its input, cars whose jump input is known record it with record_jump_input as it is sent
+        self.jump_times = np.full(num_cars, -np.inf)
+        self.jumped = np.zeros(num_cars, dtype=bool)
+        self.double_jumped = np.zeros(num_cars, dtype=bool)
+        self._jump_held = np.zeros(num_cars, dtype=bool)
+        self._jump_sent = np.zeros(num_cars, dtype=bool)
+
+        self._cache = {}
+
+    def __len__(self):
+        return self.count
+
+    def record(self, time: float, positions: np.ndarray, velocities: np.ndarray,
+               boosts: np.ndarray, on_ground: np.ndarray, jumped: np.ndarray, double_jumped: np.ndarray):
+        '''Store one tick of state, the arrays are indexed by car like GameInfo.cars.'''
+        if self.count and time <= self.times[self._head]:
+            return
+        if self.count:
+            # a jump flag that got set, unless the jump input was already recorded since the previous tick
+            jumps = (jumped & ~self.jumped) | (double_jumped & ~self.double_jumped)
+            self.jump_times[jumps & ~self._jump_sent] = time
+        self._jump_sent[:] = False
+        self.jumped[:] = jumped
+        self.double_jumped[:] = double_jumped
+
+        self._head = (self._head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.times[self._head] = time
+        self.positions[:, self._head] = positions
+        self.velocities[:, self._head] = velocities
+        self.boosts[:, self._head] = boosts
+        self.on_ground[:, self._head] = on_ground
+        self._cache.clear()
+
+    def record_jump_input(self, car: int, time: float, jump: bool):
+        '''
+        The jump input sent for car `car` at `time`. Pressing it while the car has a jump left counts as a jump
+        right away, instead of when the next packet shows it.
+        '''
+        if jump and not self._jump_held[car] and self.count and (
+            self.on_ground[car, self._head] or not self.double_jumped[car]
+        ):
+            self.jump_times[car] = time
+            self._jump_sent[car] = True
+        self._jump_held[car] = jump
+
+    def ticks_ago(self, ticks: int) -> int:
+        '''Buffer slot of the sample recorded `ticks` ticks before the latest one (clamped to the oldest).'''
+        return (self._head - min(ticks, self.count - 1)) % self.size
+
+    def window(self, ticks: int = None) -> np.ndarray:
+        '''Buffer slots of the last `ticks` samples, oldest first.'''
+        ticks = self.count if ticks is None else min(ticks, self.count)
+        return (self._head - np.arange(ticks)[::-1]) % self.size
+
+    def _cached(self, name, compute):
+        value = self._cache.get(name)
+        if value is None:
+            value = self._cache[name] = compute()
+        return value
+
+    def _span(self):
+        old, new = self.ticks_ago(self.DERIVATIVE_WINDOW), self._head
+        return old, new, max(self.times[new] - self.times[old], 1e-6)
+
+    def acceleration(self) -> np.ndarray:
+        '''(num_cars, 3) average acceleration over the derivative window.'''
+        def compute():
+            if self.count < 2:
+                return np.zeros((self.num_cars, 3))
+            old, new, dt = self._span()
+            return (self.velocities[:, new] - self.velocities[:, old]) / dt
+        return self._cached('acceleration', compute)
+
+    def turn_rate(self) -> np.ndarray:
+        '''(num_cars,) rate of change of the ground velocity heading in rad/s, positive is counterclockwise.'''
+        def compute():
+            if self.count < 2:
+                return np.zeros(self.num_cars)
+            old, new, dt = self._span()
+            v0, v1 = self.velocities[:, old, :2], self.velocities[:, new, :2]
+            cross = v0[:, 0] * v1[:, 1] - v0[:, 1] * v1[:, 0]
+            dot = np.einsum('ij,ij->i', v0, v1)
+            # headings of nearly stationary cars are meaningless
+            moving = np.minimum(np.linalg.norm(v0, axis=1), np.linalg.norm(v1, axis=1)) > 100
+            return np.where(moving, np.arctan2(cross, dot) / dt, 0.0)
+        return self._cached('turn_rate', compute)
+
+    def boost_usage(self) -> np.ndarray:
+        '''(num_cars,) boost spent per second over the whole buffer, pickups are not counted.'''
+        def compute():
+            if self.count < 2:
+                return np.zeros(self.num_cars)
+            slots = self.window()
+            spent = np.maximum(0, -np.diff(self.boosts[:, slots], axis=1)).sum(axis=1)
+            return spent / max(self.times[slots[-1]] - self.times[slots[0]], 1e-6)
+        return self._cached('boost_usage', compute)
+
+    def time_since_jump(self) -> np.ndarray:
+        '''(num_cars,) time since each car last jumped or dodged, inf if it hasn't since recording started.'''
+        def compute():
+            if not self.count:
+                return np.full(self.num_cars, np.inf)
+            return self.times[self._head] - self.jump_times
+        return self._cached('time_since_jump', compute)
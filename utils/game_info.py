@@ -1,8 +1,18 @@
-from typing import List
+from typing import List, Tuple
+
+import numpy as np
 
 from rlutilities.simulation import Game, Car, Ball, Pad
 from rlutilities.linear_algebra import vec3
 
+from utils.touch_ensemble import TouchEnsemble
+from utils.boost_pads import BoostPadIndex, BoostPad
+from utils.boost_route import BoostRoutePlanner
+from utils.car_history import CarHistory
+from utils.opponent_prediction import OpponentPrediction
+from utils.static_reach import StaticReachField
+from utils.vector_math import to_array
+
 
 class Goal:
 
@@ -32,37 +42,123 @@ class GameInfo(Game):
 
         self.ball_predictions: List[Ball] = list()
 
+        self.touch_ensemble: TouchEnsemble = None
+        self.touch_threat = np.zeros(0)
+
         self.teammates: List[Car] = []
         self.opponents: List[Car] = []
-        self.large_boost_pads: List[Pad] = []
+
+        # the roster only changes when cars join or leave. The Car objects are fetched again every tick,
+        # the native backend converts `cars` into new copies on every access
+        self.roster_size = -1
+        self.teammate_indices = np.zeros(0, dtype=int)
+        self.opponent_indices = np.zeros(0, dtype=int)
+        self.other_car_indices = np.zeros(0, dtype=int)
+        self.car_positions = np.zeros((0, 3))
+        self.car_velocities = np.zeros((0, 3))
+        self.car_forwards = np.zeros((0, 3))
+        self.car_boosts = np.zeros(0)
+        self.car_on_ground = np.zeros(0, dtype=bool)
+        self.car_jumped = np.zeros(0, dtype=bool)
+        self.car_double_jumped = np.zeros(0, dtype=bool)
+        self.history = CarHistory(0)
+        self._opponent_prediction: OpponentPrediction = None
+        self._static_reach = StaticReachField()
+        self._static_reach_time = -1.0
+
+        self.boost_pads: BoostPadIndex = None
+        self.boost_routes: BoostRoutePlanner = None
+        self.large_boost_pads: List[BoostPad] = []
 
     def read_packet(self, packet, field_info):
         self.read_game_information(packet, field_info)
-        self.teammates = self.get_teammates()
-        self.opponents = self.get_opponents()
-        self.large_boost_pads = self.get_large_boost_pads()
-        
-    def get_large_boost_pads(self) -> List[Pad]:
-        return [self.pads[3], 
-                self.pads[4], 
-                self.pads[15],
-                self.pads[18],
-                self.pads[29],
-                self.pads[30]]
-
-    def get_teammates(self) -> List[Car]:
-        cars: List[Car] = []
-        for i in range(self.num_cars):
-            if self.cars[i].team == self.team and self.cars[i].id != self.id:
-                cars.append(self.cars[i])
-        return cars
-
-    def get_opponents(self) -> List[Car]:
-        cars: List[Car] = []
-        for i in range(self.num_cars):
-            if self.cars[i].team != self.team:
-                cars.append(self.cars[i])
-        return cars
+        cars = self.cars
+        if self.num_cars != self.roster_size:
+            self.update_roster(cars)
+        self.teammates = [cars[i] for i in self.teammate_indices.tolist()]
+        self.opponents = [cars[i] for i in self.opponent_indices.tolist()]
+        self.update_car_states(cars)
+        self._opponent_prediction = None
+        if self.boost_pads is None:
+            self.boost_pads = BoostPadIndex(field_info)
+            self.boost_routes = BoostRoutePlanner(self.boost_pads)
+            self.large_boost_pads = self.boost_pads.large_pads
+        self.boost_pads.update(packet, packet.game_info.seconds_elapsed)
+
+    def update_roster(self, cars: List[Car]):
+        self.roster_size = self.num_cars
+        self.teammate_indices = np.array([
+            i for i in range(self.num_cars) if cars[i].team == self.team and cars[i].id != self.id
+        ], dtype=int)
+        self.opponent_indices = np.array([
+            i for i in range(self.num_cars) if cars[i].team != self.team
+        ], dtype=int)
+        self.other_car_indices = np.concatenate([self.teammate_indices, self.opponent_indices])
+        # one row per car, filled with a single assignment per tick, the columns are views into it
+        self._car_states = np.zeros((self.num_cars, 13))
+        self.car_positions = self._car_states[:, 0:3]
+        self.car_velocities = self._car_states[:, 3:6]
+        self.car_forwards = self._car_states[:, 6:9]
+        self.car_boosts = self._car_states[:, 9]
+        self.car_on_ground = np.zeros(self.num_cars, dtype=bool)
+        self.car_jumped = np.zeros(self.num_cars, dtype=bool)
+        self.car_double_jumped = np.zeros(self.num_cars, dtype=bool)
+        self.history = CarHistory(self.num_cars)
+        our_indices = np.concatenate([[self.id], self.teammate_indices]).astype(int)
+        self._static_reach.set_roster(our_indices, self.opponent_indices, self.num_cars)
+        self._static_reach_time = -1.0
+
+    def update_car_states(self, cars: List[Car]):
+        self._car_states[:] = [
+            (*car.position, *car.velocity, *car.forward(), car.boost, car.on_ground, car.jumped, car.double_jumped)
+            for car in cars[:self.num_cars]
+        ]
+        np.greater(self._car_states[:, 10], 0.5, out=self.car_on_ground)
+        np.greater(self._car_states[:, 11], 0.5, out=self.car_jumped)
+        np.greater(self._car_states[:, 12], 0.5, out=self.car_double_jumped)
+        self.history.record(self.time, self.car_positions, self.car_velocities, self.car_boosts, self.car_on_ground,
+                            self.car_jumped, self.car_double_jumped)
+
+    @property
+    def static_reach(self) -> StaticReachField:
+        '''The static reach field, brought up to date with the car states on the first use in a tick.'''
+        if self._static_reach_time != self.time:
+            self._static_reach.update(
+                self.time, self.car_positions, self.car_velocities, self.car_forwards, self.car_boosts
+            )
+            self._static_reach_time = self.time
+        return self._static_reach
+
+    def cars_near(self, pos: vec3, radius: float, indices: np.ndarray) -> np.ndarray:
+        '''Indices (out of `indices`) of the cars within `radius` of `pos`.'''
+        # there are only a handful of cars, plain Python beats the overhead of small numpy operations
+        x, y, z = pos[0], pos[1], pos[2]
+        positions = self.car_positions.tolist()
+        return np.array([
+            i for i in indices.tolist()
+            if (positions[i][0] - x) ** 2 + (positions[i][1] - y) ** 2 + (positions[i][2] - z) ** 2 < radius ** 2
+        ], dtype=int)
+
+    def predict_opponents(self) -> OpponentPrediction:
+        '''Trajectories of all opponents, shared by everything that asks during the same tick.'''
+        if self._opponent_prediction is None:
+            horizon, dt = OpponentPrediction.HORIZON, OpponentPrediction.DT
+            times = self.time + np.arange(int(round(horizon / dt)) + 1) * dt
+            balls = self.ball_predictions
+            if len(balls) > 1:
+                step = balls[1].time - balls[0].time
+                slices = np.clip(np.round((times - balls[0].time) / step).astype(int), 0, len(balls) - 1)
+                ball_positions = to_array([balls[i] for i in slices])
+            else:
+                ball_positions = np.tile(to_array(self.ball), (len(times), 1))
+
+            indices = self.opponent_indices
+            self._opponent_prediction = OpponentPrediction(
+                self.time, self.car_positions[indices], self.car_velocities[indices],
+                self.history.acceleration()[indices], self.history.turn_rate()[indices],
+                self.car_boosts[indices], self.car_on_ground[indices], ball_positions
+            )
+        return self._opponent_prediction
 
     def predict_ball(self, num_steps, dt):
 
@@ -71,6 +167,7 @@ class GameInfo(Game):
         self.time_of_goal = -1
 
         self.ball_predictions = []
+        self._opponent_prediction = None
         prediction = Ball(self.ball)
 
         for _ in range(0, num_steps):
@@ -84,3 +181,22 @@ class GameInfo(Game):
                 if self.their_goal.inside(prediction.position):
                     self.about_to_score = True
                     self.time_of_goal = prediction.time
+
+    def predict_touches(self, touches: List[Tuple[Car, Ball]]):
+        '''
+        Branch the ball prediction at the given opponent touches (car, ball slice at their intercept),
+        touch_ensemble then holds the probabilities of the goals they end in and touch_threat, for every
+        ball prediction slice, the probability that our goal has been scored on by the time of that slice.
+        '''
+        self.touch_ensemble = TouchEnsemble(touches, self.my_goal.center[1])
+        self.touch_threat = self.touch_ensemble.threat_at([ball.time for ball in self.ball_predictions])
+
+    def touch_threat_at(self, time: float) -> float:
+        '''touch_threat of the ball prediction slice at `time`, the last slice after the end of the prediction.'''
+        balls = self.ball_predictions
+        if len(self.touch_threat) == 0:
+            return 0.0
+        if len(balls) < 2:
+            return float(self.touch_threat[-1])
+        step = balls[1].time - balls[0].time
+        return float(self.touch_threat[min(max(int(round((time - balls[0].time) / step)), 0), len(self.touch_threat) - 1)])
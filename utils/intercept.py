@@ -1,3 +1,5 @@
+import numpy as np
+
 from rlutilities.simulation import Car, Ball
 from rlutilities.mechanics import Aerial
 from rlutilities.linear_algebra import look_at
@@ -5,21 +7,67 @@ from rlutilities.linear_algebra import look_at
 from utils.vector_math import *
 from utils.math import *
 from utils.misc import *
+from utils.kernels import reachable_slices, estimate_times
+
+# the ball prediction last converted to arrays, all intercepts of a decision share it
+_prediction_arrays = (None, 0, None, None)
+
+def ball_prediction_arrays(ball_predictions):
+    '''(positions, times) arrays of a ball prediction list, converted once per prediction.'''
+    global _prediction_arrays
+    predictions, length, positions, times = _prediction_arrays
+    if predictions is not ball_predictions or length != len(ball_predictions):
+        positions = to_array(ball_predictions)
+        times = np.array([ball.time for ball in ball_predictions], dtype=float)
+        _prediction_arrays = (ball_predictions, len(ball_predictions), positions, times)
+    return positions, times
+
+
+class ReachableSlices:
+    '''
+    The ball slices a car can get to in time, driving forwards or backwards, estimated all at once
+    so that the intercepts of several shots from the same car state can share the work.
+    '''
+    def __init__(self, car: Car, ball_predictions):
+        self.car = car
+        self.ball_predictions = ball_predictions
+        self._indices = {}
+
+    def indices(self, backwards=False):
+        if backwards not in self._indices:
+            car = self.car
+            speed = 1000 if backwards else estimate_max_car_speed(car)
+            positions, times = ball_prediction_arrays(self.ball_predictions)
+            etas = estimate_times(
+                to_array(car.position), to_array(car.velocity), to_array(car.forward()), float(car.boost),
+                float(speed), -1 if backwards else 1, positions
+            )
+            self._indices[backwards] = np.flatnonzero(etas < times - car.time).tolist()
+        return self._indices[backwards]
 
 
 class Intercept:
-    def __init__(self, car: Car, ball_predictions, predicate: callable = None, backwards=False):
+    def __init__(self, car: Car, ball_predictions, predicate: callable = None, backwards=False,
+                 reachable: ReachableSlices = None):
         self.ball: Ball = None
         self.is_viable = True
+        self.backwards = backwards
 
         #find the first reachable ball slice that also meets the predicate
-        speed = 1000 if backwards else estimate_max_car_speed(car)
-        # for ball in ball_predictions:
-        for ball in ball_predictions:
-            if estimate_time(car, ball.position, speed, -1 if backwards else 1) < ball.time - car.time \
-            and (predicate is None or predicate(car, ball)):
-                self.ball = ball
-                break
+        if ball_predictions:
+            if reachable is not None:
+                indices = reachable.indices(backwards)
+            else:
+                speed = 1000 if backwards else estimate_max_car_speed(car)
+                positions, times = ball_prediction_arrays(ball_predictions)
+                indices = reachable_slices(
+                    to_array(car.position), to_array(car.velocity), to_array(car.forward()), float(car.boost),
+                    float(speed), -1 if backwards else 1, car.time, positions, times
+                )
+            for i in indices:
+                if predicate is None or predicate(car, ball_predictions[i]):
+                    self.ball = ball_predictions[i]
+                    break
 
         #if no slice is found, use the last one
         if self.ball is None:
@@ -33,6 +81,22 @@ class Intercept:
         self.ground_pos = ground(self.ball.position)
         self.position = self.ball.position
 
+    def move_to(self, ball: Ball):
+        self.ball = ball
+        self.is_viable = True
+        self.time = ball.time
+        self.ground_pos = ground(ball.position)
+        self.position = ball.position
+
+    @classmethod
+    def at(cls, ball: Ball, is_viable=True, backwards=False) -> 'Intercept':
+        '''An intercept found somewhere else (like in a worker process), with one of our ball slices.'''
+        intercept = cls.__new__(cls)
+        intercept.move_to(ball)
+        intercept.is_viable = is_viable
+        intercept.backwards = backwards
+        return intercept
+
 class AerialIntercept:
     def __init__(self, car: Car, ball_predictions, predicate: callable = None):
         self.ball: Ball = None
@@ -0,0 +1,173 @@
+'''
+Numeric kernels for the hottest loops, compiled with Numba when it is installed (pip install numba)
+and running as plain Python / NumPy otherwise.
+
+Compiled kernels are cached on disk next to this module (numba's cache=True), so a match only pays
+for loading them. `warmup()` compiles (or loads) every kernel up front, the agent calls it on startup
+(when Numba is installed, the fallbacks have nothing to compile).
+'''
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+from utils.arena import arena_distance
+from utils.misc import estimate_time_cars
+
+HAS_NUMBA = numba is not None
+
+# plain floats, compiled kernels can't read vec3s
+GRAVITY = -650.0
+# the landing solver stops within this many uu of a surface, or after this many steps along a grazing path
+LANDING_TOLERANCE = 1.0
+LANDING_STEPS = 256
+
+
+def _jit(function):
+    return function if numba is None else numba.njit(cache=True)(function)
+
+
+def _turn_radius(speed):
+    spd = min(max(speed, 0.0), 2300.0)
+    return 156 + 0.1*spd + 0.000069*spd**2 + 0.000000164*spd**3 + -5.62E-11*spd**4
+
+
+def _estimate_time(position, velocity, forward, boost, speed, dd, target):
+    '''utils.misc.estimate_time on plain arrays'''
+    dx, dy, dz = target[0] - position[0], target[1] - position[1], target[2] - position[2]
+    dist = math.sqrt(dx * dx + dy * dy + dz * dz)
+    if dist < 100:
+        return 0.0
+    cos_angle = (dx * forward[0] + dy * forward[1] + dz * forward[2]) * dd / dist
+    turning = math.acos(min(max(cos_angle, -1.0), 1.0)) / math.pi * 2
+    if turning < 1:
+        turning = turning * turning
+    forward_speed = velocity[0] * forward[0] + velocity[1] * forward[1] + velocity[2] * forward[2]
+    acceleration = (speed * dd - forward_speed) / 2100 * 0.2 * dd / max(boost / 20, 1.0)
+    return dist / speed + acceleration + turning * 0.7
+
+
+def _estimate_times(position, velocity, forward, boost, speed, dd, targets):
+    result = np.empty(len(targets))
+    for i in range(len(targets)):
+        result[i] = _estimate_time(position, velocity, forward, boost, speed, dd, targets[i])
+    return result
+
+
+def _first_reachable(position, velocity, forward, boost, speed, dd, car_time, ball_positions, ball_times, start):
+    '''Index of the first ball slice from `start` on that the car can get to in time, -1 if there is none.'''
+    for i in range(start, len(ball_times)):
+        if _estimate_time(position, velocity, forward, boost, speed, dd, ball_positions[i]) < ball_times[i] - car_time:
+            return i
+    return -1
+
+
+def _landing(position, velocity, radius, max_time):
+    '''
+    When and where a body flying without any input first touches the arena of utils.arena_model, the one of the
+    pure-Python RLUtilities fallback: floor, ceiling and walls joined by fillets, corner walls and goals.
+    Sphere traced along the ballistic trajectory, every step is short enough not to pass through a surface.
+    Returns (time, normal x, normal y, normal z), time is -1 if nothing is hit within `max_time`.
+    '''
+    t = 0.0
+    for _ in range(LANDING_STEPS):
+        x = position[0] + velocity[0] * t
+        y = position[1] + velocity[1] * t
+        z = position[2] + velocity[2] * t + 0.5 * GRAVITY * t * t
+        dist, nx, ny, nz = _arena_distance(x, y, z)
+        gap = dist - radius
+        if gap < LANDING_TOLERANCE:
+            return t, nx, ny, nz
+
+        # the body moves at most speed * dt + 0.5 * |g| * dt^2 in dt
+        vz = velocity[2] + GRAVITY * t
+        speed = math.sqrt(velocity[0] * velocity[0] + velocity[1] * velocity[1] + vz * vz)
+        t += (math.sqrt(speed * speed - 2 * GRAVITY * gap) - speed) / -GRAVITY
+        if t > max_time:
+            break
+    return -1.0, 0.0, 0.0, 0.0
+
+
+def _trilinear(values, strides, upper, origin, spacing, points):
+    '''
+    Trilinear interpolation of a regular grid stored as flat (points, channels) `values`,
+    with grid point (i, j, k) at origin + spacing * (i, j, k). Points outside the grid are clamped to it.
+    '''
+    result = np.zeros((len(points), values.shape[1]))
+    for n in range(len(points)):
+        index = 0
+        frac = np.empty(3)
+        for axis in range(3):
+            cell = min(max((points[n, axis] - origin[axis]) / spacing, 0.0), upper[axis])
+            base = int(cell)
+            frac[axis] = cell - base
+            index += base * strides[axis]
+        for corner in range(8):
+            weight = 1.0
+            offset = index
+            for axis in range(3):
+                if (corner >> (2 - axis)) & 1:
+                    weight *= frac[axis]
+                    offset += strides[axis]
+                else:
+                    weight *= 1 - frac[axis]
+            for channel in range(values.shape[1]):
+                result[n, channel] += weight * values[offset, channel]
+    return result
+
+
+def _trilinear_many(values, strides, upper, origin, spacing, points):
+    cell = np.clip((points - origin) / spacing, 0, upper)
+    base = cell.astype(int)
+    frac = cell - base
+    corners = np.array([[(corner >> (2 - axis)) & 1 for axis in range(3)] for corner in range(8)])
+    index = (base @ strides)[:, None] + corners @ strides
+    wx, wy, wz = (np.stack([1 - frac[:, axis], frac[:, axis]], axis=1) for axis in range(3))
+    weights = (wx[:, :, None, None] * wy[:, None, :, None] * wz[:, None, None, :]).reshape(-1, 1, 8)
+    return (weights @ values[index])[:, 0]
+
+
+turn_radius = _jit(_turn_radius)
+_arena_distance = _jit(arena_distance)
+landing = _jit(_landing)
+trilinear = _jit(_trilinear) if HAS_NUMBA else _trilinear_many
+
+if HAS_NUMBA:
+    _estimate_time = numba.njit(cache=True, inline='always')(_estimate_time)
+    estimate_times = numba.njit(cache=True)(_estimate_times)
+    _first_reachable_jit = numba.njit(cache=True)(_first_reachable)
+
+    def reachable_slices(position, velocity, forward, boost, speed, dd, car_time, ball_positions, ball_times):
+        '''Indices of the ball slices the car can get to in time, in order, found one at a time.'''
+        i = _first_reachable_jit(position, velocity, forward, boost, speed, dd, car_time, ball_positions, ball_times, 0)
+        while i >= 0:
+            yield i
+            i = _first_reachable_jit(
+                position, velocity, forward, boost, speed, dd, car_time, ball_positions, ball_times, i + 1
+            )
+
+else:
+    def estimate_times(position, velocity, forward, boost, speed, dd, targets):
+        return estimate_time_cars(
+            position[None], velocity[None], forward[None], np.array([boost]), np.array([speed]), targets, dd
+        )[0]
+
+    def reachable_slices(position, velocity, forward, boost, speed, dd, car_time, ball_positions, ball_times):
+        '''Indices of the ball slices the car can get to in time, in order, found all at once.'''
+        etas = estimate_times(position, velocity, forward, boost, speed, dd, ball_positions)
+        return iter(np.flatnonzero(etas < ball_times - car_time).tolist())
+
+
+def warmup():
+    '''Compile (or load from the cache) every kernel, so the first tick of a match doesn't have to.'''
+    vector = np.zeros(3)
+    positions, times = np.zeros((2, 3)), np.zeros(2)
+    turn_radius(1000.0)
+    landing(vector, vector, 40.0, 5.0)
+    estimate_times(vector, vector, vector, 0.0, 1400.0, 1, positions)
+    next(iter(reachable_slices(vector, vector, vector, 0.0, 1400.0, 1, 0.0, positions, times)), None)
+    trilinear(np.zeros((8, 4), dtype=np.float32), np.array([4, 2, 1]), np.ones(3) * 0.999, vector, 1.0, positions)
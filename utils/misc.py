@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from rlutilities.linear_algebra import vec3, normalize, dot, norm
 from rlutilities.simulation import Car, Ball
 
@@ -19,10 +20,35 @@ def estimate_time(car: Car, target, speed, dd=1) -> float:
     acceleration = (speed * dd - dot(car.velocity, car.forward())) / 2100 * 0.2 * dd / max(car.boost / 20, 1)
     return travel + acceleration + turning * 0.7
 
+def estimate_max_car_speed_many(velocities: np.ndarray, boosts: np.ndarray) -> np.ndarray:
+    return np.clip(np.maximum(np.linalg.norm(velocities, axis=-1), 1300) + boosts * 100, 1600, 2300)
+
+def estimate_time_cars(positions, velocities, forwards, boosts, speeds, targets, dd=1) -> np.ndarray:
+    '''(cars, targets) estimate_time for every pair, all car arguments are arrays indexed by car.'''
+    delta = to_array(targets)[None] - positions[:, None]
+    dist = np.linalg.norm(delta, axis=2)
+    cos_angle = np.einsum('ijk,ik->ij', delta, forwards * dd) / np.maximum(dist, 1e-6)
+    turning = np.arccos(np.clip(cos_angle, -1, 1)) / math.pi * 2
+    turning = np.where(turning < 1, turning ** 2, turning)
+    forward_speeds = np.einsum('ij,ij->i', velocities, forwards)
+    acceleration = (speeds * dd - forward_speeds) / 2100 * 0.2 * dd / np.maximum(boosts / 20, 1)
+    eta = dist / speeds[:, None] + acceleration[:, None] + turning * 0.7
+    return np.where(dist < 100, 0.0, eta)
+
+def estimate_time_many(car: Car, targets, speed, dd=1) -> np.ndarray:
+    return estimate_time_cars(
+        to_array([car.position]), to_array([car.velocity]), to_array([car.forward()]),
+        np.array([car.boost], dtype=float), np.array([speed], dtype=float), targets, dd
+    )[0]
+
 def turn_radius(speed: float) -> float:
     spd = clamp(speed, 0, 2300)
     return 156 + 0.1*spd + 0.000069*spd**2 + 0.000000164*spd**3 + -5.62E-11*spd**4
 
+def turn_radius_many(speeds: np.ndarray) -> np.ndarray:
+    spd = np.clip(speeds, 0, 2300)
+    return 156 + 0.1*spd + 0.000069*spd**2 + 0.000000164*spd**3 + -5.62E-11*spd**4
+
 def turning_speed(radius: float) -> float:
     return 10.219 * radius - 1.75404E-2 * radius**2 + 1.49406E-5 * radius**3 - 4.486542E-9 * radius**4 - 1156.05
 
@@ -31,11 +57,19 @@ def on_team_half(team: int, pos: vec3):
     team_sign = 1 if team else -1
     return sign(pos[1]) == team_sign
 
+def align_many(positions, balls, goal: vec3) -> np.ndarray:
+    '''align for many car positions and/or ball positions against the same goal.'''
+    approach = ground_direction_many(positions, balls)
+    offsets = np.array([[0, 0, 0], [800, 0, 0], [-800, 0, 0]])
+    shots = ground_direction_many(to_array(balls)[..., None, :], to_array(goal) + offsets)
+    return np.max(np.einsum('...k,...jk->...j', approach, shots), axis=-1)
+
 def align(pos: vec3, ball: Ball, goal: vec3):
+    approach = ground_direction(pos, ball)
     return max(
-        dot(ground_direction(pos, ball), ground_direction(ball, goal)),
-        dot(ground_direction(pos, ball), ground_direction(ball, goal + vec3(800, 0, 0))),
-        dot(ground_direction(pos, ball), ground_direction(ball, goal - vec3(800, 0, 0)))
+        dot(approach, ground_direction(ball, goal)),
+        dot(approach, ground_direction(ball, goal + vec3(800, 0, 0))),
+        dot(approach, ground_direction(ball, goal - vec3(800, 0, 0)))
     )
 
 def nearest_point(pos: vec3, points: list):
@@ -0,0 +1,124 @@
+import math
+
+import numpy as np
+
+from utils.arena import Arena
+from utils.misc import turn_radius_many
+
+
+class OpponentPrediction:
+    '''
+    Where a group of cars will be over the next `horizon` seconds, as a (cars, time, 3) array.
+
+    Two simple motion models are run for all cars at once and blended per car:
+    keep accelerating like over the last few ticks, or turn towards the predicted ball and chase it.
+    Cars that have recently been heading or turning towards the ball are trusted to keep chasing it.
+    '''
+
+    HORIZON = 3.0
+    DT = 0.1
+
+    MAX_SPEED = 2300
+    THROTTLE_SPEED = 1410
+    MAX_ACCELERATION = 1600
+    CHASE_ACCELERATION = 1000
+    GRAVITY = -650
+    CAR_HEIGHT = 17
+
+    def __init__(self, time: float, positions: np.ndarray, velocities: np.ndarray, accelerations: np.ndarray,
+                 turn_rates: np.ndarray, boosts: np.ndarray, on_ground: np.ndarray, ball_positions: np.ndarray,
+                 horizon: float = HORIZON, dt: float = DT):
+        '''
+        The car arrays are indexed by car (`accelerations` and `turn_rates` as given by CarHistory),
+        `ball_positions` is the (time, 3) ball track sampled at the predicted times (at least horizon / dt + 1 rows).
+        '''
+        num_steps = int(round(horizon / dt)) + 1
+        self.dt = dt
+        self.times = time + np.arange(num_steps) * dt
+        self.ball_positions = ball_positions[:num_steps]
+
+        constant = self._constant_acceleration(positions, velocities, accelerations, on_ground, num_steps)
+        chase = self._chase_ball(positions, velocities, boosts, num_steps)
+        self.chase_weights = self._chase_weights(positions, velocities, turn_rates, on_ground)
+        weights = self.chase_weights[:, None, None]
+        self.positions = weights * chase + (1 - weights) * constant
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _constant_acceleration(self, positions, velocities, accelerations, on_ground, num_steps) -> np.ndarray:
+        acceleration = accelerations.copy()
+        magnitude = np.linalg.norm(acceleration, axis=1, keepdims=True)
+        acceleration *= np.minimum(1, self.MAX_ACCELERATION / np.maximum(magnitude, 1e-6))
+        velocity = velocities.copy()
+        velocity[on_ground, 2] = 0
+        acceleration[on_ground, 2] = 0
+        acceleration[~on_ground, 2] = self.GRAVITY
+
+        t = (self.times - self.times[0])[None, :, None]
+        future_velocities = velocity[:, None] + acceleration[:, None] * t
+        speeds = np.linalg.norm(future_velocities, axis=2, keepdims=True)
+        future_velocities *= np.minimum(1, self.MAX_SPEED / np.maximum(speeds, 1e-6))
+
+        steps = np.concatenate([np.zeros_like(future_velocities[:, :1]), future_velocities[:, :-1] * self.dt], axis=1)
+        result = positions[:, None] + np.cumsum(steps, axis=1)
+        result[..., 2] = np.maximum(result[..., 2], self.CAR_HEIGHT)
+        return result
+
+    def _chase_ball(self, positions, velocities, boosts, num_steps) -> np.ndarray:
+        result = np.empty((len(positions), num_steps, 3))
+        x, y = positions[:, 0].copy(), positions[:, 1].copy()
+        ball_x, ball_y = self.ball_positions[:, 0], self.ball_positions[:, 1]
+        speed = np.linalg.norm(velocities[:, :2], axis=1)
+        heading = np.where(
+            speed > 1, np.arctan2(velocities[:, 1], velocities[:, 0]), np.arctan2(ball_y[0] - y, ball_x[0] - x)
+        )
+        top_speed = np.where(boosts > 0, self.MAX_SPEED, self.THROTTLE_SPEED)
+        dt = self.dt
+
+        for step in range(num_steps):
+            result[:, step, 0] = x
+            result[:, step, 1] = y
+            angle = (np.arctan2(ball_y[step] - y, ball_x[step] - x) - heading + math.pi) % (2 * math.pi) - math.pi
+            max_turn = np.maximum(speed, 500) / turn_radius_many(speed) * dt
+            heading += np.maximum(np.minimum(angle, max_turn), -max_turn)
+            speed = np.maximum(speed, np.minimum(speed + self.CHASE_ACCELERATION * dt, top_speed))
+            x += np.cos(heading) * speed * dt
+            y += np.sin(heading) * speed * dt
+
+        # cars circling under a high ball would drive out of the arena
+        np.clip(result[..., 0], -Arena.size[0], Arena.size[0], out=result[..., 0])
+        np.clip(result[..., 1], -Arena.size[1], Arena.size[1], out=result[..., 1])
+        result[..., 2] = self.CAR_HEIGHT
+        return result
+
+    def _chase_weights(self, positions, velocities, turn_rates, on_ground) -> np.ndarray:
+        to_ball = self.ball_positions[0, :2] - positions[:, :2]
+        velocity = velocities[:, :2]
+        speed = np.linalg.norm(velocity, axis=1)
+        cross = velocity[:, 0] * to_ball[:, 1] - velocity[:, 1] * to_ball[:, 0]
+        angle = np.arctan2(cross, np.einsum('ij,ij->i', velocity, to_ball))
+
+        heading_towards = np.maximum(np.cos(angle), 0)
+        turning_towards = np.sign(angle) * turn_rates > 0.5
+        weights = np.clip(heading_towards + 0.5 * turning_towards, 0, 1)
+        # a standing car's heading says nothing about its intent
+        weights = np.where(speed > 100, weights, 0.5)
+        # airborne cars can't steer towards the ball
+        return np.where(on_ground, weights, 0.0)
+
+    def at(self, time: float) -> np.ndarray:
+        '''(cars, 3) positions at game time `time`, clamped to the predicted interval.'''
+        if len(self.times) == 1:
+            return self.positions[:, 0]
+        s = float(np.clip((time - self.times[0]) / self.dt, 0, len(self.times) - 1))
+        i = min(int(s), len(self.times) - 2)
+        frac = s - i
+        return self.positions[:, i] * (1 - frac) + self.positions[:, i + 1] * frac
+
+    def contact_times(self, radius: float = 200) -> np.ndarray:
+        '''(cars,) first game time each car is predicted within `radius` of the ball, inf if never.'''
+        delta = self.positions - self.ball_positions[None]
+        close = np.einsum('ijk,ijk->ij', delta, delta) < radius ** 2
+        first = np.argmax(close, axis=1)
+        return np.where(close.any(axis=1), self.times[first], np.inf)
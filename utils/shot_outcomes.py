@@ -0,0 +1,148 @@
+'''
+Precomputed outcomes of the strike maneuvers, generated offline by tools/shot_database.py.
+
+Every row of the table is a car / ball configuration, described by `shot_features` in a frame where the shot
+goes towards +y, with the arrival time and outcome of each shot type when started from there.
+At runtime the outcomes of the nearest rows are averaged, so Offense can skip building shots that are
+unlikely to win without running their intercept searches.
+The outcomes depend on the physics the table was generated with, so it is only used with the same RLUtilities
+backend: a table from the pure-Python fallback says nothing about the native car and ball models.
+'''
+import os
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from rlutilities import NATIVE
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Car, Ball
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'shot_outcomes.npz')
+
+SHOT_TYPES = ('DodgeShot', 'GroundShot', 'WallShot', 'AerialShot')
+
+# rough size of a difference that changes the outcome, for every feature
+FEATURE_SCALES = np.array([1000, 1.0, 1000, 50, 300, 500, 1000, 1000, 1500, 2000], dtype=np.float32)
+
+# columns of the outcomes table, per shot type
+VIABLE, TIME, REACHED = range(3)
+
+
+class ShotOutcome(NamedTuple):
+    viable: float  # fraction of the neighbours where the shot found a viable intercept
+    reached: float  # fraction where the car also got to the ball when driving the shot
+    time: float  # median time to the intercept over the viable neighbours, inf if there are none
+
+
+def shot_features(car: Car, ball: Ball, target: vec3) -> np.ndarray:
+    '''The configuration of a shot at `target`, unscaled, mirrored so that the target is towards +y.'''
+    flip = -1.0 if target[1] < 0 else 1.0
+    px, py = ball.position[0] - car.position[0], (ball.position[1] - car.position[1]) * flip
+    fx, fy = car.forward()[0], car.forward()[1] * flip
+    dist = max(np.hypot(px, py), 1e-6)
+    angle = abs(np.arctan2(fx * py - fy * px, fx * px + fy * py))
+    vx, vy = ball.velocity[0], ball.velocity[1] * flip
+    radial = (vx * px + vy * py) / dist
+    tangential = abs(vy * px - vx * py) / dist
+    forward_speed = car.velocity[0] * car.forward()[0] + car.velocity[1] * car.forward()[1] \
+        + car.velocity[2] * car.forward()[2]
+    return np.array([
+        dist, angle, forward_speed, car.boost, ball.position[2], ball.velocity[2],
+        radial, tangential, abs(ball.position[0]), ball.position[1] * flip
+    ], dtype=np.float32)
+
+
+class ShotOutcomes:
+
+    # answers further than this from their neighbours (in scaled feature units) are not trusted
+    MAX_NEIGHBOUR_DISTANCE = 2.0
+
+    # the rows are bucketed into unit cells of the first few scaled features (distance, angle, ball height),
+    # a query only looks at the rows in its own cell and the ones around it
+    GRID_FEATURES = 3
+
+    def __init__(self, features: np.ndarray, outcomes: np.ndarray, shot_types=SHOT_TYPES, native: bool = NATIVE):
+        self.points = features / FEATURE_SCALES
+        self.outcomes = outcomes  # (rows, shot types, VIABLE / TIME / REACHED)
+        self.shot_types = tuple(shot_types)
+        self.native = native  # generated with the native RLUtilities physics
+
+        cells = self._cells(self.points)
+        self._order = np.lexsort(cells.T[::-1])
+        self._cell_rows = {}
+        for i, cell in enumerate(map(tuple, cells[self._order])):
+            start, _ = self._cell_rows.get(cell, (i, i))
+            self._cell_rows[cell] = (start, i + 1)
+        self._offsets = [tuple(offset) for offset in np.ndindex(*(3,) * self.GRID_FEATURES)]
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor(np.atleast_2d(points)[:, :self.GRID_FEATURES]).astype(int)
+
+    def __len__(self):
+        return len(self.points)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> 'ShotOutcomes':
+        with np.load(path) as table:
+            return cls(table['features'], table['outcomes'], [str(name) for name in table['shot_types']],
+                       bool(table['native']))
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, features=(self.points * FEATURE_SCALES).astype(np.float32),
+                            outcomes=self.outcomes.astype(np.float32), shot_types=np.array(self.shot_types),
+                            native=np.array(self.native))
+
+    def neighbours(self, features: np.ndarray, k: int):
+        '''Distances and row indices of the k rows nearest to the unscaled features.'''
+        point = features / FEATURE_SCALES
+        cell = (self._cells(point)[0] - 1).tolist()
+        spans = [self._cell_rows.get(tuple(c + o for c, o in zip(cell, offset))) for offset in self._offsets]
+        candidates = [self._order[start:end] for start, end in filter(None, spans)]
+        rows = np.concatenate(candidates) if candidates else np.zeros(0, dtype=int)
+        if len(rows) < k:
+            rows = np.arange(len(self.points))  # sparse region, look at everything
+        k = min(k, len(rows))
+        dist = np.linalg.norm(self.points[rows] - point, axis=1)
+        nearest = np.argpartition(dist, k - 1)[:k]
+        return dist[nearest], rows[nearest]
+
+    def query(self, car: Car, ball: Ball, target: vec3, k: int = 8) -> Dict[str, ShotOutcome]:
+        '''
+        Expected outcome of every shot type for a car going for `ball` to shoot at `target`,
+        or an empty dict if the table has nothing close enough.
+        '''
+        dist, rows = self.neighbours(shot_features(car, ball, target), k)
+        if np.mean(dist) > self.MAX_NEIGHBOUR_DISTANCE:
+            return {}
+        outcomes = self.outcomes[rows]
+        viable = outcomes[:, :, VIABLE] > 0.5
+        # (lower) median over the viable neighbours, the others sort to the end
+        times = np.sort(np.where(viable, outcomes[:, :, TIME], np.inf), axis=0)
+        counts = viable.sum(axis=0)
+        medians = times[np.maximum(counts - 1, 0) // 2, np.arange(len(self.shot_types))]
+        return {
+            name: ShotOutcome(*values) for name, *values in zip(
+                self.shot_types, viable.mean(axis=0).tolist(), outcomes[:, :, REACHED].mean(axis=0).tolist(),
+                medians.tolist()
+            )
+        }
+
+
+_shot_outcomes = None
+_loaded = False
+
+
+def shot_outcomes() -> ShotOutcomes:
+    '''
+    The shared ShotOutcomes, loaded on the first call, None if the table hasn't been generated
+    or was generated with the other physics backend.
+    '''
+    global _shot_outcomes, _loaded
+    if not _loaded:
+        _loaded = True
+        if os.path.exists(DEFAULT_PATH):
+            table = ShotOutcomes.load()
+            if table.native == NATIVE:
+                _shot_outcomes = table
+    return _shot_outcomes
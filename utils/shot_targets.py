@@ -0,0 +1,68 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Car
+
+from utils.arena import Arena
+from utils.misc import turn_radius_many
+from utils.vector_math import to_array, ground_distance_many, ground_direction_many
+
+# ranks unreachable targets below every reachable one
+UNREACHABLE_PENALTY = 2.0
+
+
+def rank_directions(car: Car, ball_position: vec3, directions) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Rank the directions to hit the ball in, easiest first. Returns the order and the scores.
+
+    The score is how well the car's approach to the ball lines up with the direction (like `align`),
+    and a direction is only reachable if the car can turn onto it with its current turn radius
+    before getting to the ball.
+    '''
+    directions = to_array(directions) * [1, 1, 0]
+    dist = ground_distance_many(car.position, ball_position)
+    scores = directions @ ground_direction_many(car.position, ball_position)
+
+    lengths = np.maximum(np.linalg.norm(directions, axis=1), 1e-6)
+    heading = ground_direction_many(np.zeros(3), car.forward())
+    turn = np.arccos(np.clip(directions @ heading / lengths, -1, 1))
+    speed = np.hypot(car.velocity[0], car.velocity[1])
+    reachable = turn * turn_radius_many(speed) <= dist
+
+    scores = scores - UNREACHABLE_PENALTY * ~reachable
+    return np.argsort(-scores, kind='stable'), scores
+
+
+def rank_targets(car: Car, ball_position: vec3, targets) -> Tuple[np.ndarray, np.ndarray]:
+    '''Rank the points to shoot the ball at, easiest first, see rank_directions.'''
+    directions = ground_direction_many(ball_position, targets)
+    return rank_directions(car, ball_position, directions)
+
+
+def goal_mouth(center: vec3, half_width: float, count: int = 9) -> List[vec3]:
+    '''`count` aim points spread across the goal line, centered on `center`.'''
+    return [vec3(center[0] + x, center[1], center[2]) for x in np.linspace(-half_width, half_width, count)]
+
+
+def corner_targets(goal: vec3, count: int = 4) -> List[vec3]:
+    '''
+    Points to clear the ball at from in front of `goal`, `count` on each side wall, from next to the corner
+    to halfway to the center line.
+    '''
+    ys = np.linspace(goal[1] * 0.8, goal[1] * 0.4, count)
+    return [vec3(side * Arena.size[0], y, goal[2]) for side in (-1, 1) for y in ys]
+
+
+def pass_targets(ball_position: vec3, teammates: List[Car], goal: vec3, lead: float = 1.0) -> List[vec3]:
+    '''
+    Where the teammates upfield of the ball (further from `goal`, the one we defend) are `lead` seconds
+    from now if they keep driving, to pass the ball to.
+    '''
+    targets = []
+    for teammate in teammates:
+        if abs(teammate.position[1] - goal[1]) > abs(ball_position[1] - goal[1]):
+            ahead = teammate.position + teammate.velocity * lead
+            targets.append(Arena.clamp(vec3(ahead[0], ahead[1], 0), 200))
+    return targets
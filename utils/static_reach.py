@@ -0,0 +1,104 @@
+import numpy as np
+
+from utils.arena import Arena
+from utils.misc import estimate_time_cars, estimate_max_car_speed_many
+from utils.vector_math import to_array
+
+
+class StaticReachField:
+    '''
+    Coarse grid over the arena floor with the estimated time every car needs to get to every cell from its
+    current state, answering questions like "who gets to this area first" for many points at once.
+
+    The estimate is static: it has no time dimension, a car is assumed to head for a cell right away and
+    nothing is known about where the cars will be later. It's meant for picking between nearby positions
+    (pads, shadowing spots, clearing corners) now, not for comparing ball prediction slices.
+
+    Times follow utils.misc.estimate_time, computed for all cells of a car in one go.
+    A car's row is only recomputed when its state changed noticeably since the last time.
+    '''
+
+    CELLS_X = 16
+    CELLS_Y = 16
+    CAR_HEIGHT = 17
+
+    # recompute a car's row when it moved / turned / changed speed or boost this much
+    DIRTY_DISTANCE = 128
+    DIRTY_COS_ANGLE = np.cos(np.radians(10))
+    DIRTY_SPEED = 200
+    DIRTY_BOOST = 10
+    MAX_AGE = 0.25
+
+    def __init__(self):
+        xs = (np.arange(self.CELLS_X) + 0.5) / self.CELLS_X * 2 * Arena.size[0] - Arena.size[0]
+        ys = (np.arange(self.CELLS_Y) + 0.5) / self.CELLS_Y * 2 * Arena.size[1] - Arena.size[1]
+        grid_x, grid_y = np.meshgrid(xs, ys, indexing='ij')
+        self.centers = np.stack([grid_x.ravel(), grid_y.ravel(), np.full(grid_x.size, self.CAR_HEIGHT)], axis=1)
+
+        self.our_indices = np.zeros(0, dtype=int)
+        self.their_indices = np.zeros(0, dtype=int)
+        # (cars, cells) estimated time for each car to reach each cell
+        self.etas = np.zeros((0, len(self.centers)))
+        self.our_etas = np.full(len(self.centers), np.inf)
+        self.their_etas = np.full(len(self.centers), np.inf)
+
+        self._computed_state = np.zeros((0, 8))
+        self._computed_time = np.zeros(0)
+
+    def __len__(self):
+        return len(self.centers)
+
+    def set_roster(self, our_indices: np.ndarray, their_indices: np.ndarray, num_cars: int):
+        self.our_indices = our_indices
+        self.their_indices = their_indices
+        self.etas = np.zeros((num_cars, len(self.centers)))
+        self._computed_state = np.zeros((num_cars, 8))
+        self._computed_time = np.full(num_cars, -np.inf)
+
+    def update(self, time: float, positions: np.ndarray, velocities: np.ndarray, forwards: np.ndarray,
+               boosts: np.ndarray):
+        '''Recompute the rows of the cars whose state changed since they were last computed.'''
+        if not len(self.etas):
+            return
+        old = self._computed_state
+        speeds = np.linalg.norm(velocities, axis=1)
+        dirty = (
+            (np.linalg.norm(positions - old[:, 0:3], axis=1) > self.DIRTY_DISTANCE)
+            | (np.einsum('ij,ij->i', forwards, old[:, 3:6]) < self.DIRTY_COS_ANGLE)
+            | (np.abs(speeds - old[:, 6]) > self.DIRTY_SPEED)
+            | (np.abs(boosts - old[:, 7]) > self.DIRTY_BOOST)
+            | (time - self._computed_time > self.MAX_AGE)
+        )
+        if not dirty.any():
+            return
+
+        cars = np.flatnonzero(dirty)
+        self.etas[cars] = estimate_time_cars(
+            positions[cars], velocities[cars], forwards[cars], boosts[cars],
+            estimate_max_car_speed_many(velocities[cars], boosts[cars]), self.centers
+        )
+        old[cars, 0:3] = positions[cars]
+        old[cars, 3:6] = forwards[cars]
+        old[cars, 6] = speeds[cars]
+        old[cars, 7] = boosts[cars]
+        self._computed_time[cars] = time
+
+        self.our_etas = self.etas[self.our_indices].min(axis=0, initial=np.inf)
+        self.their_etas = self.etas[self.their_indices].min(axis=0, initial=np.inf)
+
+    def cell_indices(self, points: np.ndarray) -> np.ndarray:
+        '''Index of the cell containing each of the (N, 3) or (N, 2) points, clamped to the grid.'''
+        points = np.atleast_2d(to_array(points))
+        ix = ((points[:, 0] + Arena.size[0]) / (2 * Arena.size[0]) * self.CELLS_X).astype(int)
+        iy = ((points[:, 1] + Arena.size[1]) / (2 * Arena.size[1]) * self.CELLS_Y).astype(int)
+        return np.clip(ix, 0, self.CELLS_X - 1) * self.CELLS_Y + np.clip(iy, 0, self.CELLS_Y - 1)
+
+    def advantage(self, points: np.ndarray) -> np.ndarray:
+        '''How much sooner our team gets to each point than theirs, in seconds (negative if they are sooner).'''
+        cells = self.cell_indices(points)
+        return self.their_etas[cells] - self.our_etas[cells]
+
+    def control(self, within: float) -> np.ndarray:
+        '''(cells,) 1 where only our team gets there within `within` seconds, -1 where only theirs, 0 otherwise.'''
+        ours, theirs = self.our_etas <= within, self.their_etas <= within
+        return ours.astype(np.int8) - theirs.astype(np.int8)
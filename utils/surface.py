@@ -0,0 +1,187 @@
+'''
+The floor with the side walls, back walls and corner walls unfolded onto the floor plane around their bottom edges,
+so that the shortest path over the surface between a floor point and a wall point (or two points on the same wall)
+is a straight line. Points are assigned to the floor or to the nearest wall, then described by their unfolded
+2D position. Goals and the ceiling are not modelled (over_goal flags the back wall points above a goal mouth),
+fillets only by the distance they save.
+'''
+import math
+from typing import Tuple
+
+import numpy as np
+
+from rlutilities.linear_algebra import vec3, norm, dot, angle_between
+from rlutilities.simulation import Car
+
+from utils.arena import Arena, FILLET_RADIUS, CORNER_OFFSET, GOAL_HALF_WIDTH
+from utils.misc import estimate_time_cars
+from utils.vector_math import loc, to_array
+
+# driving over a fillet instead of along the floor and up the wall saves 2r - πr/2
+FILLET_SHORTCUT = (2 - math.pi / 2) * FILLET_RADIUS
+
+# outward normals of the side, back and corner wall for x, y >= 0
+_QUADRANT_NORMALS = np.array([[1, 0], [0, 1], [1 / math.sqrt(2), 1 / math.sqrt(2)]])
+
+
+def _walls(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    The nearest wall of each of the (N, 3) points: its outward 2D normal (N, 2), the distance from the point
+    to the wall's bottom edge on the floor (N,), and whether the point is on that wall rather than the floor.
+    Every wall is the line n·(x, y) = offset.
+    '''
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    ax, ay = np.abs(x), np.abs(y)
+    gaps = np.column_stack([
+        Arena.size[0] - ax, Arena.size[1] - ay, (CORNER_OFFSET - ax - ay) / math.sqrt(2)
+    ])
+    nearest = np.argmin(gaps, axis=1)
+    gap = gaps[np.arange(len(points)), nearest]
+    normals = _QUADRANT_NORMALS[nearest] * np.where(points[:, :2] >= 0, 1.0, -1.0)
+    return normals, gap, gap < z
+
+
+def _wall(x: float, y: float) -> Tuple[float, float, float]:
+    '''_walls for a single point: the outward normal (x, y) of its nearest wall and the gap to it.'''
+    ax, ay = abs(x), abs(y)
+    sx, sy = (1.0 if x >= 0 else -1.0), (1.0 if y >= 0 else -1.0)
+    side, back, corner = Arena.size[0] - ax, Arena.size[1] - ay, (CORNER_OFFSET - ax - ay) / math.sqrt(2)
+    if side <= back and side <= corner:
+        return sx, 0.0, side
+    if back <= corner:
+        return 0.0, sy, back
+    return sx / math.sqrt(2), sy / math.sqrt(2), corner
+
+
+def _unfolded_height(z: np.ndarray) -> np.ndarray:
+    return z - FILLET_SHORTCUT * np.minimum(z / FILLET_RADIUS, 1)
+
+
+def _folded_height(h: float) -> float:
+    '''Inverse of _unfolded_height.'''
+    if h >= FILLET_RADIUS - FILLET_SHORTCUT:
+        return h + FILLET_SHORTCUT
+    return h / (1 - FILLET_SHORTCUT / FILLET_RADIUS)
+
+
+def unfold(points) -> np.ndarray:
+    '''(N, 2) positions of the (N, 3) points in the unfolded surface, or a single (2,) one.'''
+    points = to_array(points)
+    single = points.ndim == 1
+    points = np.atleast_2d(points)
+    normals, gap, on_wall = _walls(points)
+    overhang = np.where(on_wall, gap + _unfolded_height(np.maximum(points[:, 2], 0)), 0)
+    unfolded = points[:, :2] + normals * overhang[:, None]
+    return unfolded[0] if single else unfolded
+
+
+def unfold_point(point: vec3) -> vec3:
+    '''unfold for a single point, as a vec3 on the floor plane.'''
+    nx, ny, gap = _wall(point[0], point[1])
+    if gap >= point[2]:
+        return vec3(point[0], point[1], 0)
+    overhang = gap + point[2] - FILLET_SHORTCUT * min(point[2] / FILLET_RADIUS, 1)
+    return vec3(point[0] + nx * overhang, point[1] + ny * overhang, 0)
+
+
+def unfold_vector(vector: vec3, point: vec3) -> vec3:
+    '''unfold_vectors for a single vector, as a vec3 on the floor plane.'''
+    nx, ny, gap = _wall(point[0], point[1])
+    if gap >= point[2]:
+        return vec3(vector[0], vector[1], 0)
+    outwards = vector[2] - (nx * vector[0] + ny * vector[1])
+    return vec3(vector[0] + nx * outwards, vector[1] + ny * outwards, 0)
+
+
+def unfold_vectors(vectors, points) -> np.ndarray:
+    '''(N, 2) directions in the unfolded surface of the (N, 3) vectors at the points, e.g. a car's velocity.'''
+    vectors, points = np.atleast_2d(to_array(vectors)), np.atleast_2d(to_array(points))
+    normals, _, on_wall = _walls(points)
+    # on a wall, the part along the wall normal is dropped and "up" becomes "outwards"
+    along_normal = np.einsum('nk,nk->n', normals, vectors[:, :2])
+    on_wall_vectors = vectors[:, :2] + normals * (vectors[:, 2] - along_normal)[:, None]
+    return np.where(on_wall[:, None], on_wall_vectors, vectors[:, :2])
+
+
+def surface_distance_many(source, targets) -> np.ndarray:
+    '''Distances over the arena surface from `source` to each of the targets.'''
+    return np.linalg.norm(unfold(targets) - unfold(source), axis=-1)
+
+
+def surface_distance(source, target) -> float:
+    return norm(unfold_point(loc(target)) - unfold_point(loc(source)))
+
+
+def estimate_surface_time(car: Car, target, speed, dd=1) -> float:
+    '''estimate_time with the distance and the turn measured over the arena surface.'''
+    position = unfold_point(car.position)
+    delta = unfold_point(loc(target)) - position
+    dist = norm(delta)
+    if dist < 100:
+        return 0
+    forward = unfold_vector(car.forward(), car.position)
+    turning = angle_between(forward * dd, delta) / math.pi * 2
+    if turning < 1:
+        turning **= 2
+    forward_speed = dot(unfold_vector(car.velocity, car.position), forward)
+    acceleration = (speed * dd - forward_speed) / 2100 * 0.2 * dd / max(car.boost / 20, 1)
+    return dist / speed + acceleration + turning * 0.7
+
+
+def estimate_surface_time_many(car: Car, targets, speed, dd=1) -> np.ndarray:
+    '''estimate_time for the targets, with the distance and the turn measured over the arena surface.'''
+    position = to_array(car.position)
+    velocity, forward = unfold_vectors([car.velocity, car.forward()], [position, position])
+
+    def flat(points):
+        return np.pad(np.atleast_2d(points), ((0, 0), (0, 1)))
+
+    return estimate_time_cars(
+        flat(unfold(position)), flat(velocity), flat(forward), np.array([car.boost], dtype=float),
+        np.array([speed], dtype=float), flat(unfold(targets)), dd
+    )[0]
+
+
+def wall_distance(point: vec3) -> float:
+    '''Horizontal distance from `point` to the nearest wall, side, back or corner.'''
+    return _wall(point[0], point[1])[2]
+
+
+def on_wall(point: vec3) -> bool:
+    '''Whether `point` is up its nearest wall rather than above the floor, as unfold decides it.'''
+    return _wall(point[0], point[1])[2] < point[2]
+
+
+def over_goal(point: vec3) -> bool:
+    '''
+    Whether `point` is in or above a goal mouth, closest to a back wall and within the goal's width.
+    Goals aren't modelled, the surface paths to such points go up the back wall through the goal opening.
+    '''
+    nx, ny, _ = _wall(point[0], point[1])
+    return nx == 0 and ny != 0 and abs(point[0]) < GOAL_HALF_WIDTH
+
+
+def wall_point(point: vec3) -> Tuple[vec3, vec3]:
+    '''The point on the nearest wall at the same height as `point`, and the inward normal of that wall.'''
+    nx, ny, gap = _wall(point[0], point[1])
+    return vec3(point[0] + nx * gap, point[1] + ny * gap, point[2]), vec3(-nx, -ny, 0)
+
+
+def surface_waypoint(position: vec3, target: vec3, lookahead: float = 500) -> vec3:
+    '''
+    The point `lookahead` ahead of `position` on the shortest surface path to `target`,
+    folded back onto the arena. Returns `target` when it is closer than that.
+    '''
+    start, end = unfold_point(position), unfold_point(target)
+    dist = norm(end - start)
+    if dist < lookahead:
+        return target
+    ahead = start + (end - start) * (lookahead / dist)
+
+    # fold onto the target's wall, or the one we're on when the target is on the floor
+    wall = target if _wall(target[0], target[1])[2] < target[2] else position
+    nx, ny, gap = _wall(wall[0], wall[1])
+    overhang = nx * ahead[0] + ny * ahead[1] - (nx * wall[0] + ny * wall[1] + gap)
+    if overhang <= 0:
+        return ahead
+    return vec3(ahead[0] - nx * overhang, ahead[1] - ny * overhang, _folded_height(overhang))
@@ -0,0 +1,108 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from rlutilities.simulation import Car, Ball
+
+from utils.ball_batch import BallBatch
+from utils.vector_math import to_array
+
+
+class TouchEnsemble:
+    '''
+    A set of plausible ball trajectories after opponents touch the ball at their earliest intercepts.
+    Every touch is branched into a fan of hit directions and strengths, the branches of all touches are
+    simulated together in one BallBatch and the goals they end in are weighted into threat probabilities.
+    '''
+
+    HIT_ANGLES = np.radians([-40, -20, 0, 20, 40])
+    HIT_ANGLE_SPREAD = math.radians(25)
+    HIT_STRENGTHS = [600, 1300, 2100]
+    HIT_LIFTS = [0, 500]
+
+    # how much less likely an opponent is to touch the ball for every second they are later than the first one
+    LATE_TOUCH_DECAY = 2.0
+
+    def __init__(self, touches: List[Tuple[Car, Ball]], goal_y: float, duration: float = 3.0, dt: float = 1 / 30):
+        '''
+        :param touches: (opponent, ball slice at their intercept) pairs
+        :param goal_y: y coordinate of the goal we are defending
+        '''
+        self.touch_time = min((ball.time for _, ball in touches), default=-1)
+
+        positions, velocities, angular_velocities, start_times, weights = [], [], [], [], []
+        for car, ball in touches:
+            branch_velocities, branch_weights = self.branches(car, ball, goal_y)
+            count = len(branch_velocities)
+            positions.append(np.repeat([list(ball.position)], count, axis=0))
+            velocities.append(branch_velocities)
+            angular_velocities.append(np.repeat([list(ball.angular_velocity)], count, axis=0))
+            start_times.append(np.full(count, ball.time))
+            late = ball.time - self.touch_time
+            weights.append(branch_weights * math.exp(-self.LATE_TOUCH_DECAY * late))
+
+        if touches:
+            # the ball model doesn't depend on the time, so every touch's branches start together
+            # on the batch's clock and get shifted back to their touch time
+            batch = BallBatch(np.concatenate(positions), np.concatenate(velocities), np.concatenate(angular_velocities))
+            for _ in range(int(duration / dt)):
+                batch.step(dt)
+            self.goal = batch.goal
+            self.goal_time = np.where(batch.goal_time >= 0, batch.goal_time + np.concatenate(start_times), -1.0)
+            self.weight = np.concatenate(weights)
+            self.weight /= max(self.weight.sum(), 1e-9)
+        else:
+            self.goal = np.zeros(0, dtype=np.int8)
+            self.goal_time = np.zeros(0)
+            self.weight = np.zeros(0)
+
+        self.goal_sign = 1 if goal_y > 0 else -1
+        self.scored_on = self.goal == self.goal_sign
+        self.scoring = self.goal == -self.goal_sign
+
+        self.scored_on_probability = float(self.weight[self.scored_on].sum())
+        self.scoring_probability = float(self.weight[self.scoring].sum())
+
+    @classmethod
+    def branches(cls, car: Car, ball: Ball, goal_y: float):
+        '''
+        Post-touch velocities for a fan of hits around the direction the car approaches the ball from,
+        plus the same hits aimed straight at the goal, weighted by how well the car is lined up for it.
+        '''
+        position = to_array(ball.position)
+        velocity = to_array(ball.velocity)
+        approach = position[:2] - to_array(car.position)[:2]
+        approach /= max(np.linalg.norm(approach), 1e-6)
+        to_goal = np.array([0, goal_y]) - position[:2]
+        to_goal /= max(np.linalg.norm(to_goal), 1e-6)
+
+        base_angle = math.atan2(approach[1], approach[0])
+        angles = list(base_angle + cls.HIT_ANGLES)
+        angle_weights = list(np.exp(-0.5 * (cls.HIT_ANGLES / cls.HIT_ANGLE_SPREAD) ** 2))
+
+        lined_up = float(np.dot(approach, to_goal))
+        if lined_up > 0:
+            angles.append(math.atan2(to_goal[1], to_goal[0]))
+            angle_weights.append(lined_up)
+
+        velocities, weights = [], []
+        for angle, angle_weight in zip(angles, angle_weights):
+            for strength in cls.HIT_STRENGTHS:
+                for lift in cls.HIT_LIFTS:
+                    hit = np.array([math.cos(angle) * strength, math.sin(angle) * strength, lift])
+                    velocities.append(velocity * 0.3 + hit)
+                    weights.append(angle_weight)
+
+        return np.array(velocities), np.array(weights)
+
+    def threat_at(self, time) -> np.ndarray:
+        '''Probability that the ball is in our goal by `time` (a scalar or an array of times).'''
+        time = np.asarray(time, dtype=float)
+        if not self.scored_on.any():
+            return np.zeros_like(time)
+        goal_times = self.goal_time[self.scored_on]
+        weights = self.weight[self.scored_on]
+        order = np.argsort(goal_times)
+        cumulative = np.concatenate([[0.0], np.cumsum(weights[order])])
+        return cumulative[np.searchsorted(goal_times[order], time, side='right')]
@@ -1,13 +1,38 @@
+import numpy as np
+
 from rlutilities.linear_algebra import vec3, norm, normalize, dot, cross, mat3, angle_between, inv
+from rlutilities.simulation import Car, Ball
 
-def loc(obj) -> vec3:
+# how to get a position out of other types, worked out the first time a type is seen
+_ITSELF, _POSITION, _LOWERCASE_XYZ, _UPPERCASE_XYZ = range(4)
+_loc_kinds = {vec3: _ITSELF}
+
+def _loc_kind(obj) -> int:
     if hasattr(obj, "position"):
-        return obj.position
+        return _POSITION
     elif hasattr(obj, "x"):
-        return vec3(obj.x, obj.y, obj.z)
+        return _LOWERCASE_XYZ
     elif hasattr(obj, "X"):
-        return vec3(obj.X, obj.Y, obj.Z)
-    return obj
+        return _UPPERCASE_XYZ
+    return _ITSELF
+
+def loc(obj) -> vec3:
+    # cars and balls are most of the arguments, then plain vec3s, these skip the table
+    cls = type(obj)
+    if cls is Car or cls is Ball:
+        return obj.position
+    if cls is vec3:
+        return obj
+    kind = _loc_kinds.get(cls)
+    if kind is None:
+        kind = _loc_kinds[cls] = _loc_kind(obj)
+    if kind == _POSITION:
+        return obj.position
+    if kind == _ITSELF:
+        return obj
+    if kind == _LOWERCASE_XYZ:
+        return vec3(obj.x, obj.y, obj.z)
+    return vec3(obj.X, obj.Y, obj.Z)
 
 def ground(pos) -> vec3:
     pos = loc(pos)
@@ -17,13 +42,15 @@ def distance(obj1, obj2) -> float:
     return norm(loc(obj1) - loc(obj2))
 
 def ground_distance(obj1, obj2) -> float:
-    return norm(ground(obj1) - ground(obj2))
+    delta = loc(obj1) - loc(obj2)
+    return norm(vec3(delta[0], delta[1], 0))
 
 def direction(source, target) -> vec3:
     return normalize(loc(target) - loc(source))
 
 def ground_direction(source, target) -> vec3:
-    return normalize(ground(target) - ground(source))
+    delta = loc(target) - loc(source)
+    return normalize(vec3(delta[0], delta[1], 0))
 
 def local(car, pos) -> vec3:
     return dot(loc(pos) - car.position, car.orientation)
@@ -36,4 +63,56 @@ def angle_to(car, target, backwards = False) -> float:
 
 def facing(mat: mat3) -> vec3:
     # return vec3(mat[0, 0], mat[0, 1], mat[0, 2])
-    return vec3(mat[0, 0], mat[1, 0], mat[2, 0])
\ No newline at end of file
+    return vec3(mat[0, 0], mat[1, 0], mat[2, 0])
+
+
+# batched variants, working on (N, 3) arrays of points instead of single vec3s
+
+def to_array(points) -> np.ndarray:
+    '''(N, 3) array from a list of vec3s or objects with a position (see loc), or a single (3,) one.'''
+    if isinstance(points, np.ndarray):
+        return points.astype(float, copy=False)
+    if isinstance(points, (list, tuple)):
+        return np.array([[p[0], p[1], p[2]] for p in map(loc, points)], dtype=float).reshape(-1, 3)
+    point = loc(points)
+    return np.array([point[0], point[1], point[2]], dtype=float)
+
+def to_vec3(point: np.ndarray) -> vec3:
+    return vec3(float(point[0]), float(point[1]), float(point[2]))
+
+def to_vec3s(points: np.ndarray) -> list:
+    return [vec3(*row) for row in points.tolist()]
+
+def mat3_to_array(mat: mat3) -> np.ndarray:
+    return np.array([[mat[i, j] for j in range(3)] for i in range(3)])
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.where(length > 0, vectors / np.where(length > 0, length, 1), 0.0)
+
+def _ground_rows(vectors: np.ndarray) -> np.ndarray:
+    grounded = np.array(vectors, dtype=float)
+    grounded[..., 2] = 0
+    return grounded
+
+def distance_many(objs1, objs2) -> np.ndarray:
+    return np.linalg.norm(to_array(objs1) - to_array(objs2), axis=-1)
+
+def ground_distance_many(objs1, objs2) -> np.ndarray:
+    delta = to_array(objs1) - to_array(objs2)
+    return np.hypot(delta[..., 0], delta[..., 1])
+
+def direction_many(sources, targets) -> np.ndarray:
+    return _normalize_rows(to_array(targets) - to_array(sources))
+
+def ground_direction_many(sources, targets) -> np.ndarray:
+    return _normalize_rows(_ground_rows(to_array(targets) - to_array(sources)))
+
+def local_many(car, points) -> np.ndarray:
+    return (to_array(points) - to_array(car.position)) @ mat3_to_array(car.orientation)
+
+def nearest_index(pos, points) -> int:
+    return int(np.argmin(distance_many(points, pos)))
+
+def furthest_index(pos, points) -> int:
+    return int(np.argmax(distance_many(points, pos)))